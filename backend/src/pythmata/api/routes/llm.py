@@ -2,9 +2,11 @@
 
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -188,6 +190,7 @@ async def generate_xml(
     db: AsyncSession = Depends(get_session),
     validate: bool = True,
     max_validation_attempts: int = 3,
+    validation_candidates: int = Query(1, ge=1),
 ):
     """
     Generate BPMN XML from a natural language description.
@@ -197,6 +200,8 @@ async def generate_xml(
         db: Database session
         validate: Whether to validate and improve the generated XML
         max_validation_attempts: Maximum number of validation improvement attempts
+        validation_candidates: Improvements requested concurrently per validation
+            round
 
     Returns:
         Generated XML and explanation
@@ -209,6 +214,7 @@ async def generate_xml(
             model=request.model or "anthropic:claude-3-7-sonnet-latest",
             validate=validate,
             max_validation_attempts=max_validation_attempts,
+            validation_candidates=validation_candidates,
         )
 
         if not response["xml"]:
@@ -247,12 +253,65 @@ async def generate_xml(
         raise HTTPException(status_code=500, detail=f"Failed to generate XML: {str(e)}")
 
 
+@router.post("/generate-xml/stream")
+async def generate_xml_stream(
+    request: XmlGenerationRequest,
+    validate: bool = True,
+    max_validation_attempts: int = 3,
+    validation_candidates: int = Query(1, ge=1),
+) -> StreamingResponse:
+    """
+    Generate BPMN XML from a natural language description as server-sent events.
+
+    "explanation" and "xml" events carry the response as it is generated,
+    followed by a "result" event with the validated XML and explanation, or
+    an "error" event if generation fails.
+
+    Args:
+        request: XML generation request
+        validate: Whether to validate and improve the generated XML
+        max_validation_attempts: Maximum number of validation improvement attempts
+        validation_candidates: Improvements requested concurrently per validation
+            round
+
+    Returns:
+        Streaming response of server-sent events
+    """
+    llm_service = LlmService()
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for event, data in llm_service.generate_xml_stream(
+                description=request.description,
+                model=request.model or "anthropic:claude-3-7-sonnet-latest",
+                validate=validate,
+                max_validation_attempts=max_validation_attempts,
+                validation_candidates=validation_candidates,
+            ):
+                yield _sse_event(event, data)
+        except Exception as e:
+            logger.error(f"XML generation failed: {str(e)}")
+            yield _sse_event("error", {"detail": f"Failed to generate XML: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode a server-sent event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
 @router.post("/modify-xml", response_model=XmlResponse)
 async def modify_xml(
     request: XmlModificationRequest,
     db: AsyncSession = Depends(get_session),
     validate: bool = True,
     max_validation_attempts: int = 3,
+    validation_candidates: int = Query(1, ge=1),
 ):
     """
     Modify existing BPMN XML based on a natural language request.
@@ -262,6 +321,8 @@ async def modify_xml(
         db: Database session
         validate: Whether to validate and improve the modified XML
         max_validation_attempts: Maximum number of validation improvement attempts
+        validation_candidates: Improvements requested concurrently per validation
+            round
 
     Returns:
         Modified XML and explanation
@@ -275,6 +336,7 @@ async def modify_xml(
             model=request.model or "anthropic:claude-3-7-sonnet-latest",
             validate=validate,
             max_validation_attempts=max_validation_attempts,
+            validation_candidates=validation_candidates,
         )
 
         if not response["xml"]:
@@ -313,6 +375,17 @@ async def modify_xml(
         raise HTTPException(status_code=500, detail=f"Failed to modify XML: {str(e)}")
 
 
+@router.get("/metrics")
+async def get_llm_metrics() -> Dict[str, Any]:
+    """
+    Get LLM usage metrics of this worker.
+
+    Returns:
+        Response cache hit and miss counts
+    """
+    return {"response_cache": LlmService.response_cache.stats()}
+
+
 @router.post("/sessions", response_model=ChatSessionResponse)
 async def create_chat_session(
     request: ChatSessionCreate, db: AsyncSession = Depends(get_session)
@@ -30,6 +30,13 @@ class RabbitMQSettings(BaseModel):
     url: AmqpDsn
     connection_attempts: int
     retry_delay: int
+    prefetch_count: int = 32
+
+
+class LlmSettings(BaseModel):
+    max_concurrency: int = 16
+    requests_per_second: float = 10.0
+    request_burst: int = 20
 
 
 class SecuritySettings(BaseModel):
@@ -56,6 +63,7 @@ class Settings(BaseSettings):
     database: DatabaseSettings
     redis: RedisSettings
     rabbitmq: RabbitMQSettings
+    llm: LlmSettings = LlmSettings()
     security: SecuritySettings
     process: ProcessSettings
 
@@ -90,7 +90,7 @@ class CallActivityManager:
             node_id=token.node_id,
             scope_id=token.scope_id,
         )
-        await self.state_manager.redis.delete(f"tokens:{token.instance_id}")
+        await self.state_manager.redis.delete(token.tokens_key)
 
         # Clean up any remaining tokens in subprocess
         await self.state_manager.clear_scope_tokens(
@@ -128,7 +128,7 @@ class CallActivityManager:
         await self.state_manager.remove_token(
             instance_id=token.instance_id, node_id=token.node_id
         )
-        await self.state_manager.redis.delete(f"tokens:{token.instance_id}")
+        await self.state_manager.redis.delete(token.tokens_key)
 
         # Clean up any remaining tokens in subprocess
         await self.state_manager.clear_scope_tokens(
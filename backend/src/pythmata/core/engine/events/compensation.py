@@ -8,6 +8,8 @@ from .boundary import BoundaryEvent
 class CompensationScope:
     """Represents a compensation scope that can contain compensation handlers"""
 
+    __slots__ = ("scope_id", "parent_scope", "handlers", "_ordered_handlers")
+
     def __init__(
         self, scope_id: str, parent_scope: Optional["CompensationScope"] = None
     ):
@@ -116,7 +116,7 @@ class MultiInstanceManager:
             await self.state_manager.remove_token(
                 instance_id=token.instance_id, node_id=token.node_id
             )
-            await self.state_manager.redis.delete(f"tokens:{token.instance_id}")
+            await self.state_manager.redis.delete(token.tokens_key)
 
         await self.state_manager.add_token(
             instance_id=instance_token.instance_id,
@@ -200,7 +200,7 @@ class MultiInstanceManager:
         await self.state_manager.remove_token(
             instance_id=token.instance_id, node_id=token.node_id
         )
-        await self.state_manager.redis.delete(f"tokens:{token.instance_id}")
+        await self.state_manager.redis.delete(token.tokens_key)
 
         if next_index < total_instances:
             # Create next sequential instance
@@ -231,7 +231,7 @@ class MultiInstanceManager:
         await self.state_manager.remove_token(
             instance_id=token.instance_id, node_id=token.node_id
         )
-        await self.state_manager.redis.delete(f"tokens:{token.instance_id}")
+        await self.state_manager.redis.delete(token.tokens_key)
 
         # Create token at next task
         new_token = token.copy(node_id=next_task_id, scope_id=None)
@@ -1,7 +1,6 @@
 """Service task executor implementation."""
 
 from typing import Dict, Optional
-from uuid import UUID
 
 from pythmata.api.schemas import ProcessVariableValue
 from pythmata.core.engine.token import Token
@@ -86,7 +85,7 @@ class ServiceTaskExecutor:
             # Create activity log
             if instance_manager:
                 await instance_manager._create_activity_log(
-                    UUID(token.instance_id),
+                    token.instance_uuid,
                     ActivityType.SERVICE_TASK_EXECUTED,
                     task.id,
                     {
@@ -128,7 +127,7 @@ class ServiceTaskExecutor:
             # Create activity log for error
             if instance_manager:
                 await instance_manager._create_activity_log(
-                    UUID(token.instance_id),
+                    token.instance_uuid,
                     ActivityType.SERVICE_TASK_EXECUTED,
                     task.id,
                     {
@@ -33,7 +33,7 @@ class SubprocessManager:
             await self.state_manager.remove_token(
                 instance_id=token.instance_id, node_id=token.node_id
             )
-            await pipe.delete(f"tokens:{token.instance_id}")
+            await pipe.delete(token.tokens_key)
 
             # Create new token in subprocess scope
             new_token = token.copy(node_id=subprocess_id, scope_id=subprocess_id)
@@ -70,7 +70,7 @@ class SubprocessManager:
             await self.state_manager.remove_token(
                 instance_id=token.instance_id, node_id=token.node_id
             )
-            await pipe.delete(f"tokens:{token.instance_id}")
+            await pipe.delete(token.tokens_key)
 
             # Create new token in parent scope
             new_token = token.copy(node_id=next_task_id, scope_id=None)
@@ -127,7 +127,7 @@ class SubprocessManager:
                 node_id=token.node_id,
                 scope_id=token.scope_id,
             )
-            await pipe.delete(f"tokens:{token.instance_id}")
+            await pipe.delete(token.tokens_key)
 
             # Clean up any remaining tokens in subprocess scope
             await self.state_manager.clear_scope_tokens(
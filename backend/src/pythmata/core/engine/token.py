@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Dict, Optional
 from uuid import UUID, uuid4
 
@@ -33,6 +34,16 @@ class Token:
         self.parent_instance_id = parent_instance_id
         self.parent_activity_id = parent_activity_id
 
+    @cached_property
+    def instance_uuid(self) -> UUID:
+        """Process instance ID as a UUID, parsed once per token."""
+        return UUID(self.instance_id)
+
+    @cached_property
+    def tokens_key(self) -> str:
+        """Redis key of the cached token list of this token's instance."""
+        return f"tokens:{self.instance_id}"
+
     def to_dict(self) -> Dict:
         """Convert token to dictionary for storage."""
         data = {
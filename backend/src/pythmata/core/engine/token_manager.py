@@ -1,7 +1,13 @@
+import asyncio
+import logging
+import random
 from datetime import UTC, datetime
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from uuid import UUID
 
+from redis.exceptions import WatchError
+from sqlalchemy import update
+
 from pythmata.core.engine.token import Token, TokenState
 from pythmata.core.state import StateManager
 from pythmata.models.process import ActivityType, ProcessInstance, ProcessStatus
@@ -9,9 +15,28 @@ from pythmata.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Resolved once instead of per call on the token hot paths
+_ACTIVE_VALUE = TokenState.ACTIVE.value
+_TRANSACTION_PREFIX = "Transaction_"
+_TRANSACTION_START = "Transaction_Start"
+_TRANSACTION_END = "Transaction_End"
+_TRANSACTION_SENTINELS = frozenset({_TRANSACTION_START, _TRANSACTION_END})
+_END_1 = "End_1"
+
 
 class TokenStateError(Exception):
-    """Raised when token state is invalid for requested operation."""
+    """
+    Raised when token state is invalid for requested operation.
+
+    The message may be a %-style template followed by its arguments; it is
+    only formatted when the error is rendered, so errors raised and handled
+    on the hot path (e.g. during optimistic retries) cost no formatting.
+    """
+
+    def __str__(self) -> str:
+        if len(self.args) > 1:
+            return self.args[0] % self.args[1:]
+        return super().__str__()
 
 
 class TokenManager:
@@ -21,46 +46,127 @@ class TokenManager:
 
     def __init__(self, state_manager: StateManager):
         self.state_manager = state_manager
+        self.max_retries = 10  # optimistic transaction attempts
+        self.retry_delay = 0.005  # base backoff in seconds
 
-    async def _verify_token_state(self, token: Token) -> None:
+    @staticmethod
+    def _find_stored_token(
+        tokens: List[Dict[str, Any]], token: Token
+    ) -> Dict[str, Any]:
         """
-        Verify token is in valid state for operations.
+        Find the stored entry of an active token in a token list.
 
         Args:
-            token: Token to verify
+            tokens: Token list as stored for the instance
+            token: Token to look up
+
+        Returns:
+            The stored token entry
 
         Raises:
-            TokenStateError: If token state is invalid
+            TokenStateError: If the token is missing or not active
         """
-        logger.info(f"[TokenVerification] Verifying token state for {token.id}")
-        logger.debug(f"[TokenVerification] Token details: {token.to_dict()}")
-
-        # Get current token state from storage
-        stored_token = await self.state_manager.get_token(
-            instance_id=token.instance_id, node_id=token.node_id
+        stored_token = next(
+            (
+                t
+                for t in tokens
+                if t["node_id"] == token.node_id and t.get("scope_id") is None
+            ),
+            None,
         )
-        logger.debug(
-            f"[TokenVerification] Retrieved stored token state: {stored_token}"
-        )
-
         if not stored_token:
-            logger.error(f"[TokenVerification] Token {token.id} not found in storage")
-            raise TokenStateError(f"Token not found: {token.id}")
+            raise TokenStateError("Token not found: %s", token.id)
 
         current_state = stored_token.get("state")
-        logger.info(
-            f"[TokenVerification] Token {token.id} current state: {current_state}"
-        )
-
-        if current_state != TokenState.ACTIVE.value:
-            logger.error(
-                f"[TokenVerification] Token {token.id} is in invalid state: {current_state}"
-            )
+        if current_state != _ACTIVE_VALUE:
             raise TokenStateError(
-                f"Token {token.id} is not active (state: {current_state})"
+                "Token %s is not active (state: %s)", token.id, current_state
             )
+        return stored_token
 
-        logger.info(f"[TokenVerification] Token {token.id} verification successful")
+    async def _update_tokens(
+        self,
+        token: Token,
+        update: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Apply an update to a token's instance token list with optimistic locking.
+
+        The token list is watched while ``update`` computes the new list and
+        the result is written with MULTI/EXEC. If another client modifies the
+        list in between, the write is aborted and retried after a jittered
+        backoff.
+
+        Args:
+            token: Token whose process instance is updated
+            update: Receives the current token list and returns the new one;
+                may raise TokenStateError to abort the operation
+
+        Raises:
+            TokenStateError: If the update still conflicts after all retries
+        """
+        instance_id = token.instance_id
+        for attempt in range(self.max_retries):
+            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
+                try:
+                    tokens = await self.state_manager.watch_tokens(pipe, instance_id)
+                    new_tokens = update(tokens)
+                    pipe.multi()
+                    await self.state_manager.queue_token_positions(
+                        pipe, instance_id, new_tokens
+                    )
+                    await pipe.delete(token.tokens_key)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    logger.debug(
+                        "Token list of instance %s changed, retrying (attempt %d/%d)",
+                        instance_id,
+                        attempt + 1,
+                        self.max_retries,
+                    )
+            await asyncio.sleep(random.uniform(0, self.retry_delay * 2**attempt))
+
+        raise TokenStateError(
+            "Concurrent token modification for instance %s", instance_id
+        )
+
+    async def _transition_tokens(self, source: Token, targets: List[Token]) -> None:
+        """
+        Replace a token with new active tokens in one optimistic transaction.
+
+        The source token is verified, all tokens at its node are removed and
+        each target replaces any token at the same node and scope.
+
+        Args:
+            source: The token being replaced
+            targets: Tokens to place instead of the source
+
+        Raises:
+            TokenStateError: If the source token is invalid or the update
+                keeps conflicting with concurrent modifications
+        """
+        replaced = {(target.node_id, target.scope_id) for target in targets}
+
+        def transition(tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            self._find_stored_token(tokens, source)
+            new_tokens = [
+                t
+                for t in tokens
+                if t["node_id"] != source.node_id
+                and (t["node_id"], t.get("scope_id")) not in replaced
+            ]
+            for target in targets:
+                data = target.to_dict()
+                data["state"] = _ACTIVE_VALUE
+                new_tokens.append(
+                    self.state_manager.token_entry(
+                        target.instance_id, target.node_id, data
+                    )
+                )
+            return new_tokens
+
+        await self._update_tokens(source, transition)
 
     async def create_initial_token(
         self, instance_id: str, start_event_id: str
@@ -75,93 +181,62 @@ class TokenManager:
         Returns:
             The created token
         """
-        logger.info(
-            f"[TokenCreation] Starting creation of initial token for instance {instance_id} at node {start_event_id}"
-        )
-
-        # Log all existing tokens for this instance
-        all_tokens = await self.state_manager.get_token_positions(instance_id)
-        logger.info(
-            f"[TokenState] Current tokens for instance {instance_id}: {len(all_tokens)} tokens"
-        )
-        for t in all_tokens:
-            logger.info(f"[TokenState] Existing token: {t}")
-
-        # Log Redis keys for this instance
-        keys = await self.state_manager.redis.keys(f"process:{instance_id}:*")
-        logger.info(
-            f"[RedisState] Current Redis keys for instance {instance_id}: {keys}"
-        )
+        # Diagnostics cost extra round-trips, so only collect them when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            all_tokens = await self.state_manager.get_token_positions(instance_id)
+            logger.debug(
+                "[TokenState] Current tokens for instance %s: %s",
+                instance_id,
+                all_tokens,
+            )
+            keys = [
+                key
+                async for key in self.state_manager.redis.scan_iter(
+                    match=f"process:{instance_id}:*"
+                )
+            ]
+            logger.debug(
+                "[RedisState] Current Redis keys for instance %s: %s", instance_id, keys
+            )
+            lock_exists = await self.state_manager.redis.exists(
+                f"lock:process:{instance_id}"
+            )
+            logger.debug(
+                "[LockState] Lock status for instance %s: exists=%s",
+                instance_id,
+                lock_exists,
+            )
 
         token = Token(instance_id=instance_id, node_id=start_event_id)
-        logger.info(f"[TokenCreation] Created new token object: {token.to_dict()}")
 
-        # Check if token already exists
-        logger.info(
-            f"[TokenIdempotency] Checking for existing token at {start_event_id}"
-        )
-        existing_token = await self.state_manager.get_token(
-            instance_id=instance_id, node_id=start_event_id
-        )
-        if existing_token:
+        try:
+            # Create the token unless one exists, atomically in one round-trip
+            stored_token, created = await self.state_manager.add_token_if_absent(
+                instance_id=instance_id,
+                node_id=start_event_id,
+                data=token.to_dict(),
+            )
+        except Exception as e:
+            logger.error("Failed to create initial token: %s", e)
+            raise
+
+        if not created:
             logger.info(
-                f"[TokenIdempotency] Token already exists at {start_event_id} for instance {instance_id}, returning existing token"
+                "create_initial_token %s at %s: existing", instance_id, start_event_id
             )
-            logger.debug(f"[TokenIdempotency] Existing token details: {existing_token}")
             # Return existing token instead of raising an error for idempotency
             return Token(
                 instance_id=instance_id,
                 node_id=start_event_id,
-                token_id=(
-                    UUID(existing_token["id"]) if existing_token.get("id") else None
-                ),
-                data=existing_token.get("data", {}),
-                state=TokenState(existing_token.get("state", "ACTIVE")),
+                token_id=(UUID(stored_token["id"]) if stored_token.get("id") else None),
+                data=stored_token.get("data", {}),
+                state=TokenState(stored_token.get("state", _ACTIVE_VALUE)),
             )
+
         logger.info(
-            f"[TokenIdempotency] No existing token found, proceeding with creation"
+            "create_initial_token %s at %s: created", instance_id, start_event_id
         )
-
-        try:
-            # Create token atomically
-            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
-                logger.info(
-                    f"[RedisTransaction] Starting atomic token creation for {token.id}"
-                )
-
-                # Check for any locks
-                lock_key = f"lock:process:{instance_id}"
-                lock_exists = await self.state_manager.redis.exists(lock_key)
-                logger.info(
-                    f"[LockState] Lock status for instance {instance_id}: exists={lock_exists}"
-                )
-
-                await self.state_manager.add_token(
-                    instance_id=instance_id,
-                    node_id=start_event_id,
-                    data=token.to_dict(),
-                )
-                await pipe.execute()
-
-                # Verify token was created
-                created_token = await self.state_manager.get_token(
-                    instance_id=instance_id, node_id=start_event_id
-                )
-                logger.info(
-                    f"[TokenVerification] Token creation verification: {created_token is not None}"
-                )
-                if created_token:
-                    logger.info(
-                        f"[TokenVerification] Created token state: {created_token}"
-                    )
-
-            logger.info(
-                f"[TokenCreation] Initial token {token.id} created successfully"
-            )
-            return token
-        except Exception as e:
-            logger.error(f"Failed to create initial token: {str(e)}")
-            raise
+        return token
 
     async def move_token(
         self,
@@ -172,6 +247,10 @@ class TokenManager:
         """
         Move a token to a new node.
 
+        The move is applied optimistically: the token list is watched and the
+        write aborts and retries if another operation changed it concurrently.
+        Only transaction end handling takes the instance lock.
+
         Args:
             token: The token to move
             target_node_id: ID of the target node
@@ -183,118 +262,131 @@ class TokenManager:
         Raises:
             TokenStateError: If token state is invalid or lock cannot be acquired
         """
-        logger.info(f"Moving token {token.id} from {token.node_id} to {target_node_id}")
-
-        # Acquire instance lock first
-        if not await self.state_manager.acquire_lock(token.instance_id):
-            logger.error(f"Failed to acquire lock for instance {token.instance_id}")
-            raise TokenStateError("Failed to acquire instance lock")
+        if instance_manager and target_node_id == _TRANSACTION_END:
+            return await self._move_to_transaction_end(token, instance_manager)
 
+        log_events: List[str] = []
         try:
-            # Verify token state
-            await self._verify_token_state(token)
+            # Transaction boundaries are resolved before the move
+            start_transaction = (
+                instance_manager is not None
+                and target_node_id.startswith(_TRANSACTION_PREFIX)
+                and target_node_id not in _TRANSACTION_SENTINELS
+            )
+            transaction_id = target_node_id
+            if start_transaction:
+                target_node_id = _TRANSACTION_START
+
+            new_token = token.copy(node_id=target_node_id, scope_id=token.scope_id)
+            await self._transition_tokens(token, [new_token])
+            log_events.append("write")
+
+            if start_transaction:
+                await self._apply_or_revert(
+                    token,
+                    new_token,
+                    lambda: instance_manager.start_transaction(
+                        token.instance_uuid, transaction_id
+                    ),
+                )
+                log_events.append("transaction_start")
 
-            # Create activity log for node completion if instance manager is provided
             if instance_manager:
-                logger.info(
-                    f"[ActivityLog] Creating NODE_COMPLETED log for {token.node_id}"
-                )
                 await instance_manager._create_activity_log(
-                    UUID(token.instance_id),
+                    token.instance_uuid,
                     ActivityType.NODE_COMPLETED,
                     token.node_id,
                 )
+                await instance_manager._create_activity_log(
+                    token.instance_uuid,
+                    ActivityType.NODE_ENTERED,
+                    target_node_id,
+                )
+                log_events.append("activity")
 
-            # Handle transaction boundaries if instance manager is provided
-            if instance_manager:
-                if target_node_id == "Transaction_End":
-                    logger.info(f"Handling transaction end for token {token.id}")
-                    return await self._handle_transaction_end(token, instance_manager)
-                elif target_node_id.startswith(
-                    "Transaction_"
-                ) and target_node_id not in [
-                    "Transaction_Start",
-                    "Transaction_End",
-                ]:
-                    logger.info(f"Starting transaction for token {token.id}")
-                    await instance_manager.start_transaction(
-                        UUID(token.instance_id), target_node_id
-                    )
-                    target_node_id = "Transaction_Start"
+            # Handle process completion if moving to end event
+            if target_node_id == _END_1 and instance_manager:
+                await self._handle_process_completion(token, instance_manager)
+                log_events.append("completion")
 
-            # Use Redis transaction for atomic move
             logger.info(
-                f"[RedisTransaction] Starting atomic token move operation for {token.id}"
-            )
-            logger.debug(
-                f"[RedisTransaction] Moving from {token.node_id} to {target_node_id}"
+                "move_token %s %s->%s: %s",
+                token.id,
+                token.node_id,
+                target_node_id,
+                log_events,
             )
+            return new_token
+        except Exception as e:
+            logger.error("Failed to move token: %s", e)
+            raise
 
-            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
-                # Create new token at target node first
-                new_token = token.copy(node_id=target_node_id, scope_id=token.scope_id)
-                logger.info(
-                    f"[TokenCreation] Creating new token {new_token.id} at {target_node_id}"
-                )
-                logger.debug(f"[TokenState] New token data: {new_token.to_dict()}")
-                await self.state_manager.add_token(
-                    instance_id=new_token.instance_id,
-                    node_id=new_token.node_id,
-                    data=new_token.to_dict(),
-                )
-                await self.state_manager.update_token_state(
-                    instance_id=new_token.instance_id,
-                    node_id=new_token.node_id,
-                    state=TokenState.ACTIVE,
-                    scope_id=new_token.scope_id,
-                )
+    async def _apply_or_revert(
+        self, source: Token, moved: Token, apply: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """
+        Run a state change a token move depends on, undoing the move on failure.
 
-                # Then remove old token
-                logger.info(f"Removing token {token.id} from {token.node_id}")
-                await self.state_manager.remove_token(
-                    instance_id=token.instance_id, node_id=token.node_id
-                )
-                await pipe.delete(f"tokens:{token.instance_id}")
+        Transaction state lives outside the token list, so it cannot join the
+        watched write. It is applied right after the move instead, and if it
+        fails the token is moved back to its source node.
 
-                # Execute transaction
-                logger.info(
-                    f"[RedisTransaction] Executing Redis pipeline for token movement"
-                )
-                await pipe.execute()
-                logger.info(
-                    f"[TokenMovement] Token {token.id} moved to {target_node_id} successfully"
-                )
-                logger.debug(
-                    f"[TokenMovement] Final token state: {new_token.to_dict()}"
-                )
+        Args:
+            source: The token as it was before the move
+            moved: The token after the move
+            apply: Applies the dependent state change
 
-            # Create activity log for node entry if instance manager is provided
-            if instance_manager:
-                logger.info(
-                    f"[ActivityLog] Creating NODE_ENTERED log for {target_node_id}"
-                )
-                await instance_manager._create_activity_log(
-                    UUID(token.instance_id),
-                    ActivityType.NODE_ENTERED,
-                    target_node_id,
-                )
+        Raises:
+            Exception: Whatever ``apply`` raised, after the move was undone
+        """
+        try:
+            await apply()
+        except Exception:
+            await self._transition_tokens(moved, [source])
+            raise
 
-            # Handle process completion if moving to end event
-            if target_node_id == "End_1" and instance_manager:
-                logger.info(
-                    f"[ProcessCompletion] Token {token.id} reached end event, handling completion"
-                )
-                logger.debug(f"[ProcessCompletion] Instance ID: {token.instance_id}")
-                await self._handle_process_completion(token, instance_manager)
+    async def _move_to_transaction_end(self, token: Token, instance_manager) -> Token:
+        """
+        Move a token to the transaction end while holding the instance lock.
 
-            return new_token
+        Completing a transaction spans SQL and Redis state, so unlike regular
+        moves it is serialized with the pessimistic instance lock.
+
+        Args:
+            token: The token to move
+            instance_manager: Instance manager handling the transaction
+
+        Returns:
+            The moved token
+
+        Raises:
+            TokenStateError: If token state is invalid or lock cannot be acquired
+        """
+        if not await self.state_manager.acquire_lock(token.instance_id):
+            logger.error("Failed to acquire lock for instance %s", token.instance_id)
+            raise TokenStateError("Failed to acquire instance lock")
+
+        try:
+            new_token = await self._handle_transaction_end(token, instance_manager)
         except Exception as e:
-            logger.error(f"Failed to move token: {str(e)}")
+            logger.error("Failed to move token: %s", e)
             raise
         finally:
             # Always release the lock
             await self.state_manager.release_lock(token.instance_id)
 
+        # Mark process as completed outside the lock-held region
+        await self._handle_process_completion(token, instance_manager)
+
+        logger.info(
+            "move_token %s %s->%s: %s",
+            token.id,
+            token.node_id,
+            new_token.node_id,
+            ["lock", "transaction_end", "completion"],
+        )
+        return new_token
+
     async def consume_token(self, token: Token) -> None:
         """
         Consume a token (remove it from the process).
@@ -303,48 +395,19 @@ class TokenManager:
             token: The token to consume
 
         Raises:
-            TokenStateError: If token state is invalid or lock cannot be acquired
+            TokenStateError: If token state is invalid
         """
-        logger.info(f"Consuming token {token.id} at {token.node_id}")
 
-        # Acquire instance lock first
-        if not await self.state_manager.acquire_lock(token.instance_id):
-            logger.error(f"Failed to acquire lock for instance {token.instance_id}")
-            raise TokenStateError("Failed to acquire instance lock")
+        def consume(tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            self._find_stored_token(tokens, token)
+            return [t for t in tokens if t["node_id"] != token.node_id]
 
         try:
-            # Get token state
-            stored_token = await self.state_manager.get_token(
-                instance_id=token.instance_id, node_id=token.node_id
-            )
-
-            if not stored_token:
-                logger.error(f"Token {token.id} not found for consumption")
-                raise TokenStateError(f"Token not found: {token.id}")
-
-            if stored_token.get("state") != TokenState.ACTIVE.value:
-                logger.error(
-                    f"Cannot consume inactive token {token.id} (state: {stored_token.get('state')})"
-                )
-                raise TokenStateError(
-                    f"Token {token.id} is not active (state: {stored_token.get('state')})"
-                )
-
-            # Use Redis transaction for atomic consumption
-            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
-                # Remove token atomically
-                await self.state_manager.remove_token(
-                    instance_id=token.instance_id, node_id=token.node_id
-                )
-                await pipe.delete(f"tokens:{token.instance_id}")
-                await pipe.execute()
-                logger.info(f"Token {token.id} consumed successfully")
+            await self._update_tokens(token, consume)
+            logger.info("consume_token %s at %s", token.id, token.node_id)
         except Exception as e:
-            logger.error(f"Failed to consume token: {str(e)}")
+            logger.error("Failed to consume token: %s", e)
             raise
-        finally:
-            # Always release the lock
-            await self.state_manager.release_lock(token.instance_id)
 
     async def split_token(
         self, token: Token, target_node_ids: List[str], instance_manager=None
@@ -363,72 +426,30 @@ class TokenManager:
         Raises:
             TokenStateError: If token state is invalid
         """
-        logger.info(
-            f"Splitting token {token.id} into {len(target_node_ids)} new tokens"
-        )
-
         try:
-            # Verify token state before operation
-            await self._verify_token_state(token)
+            # Verify and replace the original token in one transaction
+            new_tokens = [token.copy(node_id=node_id) for node_id in target_node_ids]
+            await self._transition_tokens(token, new_tokens)
 
-            # Create activity log for node completion if instance manager is provided
             if instance_manager:
-                logger.info(
-                    f"[ActivityLog] Creating NODE_COMPLETED log for {token.node_id}"
-                )
                 await instance_manager._create_activity_log(
-                    UUID(token.instance_id),
+                    token.instance_uuid,
                     ActivityType.NODE_COMPLETED,
                     token.node_id,
                 )
-
-            # Use Redis transaction for atomic split
-            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
-                logger.info(f"Removing original token {token.id} from {token.node_id}")
-                # Remove original token
-                await self.state_manager.remove_token(
-                    instance_id=token.instance_id, node_id=token.node_id
-                )
-                await pipe.delete(f"tokens:{token.instance_id}")
-
-                # Create new tokens
-                new_tokens = []
-                for node_id in target_node_ids:
-                    new_token = token.copy(node_id=node_id)
-                    logger.info(f"Creating new token {new_token.id} at {node_id}")
-                    await self.state_manager.add_token(
-                        instance_id=new_token.instance_id,
-                        node_id=new_token.node_id,
-                        data=new_token.to_dict(),
-                    )
-                    await self.state_manager.update_token_state(
-                        instance_id=new_token.instance_id,
-                        node_id=new_token.node_id,
-                        state=TokenState.ACTIVE,
-                    )
-                    new_tokens.append(new_token)
-
-                # Execute transaction
-                await pipe.execute()
-                logger.info(
-                    f"Token split completed successfully, created {len(new_tokens)} new tokens"
-                )
-
-            # Create activity logs for node entries if instance manager is provided
-            if instance_manager:
                 for node_id in target_node_ids:
-                    logger.info(
-                        f"[ActivityLog] Creating NODE_ENTERED log for {node_id}"
-                    )
                     await instance_manager._create_activity_log(
-                        UUID(token.instance_id),
+                        token.instance_uuid,
                         ActivityType.NODE_ENTERED,
                         node_id,
                     )
 
+            logger.info(
+                "split_token %s %s->%s", token.id, token.node_id, target_node_ids
+            )
             return new_tokens
         except Exception as e:
-            logger.error(f"Failed to split token: {str(e)}")
+            logger.error("Failed to split token: %s", e)
             raise
 
     async def update_token_state(
@@ -445,91 +466,70 @@ class TokenManager:
         Raises:
             TokenStateError: If token state is invalid
         """
-        logger.info(f"Updating token {token.id} state to {state.value}")
-        try:
-            # Verify token exists before update
-            stored_token = await self.state_manager.get_token(
-                instance_id=token.instance_id, node_id=token.node_id
+        scope = scope_id or token.scope_id
+
+        def set_state(tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            stored_token = next(
+                (
+                    t
+                    for t in tokens
+                    if t["node_id"] == token.node_id and t.get("scope_id") == scope
+                ),
+                None,
             )
             if not stored_token:
-                logger.error(f"Token {token.id} not found for state update")
-                raise TokenStateError(f"Token not found: {token.id}")
+                raise TokenStateError("Token not found: %s", token.id)
+            stored_token["state"] = state.value
+            stored_token["data"]["state"] = state.value
+            return tokens
 
-            # Use Redis transaction for atomic update
-            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
-                await self.state_manager.update_token_state(
-                    instance_id=token.instance_id,
-                    node_id=token.node_id,
-                    state=state,
-                    scope_id=scope_id or token.scope_id,
-                )
-                await pipe.execute()
-                logger.info(
-                    f"Token {token.id} state updated successfully to {state.value}"
-                )
+        try:
+            # Check and update in one optimistic transaction
+            await self._update_tokens(token, set_state)
+            logger.info("update_token_state %s -> %s", token.id, state.value)
         except Exception as e:
-            logger.error(f"Failed to update token state: {str(e)}")
+            logger.error("Failed to update token state: %s", e)
             raise
 
     async def _handle_transaction_end(self, token: Token, instance_manager) -> Token:
         """Handle moving token to transaction end."""
-        logger.info(f"Handling transaction end for token {token.id}")
         try:
-            # Complete the transaction
-            logger.info(f"Completing transaction for instance {token.instance_id}")
-            await instance_manager.complete_transaction(UUID(token.instance_id))
-
-            # Use Redis transaction for atomic operation
-            async with self.state_manager.redis.pipeline(transaction=True) as pipe:
-                logger.info(f"Removing token {token.id} from {token.node_id}")
-                # Remove current token
-                await self.state_manager.remove_token(
-                    instance_id=token.instance_id, node_id=token.node_id
-                )
-                await pipe.delete(f"tokens:{token.instance_id}")
-
-                # Create new token at End_1
-                new_token = token.copy(node_id="End_1")
-                logger.info(f"Creating new token {new_token.id} at End_1")
-                await self.state_manager.add_token(
-                    instance_id=new_token.instance_id,
-                    node_id=new_token.node_id,
-                    data=new_token.to_dict(),
-                )
-
-                # Execute transaction
-                await pipe.execute()
-                logger.info(f"Transaction end handling completed successfully")
+            # Verify and replace the current token with a new one at End_1
+            new_token = token.copy(node_id=_END_1)
+            await self._transition_tokens(token, [new_token])
+
+            # Complete the transaction, leaving the token in it if that fails
+            await self._apply_or_revert(
+                token,
+                new_token,
+                lambda: instance_manager.complete_transaction(token.instance_uuid),
+            )
 
-            # Mark process as completed
-            await self._handle_process_completion(token, instance_manager)
+            await instance_manager._create_activity_log(
+                token.instance_uuid,
+                ActivityType.NODE_COMPLETED,
+                token.node_id,
+            )
 
             return new_token
         except Exception as e:
-            logger.error(f"Failed to handle transaction end: {str(e)}")
+            logger.error("Failed to handle transaction end: %s", e)
             raise
 
     async def _handle_process_completion(self, token: Token, instance_manager) -> None:
         """Handle process completion when token reaches end event."""
-        logger.info(f"Handling process completion for instance {token.instance_id}")
         try:
-            instance = await instance_manager.session.get(
-                ProcessInstance, UUID(token.instance_id)
+            # Single UPDATE instead of loading the instance to change two columns
+            result = await instance_manager.session.execute(
+                update(ProcessInstance)
+                .where(ProcessInstance.id == token.instance_uuid)
+                .values(status=ProcessStatus.COMPLETED, end_time=datetime.now(UTC))
             )
-            if instance:
-                logger.info(
-                    f"Updating instance {token.instance_id} status to COMPLETED"
-                )
-                instance.status = ProcessStatus.COMPLETED
-                instance.end_time = datetime.now(UTC)
-                await instance_manager.session.commit()
-                logger.info(
-                    f"Process instance {token.instance_id} completed successfully"
-                )
-            else:
+            await instance_manager.session.commit()
+            if not result.rowcount:
                 logger.warning(
-                    f"Process instance {token.instance_id} not found for completion"
+                    "Process instance %s not found for completion", token.instance_id
                 )
         except Exception as e:
-            logger.error(f"Failed to handle process completion: {str(e)}")
+            logger.error("Failed to handle process completion: %s", e)
             raise
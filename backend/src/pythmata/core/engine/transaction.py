@@ -18,6 +18,8 @@ class TransactionStatus(Enum):
 class Transaction(CompensationScope):
     """Represents a transaction boundary that can contain compensatable activities"""
 
+    __slots__ = ("instance_id", "completed_activities", "status")
+
     @classmethod
     def start(cls, transaction_id: str, instance_id: str) -> "Transaction":
         """
@@ -71,6 +73,8 @@ class Transaction(CompensationScope):
 class TransactionContext:
     """Manages the execution context and state of a transaction"""
 
+    __slots__ = ("scope", "state", "_participants", "_last_activity_id")
+
     def __init__(self, transaction: Transaction):
         """
         Initialize transaction context
@@ -83,6 +87,8 @@ class TransactionContext:
         self._participants: Dict[str, Token] = (
             {}
         )  # Maps activity IDs to their completion tokens
+        # Most recently added participant, kept so commit/rollback need no scan
+        self._last_activity_id: Optional[str] = None
 
     async def record_completion(self, token: Token) -> None:
         """
@@ -92,6 +98,8 @@ class TransactionContext:
             token: Token representing the completed activity
         """
         activity_id = token.node_id
+        if activity_id not in self._participants:
+            self._last_activity_id = activity_id
         self._participants[activity_id] = token
         self.scope.mark_completed(activity_id)
 
@@ -114,13 +122,13 @@ class TransactionContext:
         Returns:
             Token: Token representing the transaction completion
         """
-        if not self._participants:
+        if self._last_activity_id is None:
             raise ValueError("Cannot commit empty transaction")
 
         self.state = TransactionStatus.COMMITTED
 
         # Use the last participant's token as base for result
-        last_token = next(reversed(self._participants.values()))
+        last_token = self._participants[self._last_activity_id]
         return Token(
             instance_id=last_token.instance_id,
             node_id=last_token.node_id,
@@ -135,13 +143,14 @@ class TransactionContext:
         Returns:
             Token: Compensation token for the first activity to compensate
         """
-        if not self._participants:
+        if self._last_activity_id is None:
             raise ValueError("Cannot rollback empty transaction")
 
         self.state = TransactionStatus.COMPENSATING
 
         # Get first activity to compensate (LIFO order)
-        activity_id, token = next(reversed(self._participants.items()))
+        activity_id = self._last_activity_id
+        token = self._participants[activity_id]
 
         # Get compensation handler for the activity
         handler = self.scope.get_handler_for_activity(activity_id)
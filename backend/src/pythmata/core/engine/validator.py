@@ -1,10 +1,93 @@
-from typing import Dict, List, Optional, Set
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import accumulate
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from pythmata.core.types import Event, EventType
 from pythmata.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_FlowRefGetters = Tuple[Callable[[Any], str], Callable[[Any], str]]
+_DICT_FLOW_REFS: _FlowRefGetters = (itemgetter("source_ref"), itemgetter("target_ref"))
+_OBJECT_FLOW_REFS: _FlowRefGetters = (
+    attrgetter("source_ref"),
+    attrgetter("target_ref"),
+)
+
+
+def _normalize_flows(flows: List) -> List[Tuple[str, str]]:
+    """
+    Extract the (source, target) references of all flows.
+
+    Flows are either dicts or flow objects; the accessors are picked once
+    from the first flow so the per-flow loop has no representation checks.
+    """
+    get_source, get_target = (
+        _OBJECT_FLOW_REFS
+        if flows and not isinstance(flows[0], dict)
+        else _DICT_FLOW_REFS
+    )
+    return [(get_source(flow), get_target(flow)) for flow in flows]
+
+
+def _node_signature(node: Any) -> Tuple[str, Optional[EventType]]:
+    """Return the parts of a node that graph validation depends on."""
+    return node.id, node.event_type if isinstance(node, Event) else None
+
+
+# DFS node colours: unvisited, on the current path, finished
+_WHITE, _GRAY, _BLACK = 0, 1, 2
+
+
+def _dfs_check(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    self_loops: bytearray,
+    starts: Iterable[int],
+) -> Tuple[int, bytearray]:
+    """
+    Iterative colouring DFS over a graph in CSR form.
+
+    Args:
+        indptr: Offset of each node's successors in ``indices`` (length n + 1)
+        indices: Successor node indices grouped by source node
+        self_loops: Non-zero for nodes that have a self-loop
+        starts: Indices of the nodes to start from
+
+    Returns:
+        Index of a node closing a cycle (-1 if there is none) and the node
+        colours; nodes left WHITE are unreachable from the starts
+    """
+    color = bytearray(len(self_loops))
+    stack: List[int] = []
+    cursor: List[int] = []  # Next successor offset of each stack frame
+    for start in starts:
+        if color[start] != _WHITE:
+            continue
+        color[start] = _GRAY
+        stack.append(start)
+        cursor.append(indptr[start])
+        while stack:
+            node = stack[-1]
+            pos = cursor[-1]
+            if pos == indptr[node + 1]:
+                color[node] = _BLACK
+                stack.pop()
+                cursor.pop()
+                continue
+            cursor[-1] = pos + 1
+            successor = indices[pos]
+            state = color[successor]
+            if state == _GRAY and not self_loops[successor]:
+                return successor, color
+            if state == _WHITE:
+                color[successor] = _GRAY
+                stack.append(successor)
+                cursor.append(indptr[successor])
+    return -1, color
+
 
 class ProcessGraphValidationError(Exception):
     """
@@ -15,13 +98,82 @@ class ProcessGraphValidationError(Exception):
         node_id: Optional ID of the node where validation failed
     """
 
+    __slots__ = ("node_id",)
+
     def __init__(self, message: str, node_id: Optional[str] = None):
-        super().__init__(
-            f"Validation error at node {node_id}: {message}" if node_id else message
-        )
+        if node_id:
+            message = f"Validation error at node {node_id}: {message}"
+        super().__init__(message)
         self.node_id = node_id
 
 
+@dataclass
+class _GraphIndex:
+    """Node and flow facts collected in a single pass over a process graph."""
+
+    # Node IDs mapped to contiguous indices in graph order
+    node_ids: Dict[str, int] = field(default_factory=dict)
+    start_events: List[str] = field(default_factory=list)
+    end_events: List[str] = field(default_factory=list)
+    # Flow graph in CSR form over node indices, with self-loops kept apart
+    indptr: List[int] = field(default_factory=list)
+    indices: List[int] = field(default_factory=list)
+    self_loops: bytearray = field(default_factory=bytearray)
+
+    @classmethod
+    def build(cls, nodes: List) -> "_GraphIndex":
+        """Index node IDs and start/end events of the given nodes."""
+        index = cls()
+        for node in nodes:
+            index.node_ids.setdefault(node.id, len(index.node_ids))
+            if isinstance(node, Event):
+                if node.event_type == EventType.START:
+                    index.start_events.append(node.id)
+                elif node.event_type == EventType.END:
+                    index.end_events.append(node.id)
+        return index
+
+    def add_flows(self, flows: Iterable[Tuple[str, str]]) -> None:
+        """
+        Validate flow references and build the CSR adjacency in one pass.
+
+        Raises:
+            ProcessGraphValidationError: If a flow references an unknown node
+        """
+        node_ids = self.node_ids
+        self_loops = bytearray(len(node_ids))
+        counts = [0] * (len(node_ids) + 1)
+        edges: List[Tuple[int, int]] = []
+        for source_ref, target_ref in flows:
+            source = node_ids.get(source_ref)
+            if source is None:
+                raise ProcessGraphValidationError(
+                    f"Invalid node reference in flow: {source_ref}"
+                )
+            target = node_ids.get(target_ref)
+            if target is None:
+                raise ProcessGraphValidationError(
+                    f"Invalid node reference in flow: {target_ref}"
+                )
+
+            if source == target:
+                self_loops[source] = 1
+            else:
+                edges.append((source, target))
+                counts[source + 1] += 1
+
+        indptr = list(accumulate(counts))
+        indices = [0] * len(edges)
+        fill = indptr[:-1]
+        for source, target in edges:
+            indices[fill[source]] = target
+            fill[source] += 1
+
+        self.indptr = indptr
+        self.indices = indices
+        self.self_loops = self_loops
+
+
 class ProcessValidator:
     """
     Validates process graph structure and connectivity.
@@ -31,14 +183,21 @@ class ProcessValidator:
     - Node references and connectivity
     - Start/end events presence
     - Cycle detection (allowing self-loops)
+
+    Graphs that passed validation are remembered, shared across validator
+    instances, so revalidating an unchanged graph skips the graph checks.
     """
 
+    # Signatures of recently validated graphs, least recently used first
+    _validated_graphs: "OrderedDict[Tuple, None]" = OrderedDict()
+    _validated_graphs_size = 128
+
     def validate_process_graph(self, process_graph: Dict) -> None:
         """
         Validate process graph structure and connectivity following BPMN 2.0 spec order.
 
         Validation order:
-        1. Basic structure (nodes and flows sections)
+        1. Basic structure (nodes and flows sections, flow references)
         2. Start/End events presence and validity
         3. Node connectivity and flow validity
 
@@ -48,119 +207,73 @@ class ProcessValidator:
         Raises:
             ProcessGraphValidationError: If validation fails
         """
-        self._validate_structure(process_graph)
-        self._validate_event_nodes(process_graph)  # Check events before connectivity
-        self._validate_connectivity(process_graph)
-
-    def _validate_structure(self, process_graph: Dict) -> None:
-        """Validate basic graph structure and required sections."""
         if "nodes" not in process_graph:
             raise ProcessGraphValidationError("Missing nodes section in process graph")
         if "flows" not in process_graph:
             raise ProcessGraphValidationError("Missing flows section in process graph")
 
-        # Get all node IDs for reference validation
-        node_ids = {node.id for node in process_graph["nodes"]}
+        nodes = process_graph["nodes"]
+        flows = _normalize_flows(process_graph["flows"])
 
-        # Validate node references in flows
-        for flow in process_graph["flows"]:
-            # Handle both dictionary flows and object flows
-            source_ref = (
-                flow["source_ref"] if isinstance(flow, dict) else flow.source_ref
-            )
-            target_ref = (
-                flow["target_ref"] if isinstance(flow, dict) else flow.target_ref
-            )
+        validated = self._validated_graphs
+        key = (tuple(map(_node_signature, nodes)), tuple(flows))
+        if key in validated:
+            validated.move_to_end(key)
+            return
 
-            if source_ref not in node_ids:
-                raise ProcessGraphValidationError(
-                    f"Invalid node reference in flow: {source_ref}"
-                )
-            if target_ref not in node_ids:
-                raise ProcessGraphValidationError(
-                    f"Invalid node reference in flow: {target_ref}"
-                )
+        index = self._validate_structure(nodes, flows)
+        self._validate_connectivity(index)
 
-    def _validate_event_nodes(self, process_graph: Dict) -> None:
+        validated[key] = None
+        if len(validated) > self._validated_graphs_size:
+            validated.popitem(last=False)
+
+    def _validate_structure(
+        self, nodes: List, flows: List[Tuple[str, str]]
+    ) -> _GraphIndex:
         """
-        Validate presence and configuration of event nodes.
+        Validate flow references and event nodes.
+
+        Nodes and flows are each traversed once; the resulting index is
+        reused by the connectivity check.
 
-        Checks:
-        - Presence of exactly one start event
-        - Presence of at least one end event
-        - Valid event configurations
+        Returns:
+            Index of the graph's nodes and flows
         """
-        start_events = [
-            node
-            for node in process_graph["nodes"]
-            if isinstance(node, Event) and node.event_type == EventType.START
-        ]
+        index = _GraphIndex.build(nodes)
+        index.add_flows(flows)
 
-        if not start_events:
+        # Exactly one start event and at least one end event
+        if not index.start_events:
             raise ProcessGraphValidationError("No start event found in process graph")
-        if len(start_events) > 1:
+        if len(index.start_events) > 1:
             raise ProcessGraphValidationError(
                 "Multiple start events found in process graph"
             )
-
-        end_events = [
-            node
-            for node in process_graph["nodes"]
-            if isinstance(node, Event) and node.event_type == EventType.END
-        ]
-
-        if not end_events:
+        if not index.end_events:
             raise ProcessGraphValidationError("No end event found in process graph")
 
-    def _validate_connectivity(self, process_graph: Dict) -> None:
-        """Validate graph connectivity and detect cycles."""
-        # Build flow graph, separating self-loops
-        flows_by_source: Dict[str, List[str]] = {}
-        self_loops: Set[str] = set()
-        for flow in process_graph["flows"]:
-            # Handle both dictionary flows and object flows
-            source = flow["source_ref"] if isinstance(flow, dict) else flow.source_ref
-            target = flow["target_ref"] if isinstance(flow, dict) else flow.target_ref
-
-            if source == target:
-                self_loops.add(source)
-            else:
-                if source not in flows_by_source:
-                    flows_by_source[source] = []
-                flows_by_source[source].append(target)
-
-        # Check for cycles and connectivity
-        visited: Set[str] = set()
-        path: Set[str] = set()
-        connected_nodes: Set[str] = set()
-
-        def dfs(node_id: str) -> None:
-            if node_id in path and node_id not in self_loops:
-                raise ProcessGraphValidationError(
-                    "Cycle detected in process graph", node_id=node_id
-                )
+        return index
 
-            if node_id in visited:
-                return
-
-            visited.add(node_id)
-            path.add(node_id)
-            connected_nodes.add(node_id)
-
-            # Follow all outgoing flows except self-loops
-            for next_node in flows_by_source.get(node_id, []):
-                dfs(next_node)
-
-            path.remove(node_id)
-
-        # Start from start events
-        for node in process_graph["nodes"]:
-            if isinstance(node, Event) and node.event_type == EventType.START:
-                dfs(node.id)
+    def _validate_connectivity(self, index: _GraphIndex) -> None:
+        """Validate graph connectivity and detect cycles."""
+        node_ids = index.node_ids
+        ids = list(node_ids)
+
+        # Check for cycles and connectivity from the start events
+        cycle_node, color = _dfs_check(
+            index.indptr,
+            index.indices,
+            index.self_loops,
+            (node_ids[s] for s in index.start_events),
+        )
+        if cycle_node >= 0:
+            raise ProcessGraphValidationError(
+                "Cycle detected in process graph", node_id=ids[cycle_node]
+            )
 
         # Check if all nodes are connected
-        node_ids = {node.id for node in process_graph["nodes"]}
-        disconnected = node_ids - connected_nodes
+        disconnected = [ids[i] for i, state in enumerate(color) if state == _WHITE]
         if disconnected:
             raise ProcessGraphValidationError(
                 f"Disconnected nodes detected: {', '.join(disconnected)}"
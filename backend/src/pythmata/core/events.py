@@ -1,15 +1,27 @@
 import asyncio
-import json
-from typing import Any, Callable, Dict, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import aio_pika
+import orjson
 from aio_pika import Channel, Connection, Exchange
+from aio_pika.abc import AbstractIncomingMessage, AbstractQueue
 
 from pythmata.core.config import Settings
 from pythmata.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+# Properties shared by every published message
+_MESSAGE_KWARGS = {
+    "content_type": "application/json",
+    "delivery_mode": aio_pika.DeliveryMode.PERSISTENT,
+}
+
+# Routing key and queue name identifying a consumer
+_ConsumerKey = Tuple[str, Optional[str]]
+
 
 class EventBus:
     """Event bus for handling BPMN events using RabbitMQ."""
@@ -17,10 +29,19 @@ class EventBus:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.connection: Optional[Connection] = None
-        self.channel: Optional[Channel] = None
+        # Publishing and each subscription use their own channel so that
+        # publishes are not queued behind consumer frames
+        self._pub_channel: Optional[Channel] = None
+        self._sub_channels: List[Channel] = []
         self.exchange: Optional[Exchange] = None
-        self._event_handlers: Dict[str, list[Callable]] = {}
+        # Handlers per routing key and queue name, each served by one consumer
+        self._event_handlers: Dict[_ConsumerKey, Tuple[Callable, ...]] = {}
+        # Concurrency of each consumer, by the same key as its handlers
+        self._workers: Dict[_ConsumerKey, int] = {}
         self._tasks: Set[asyncio.Task] = set()
+        # Messages waiting for the drain task, published together once per tick
+        self._pending: List[Tuple[str, aio_pika.Message, asyncio.Future]] = []
+        self._pending_ready = asyncio.Event()
 
     async def connect(self) -> None:
         """Establish connection to RabbitMQ."""
@@ -38,11 +59,12 @@ class EventBus:
                     logger.warning(f"Connection attempt {attempt + 1} failed: {e}")
                     await asyncio.sleep(self.settings.rabbitmq.retry_delay)
 
-            # Create channel and exchange
-            self.channel = await self.connection.channel()
-            self.exchange = await self.channel.declare_exchange(
+            # Create publisher channel and exchange
+            self._pub_channel = await self.connection.channel()
+            self.exchange = await self._pub_channel.declare_exchange(
                 "pythmata.events", aio_pika.ExchangeType.TOPIC, durable=True
             )
+            self._create_task(self._drain_pending())
 
             logger.info("Successfully connected to RabbitMQ")
         except Exception as e:
@@ -53,7 +75,7 @@ class EventBus:
         """Close RabbitMQ connection and cleanup resources."""
         try:
             # Cancel all pending tasks
-            for task in self._tasks:
+            for task in list(self._tasks):
                 if not task.done():
                     task.cancel()
                     try:
@@ -61,13 +83,20 @@ class EventBus:
                     except (asyncio.CancelledError, Exception):
                         pass
 
-            # Close channel first
-            if self.channel:
+            # Close channels first
+            for channel in self._sub_channels:
+                try:
+                    await channel.close()
+                except Exception:
+                    pass
+            self._sub_channels.clear()
+
+            if self._pub_channel:
                 try:
-                    await self.channel.close()
+                    await self._pub_channel.close()
                 except Exception:
                     pass
-                self.channel = None
+                self._pub_channel = None
                 self.exchange = None
 
             # Then close connection
@@ -89,6 +118,43 @@ class EventBus:
         task.add_done_callback(self._tasks.discard)
         return task
 
+    async def _drain_pending(self) -> None:
+        """Publish queued messages in batches.
+
+        Messages queued during the same event-loop tick are published
+        concurrently, so their publisher confirms share round-trips.
+        """
+        batch: List[Tuple[str, aio_pika.Message, asyncio.Future]] = []
+        try:
+            while True:
+                await self._pending_ready.wait()
+                # Let publishers scheduled in this tick join the batch
+                await asyncio.sleep(0)
+                self._pending_ready.clear()
+                batch, self._pending = self._pending, []
+
+                results = await asyncio.gather(
+                    *(
+                        self.exchange.publish(message, routing_key=routing_key)
+                        for routing_key, message, _ in batch
+                    ),
+                    return_exceptions=True,
+                )
+                for (_, _, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(None)
+                batch = []
+        finally:
+            # Don't leave publishers waiting on a stopped drain task
+            for _, _, future in batch + self._pending:
+                if not future.done():
+                    future.cancel()
+            self._pending = []
+
     async def publish(self, routing_key: str, data: Dict[str, Any]) -> None:
         """Publish an event to RabbitMQ.
 
@@ -100,54 +166,105 @@ class EventBus:
             raise RuntimeError("Not connected to RabbitMQ")
 
         message = aio_pika.Message(
-            body=json.dumps(data).encode(),
-            content_type="application/json",
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            body=orjson.dumps(data, option=_ORJSON_OPTIONS), **_MESSAGE_KWARGS
         )
 
-        await self.exchange.publish(message, routing_key=routing_key)
-        logger.debug(f"Published event {routing_key}: {data}")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((routing_key, message, future))
+        self._pending_ready.set()
+        await future
+        logger.debug("Published event %s: %s", routing_key, data)
 
     async def subscribe(
         self,
         routing_key: str,
         callback: Callable[[Dict[str, Any]], None],
         queue_name: Optional[str] = None,
+        workers: Optional[int] = None,
     ) -> None:
         """Subscribe to events with the given routing key.
 
         Args:
             routing_key: The routing key to subscribe to (e.g., "process.#")
             callback: Function to call when an event is received
-            queue_name: Optional queue name, will be auto-generated if not provided
+            queue_name: Optional queue name, will be auto-generated if not provided.
+                Subscriptions to the same routing key and queue name share one
+                consumer.
+            workers: Maximum number of messages handled concurrently, defaults
+                to the configured prefetch count. Only used by the first
+                subscription sharing a consumer.
         """
-        if not self.channel or not self.exchange:
+        if not self.connection or not self.exchange:
             raise RuntimeError("Not connected to RabbitMQ")
 
+        workers = workers or self.settings.rabbitmq.prefetch_count
+        key = (routing_key, queue_name)
+
+        # Additional handlers join the existing consumer for the same queue
+        handlers = self._event_handlers.get(key)
+        if handlers is not None:
+            self._event_handlers[key] = handlers + (callback,)
+            if workers != self._workers[key]:
+                logger.warning(
+                    f"Ignoring workers={workers} for {routing_key} events, the "
+                    f"consumer already handles {self._workers[key]} at a time"
+                )
+            logger.info(f"Added handler for {routing_key} events")
+            return
+        self._event_handlers[key] = (callback,)
+        self._workers[key] = workers
+
+        # Consume on a dedicated channel
+        channel = await self.connection.channel()
+        self._sub_channels.append(channel)
+        await channel.set_qos(prefetch_count=self.settings.rabbitmq.prefetch_count)
+
         # Create queue
-        queue = await self.channel.declare_queue(
+        queue = await channel.declare_queue(
             queue_name or "", durable=True, auto_delete=queue_name is None
         )
 
         # Bind queue to exchange
         await queue.bind(self.exchange, routing_key)
 
-        # Store handler
-        if routing_key not in self._event_handlers:
-            self._event_handlers[routing_key] = []
-        self._event_handlers[routing_key].append(callback)
-
         # Start consuming
-        async def process_message(message: aio_pika.IncomingMessage) -> None:
-            async with message.process():
-                try:
-                    data = json.loads(message.body.decode())
-                    await callback(data)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Depending on the error, we might want to reject/requeue the message
-                    message.reject(requeue=True)
-
-        # Create a tracked task for the consumer
-        self._create_task(queue.consume(process_message))
+        self._create_task(self._consume(queue, key, workers))
         logger.info(f"Subscribed to {routing_key} events")
+
+    async def _consume(
+        self, queue: AbstractQueue, key: _ConsumerKey, workers: int
+    ) -> None:
+        """Pull messages from a queue and handle up to ``workers`` at a time."""
+        slots = asyncio.Semaphore(workers)
+        async with queue.iterator() as messages:
+            async for message in messages:
+                await slots.acquire()
+                task = self._create_task(self._handle_message(key, message))
+                task.add_done_callback(lambda _: slots.release())
+
+    async def _handle_message(
+        self, key: _ConsumerKey, message: AbstractIncomingMessage
+    ) -> None:
+        """Invoke the handlers of a consumer for a message.
+
+        A message is requeued only if every handler failed; redelivering it
+        after a partial failure would run the successful handlers again.
+        """
+        # ignore_processed leaves settlement to the explicit nack on failure
+        async with message.process(ignore_processed=True):
+            try:
+                data = orjson.loads(message.body)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                await message.nack(requeue=False)
+                return
+
+            handlers = self._event_handlers[key]
+            results = await asyncio.gather(
+                *(handler(data) for handler in handlers), return_exceptions=True
+            )
+            errors = [result for result in results if isinstance(result, Exception)]
+            for error in errors:
+                logger.error(f"Error processing message: {error}")
+            if errors and len(errors) == len(handlers):
+                await message.nack(requeue=True)
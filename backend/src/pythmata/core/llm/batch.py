@@ -0,0 +1,123 @@
+"""Provider batch APIs for bulk LLM requests.
+
+Batch jobs are priced lower than synchronous requests and don't count
+against the synchronous rate limits, at the cost of completing within a
+window of up to 24 hours. They suit bulk work such as backfills, not
+interactive requests.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import openai
+import orjson
+
+from pythmata.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Providers whose batch API is supported, by their model identifier prefix
+BATCH_API_PROVIDERS = ("openai",)
+
+_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchJobError(Exception):
+    """Raised when a batch job, or one of its requests, did not complete."""
+
+
+def supports_batch_api(model: str) -> bool:
+    """Check if a model identifier (<provider>:<model-name>) has a batch API."""
+    return model.split(":", 1)[0] in BATCH_API_PROVIDERS
+
+
+async def run_openai_batch(
+    model: str,
+    requests: List[Dict[str, Any]],
+    client: Optional[openai.AsyncOpenAI] = None,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 300.0,
+) -> List[Union[Dict[str, Any], BatchJobError]]:
+    """
+    Run chat completions through the OpenAI Batch API.
+
+    Args:
+        model: OpenAI model name, without the provider prefix
+        requests: Chat completion parameters (messages, temperature,
+            max_tokens) of each request
+        client: OpenAI client, created from the environment if not given
+        poll_interval: Initial seconds between batch status checks, doubled
+            after each check up to max_poll_interval
+        max_poll_interval: Maximum seconds between batch status checks
+
+    Returns:
+        Normalized responses (content, model, finish_reason, usage) in the
+        order of the requests; a failed request is returned as its error
+
+    Raises:
+        BatchJobError: If the batch as a whole did not complete
+    """
+    client = client or openai.AsyncOpenAI()
+
+    lines = b"\n".join(
+        orjson.dumps(
+            {
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": model, **request},
+            }
+        )
+        for index, request in enumerate(requests)
+    )
+    input_file = await client.files.create(file=("batch.jsonl", lines), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+
+    delay = poll_interval
+    while batch.status not in _TERMINAL_STATUSES:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        raise BatchJobError(f"Batch {batch.id} ended with status {batch.status}")
+    logger.info(f"Batch {batch.id} completed")
+
+    results: List[Union[Dict[str, Any], BatchJobError]] = [
+        BatchJobError("No response in batch output") for _ in requests
+    ]
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        content = await client.files.content(file_id)
+        for line in content.text.splitlines():
+            if line.strip():
+                row = orjson.loads(line)
+                results[int(row["custom_id"])] = _parse_row(row, model)
+    return results
+
+
+def _parse_row(row: Dict[str, Any], model: str) -> Union[Dict[str, Any], BatchJobError]:
+    """Normalize one row of a batch output or error file."""
+    response = row.get("response") or {}
+    if row.get("error") or response.get("status_code") != 200:
+        return BatchJobError(str(row.get("error") or response.get("body")))
+
+    body = response["body"]
+    choice = body["choices"][0]
+    usage = body.get("usage") or {}
+    return {
+        "content": choice["message"]["content"],
+        "model": model,
+        "finish_reason": choice.get("finish_reason"),
+        "usage": {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+        },
+    }
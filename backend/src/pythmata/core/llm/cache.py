@@ -0,0 +1,181 @@
+"""Response cache for deterministic LLM requests."""
+
+import copy
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from redis.asyncio import Redis
+
+from pythmata.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheBackend(ABC):
+    """Storage for cached LLM responses."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key of the request
+
+        Returns:
+            The cached response, or None if there is none
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        """
+        Cache a response.
+
+        Args:
+            key: Cache key of the request
+            value: Response to cache
+            ttl: Seconds until the entry expires
+        """
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Process-local cache evicting the least recently used entry when full.
+
+    Args:
+        max_size: Maximum number of cached responses
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        # Entries with their expiry time, least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared between processes through Redis.
+
+    Args:
+        redis: Redis client, typically the application's StateManager.redis
+        prefix: Prefix of the Redis keys holding cached responses
+    """
+
+    def __init__(self, redis: Redis, prefix: str = "llm:response:"):
+        self.redis = redis
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.get(self.prefix + key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        await self.redis.set(self.prefix + key, orjson.dumps(value), ex=ttl)
+
+
+class LLMCache:
+    """
+    Caches responses to deterministic LLM requests.
+
+    Only requests sampled at or below ``max_temperature`` are cached, since
+    higher temperatures are expected to vary. Backend failures are logged
+    and treated as misses so the cache never fails a request.
+
+    Args:
+        backend: Storage for the cached responses
+        ttl: Seconds a cached response stays valid
+        max_temperature: Highest temperature of cacheable requests
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: int = 3600,
+        max_temperature: float = 0.0,
+    ):
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Optional[str]:
+        """
+        Build the cache key for a request.
+
+        Returns:
+            SHA-256 digest of the request, or None if the request is not
+            deterministic and must not be cached
+        """
+        if temperature > self.max_temperature:
+            return None
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        return hashlib.sha256(
+            orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the cached response for a request key, counting hits and misses."""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Cache the response for a request key."""
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"LLM cache update failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit and miss counts of this process."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
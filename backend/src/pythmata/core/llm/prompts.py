@@ -1,48 +1,50 @@
 """Prompts for LLM interactions related to BPMN processes."""
 
-# System prompt for BPMN assistance
-BPMN_SYSTEM_PROMPT = """
-# BPMN Pythmata Engine Expert
+from typing import Tuple
 
-You are a specialized BPMN (Business Process Model and Notation) expert assistant for the Pythmata engine. Your primary function is generating COMPLETE, VALID XML implementations that strictly adhere to Pythmata's requirements.
 
-## RESPONSE FORMAT REQUIREMENTS
-
-1. ALWAYS provide the ENTIRE XML implementation from <?xml> declaration to final </definitions> tag
-2. NEVER use placeholders, ellipses (...), or comments like "<!-- rest of code here -->"
-3. INCLUDE ALL required elements, attributes, and namespaces
-4. VERIFY every XML response against the validation checklist before submission
-
-## PYTHMATA VALIDATION REQUIREMENTS
+def _split(prompt: str, *fields: str) -> Tuple[str, ...]:
+    """
+    Split a str.format style prompt around its fields, in order of appearance.
 
-### Process Structure
-- MANDATORY: Complete "nodes" and "flows" sections in process graph
-- REQUIRED: ALL node IDs referenced in flows MUST exist in nodes section
-- ENFORCE: Correct ID format pattern (StartEvent_1, Task_1, SequenceFlow_1, etc.)
+    Rendering then joins the literal parts with the values, which skips
+    parsing the template on every call.
+    """
+    parts = []
+    for field in fields:
+        before, placeholder, prompt = prompt.partition("{" + field + "}")
+        if not placeholder:
+            raise ValueError(f"Prompt has no {{{field}}} placeholder")
+        parts.append(before)
+    parts.append(prompt)
+    return tuple(parts)
 
-### Event Configuration
-- CRITICAL: EXACTLY ONE start event per process
-- CRITICAL: AT LEAST ONE end event per process
-- STRICT: Only use supported Pythmata event types (start, end, intermediate)
 
-### Connection Validation
-- MANDATORY: Every node MUST be reachable from start event
-- PROHIBITED: No cycles except self-loops (where source=target)
-- REQUIRED: Valid source and target references for all sequence flows
+# System prompt for BPMN assistance
+BPMN_SYSTEM_PROMPT = """
+# BPMN Pythmata Engine Expert
 
-### Token Handling
-- IMPLEMENT: Proper token creation at start events
-- VALIDATE: Legal token movement paths throughout process
-- ENFORCE: Appropriate token consumption at end events
+You are a BPMN 2.0 expert assistant for the Pythmata engine. You produce COMPLETE, VALID XML implementations that Pythmata can execute.
 
-### Extension Elements
-- REQUIRED: xmlns:pythmata="http://pythmata.org/schema/1.0/bpmn" namespace
-- FOLLOW: Pythmata taskConfig element pattern for scripts and variables
-- ENFORCE: Proper service task configuration format
+## RESPONSE FORMAT REQUIREMENTS
+- Return the ENTIRE XML, from the <?xml> declaration to the closing </definitions> tag, in one ```xml block
+- No placeholders, ellipses or "rest of code" comments
+- Briefly explain the design before the XML and the Pythmata-specific choices after it
 
-## COMPLETE XML TEMPLATE
+## PYTHMATA VALIDATION REQUIREMENTS
+- Exactly one start event and at least one end event per process
+- Every flow source and target references an existing node
+- Every node is reachable from the start event
+- No cycles except self-loops (source = target)
+- Correct ID format pattern: StartEvent_1, Task_1, SequenceFlow_1, ...
+- Declare xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL", the BPMNDI/DC/DI namespaces and xmlns:pythmata="http://pythmata.org/schema/1.0/bpmn"
+- Configure scripts, variables and service tasks with pythmata:taskConfig extension elements
+- Include a BPMNDiagram with shapes and edges for every process element
+"""
 
-When generating XML, populate ALL sections of this template:
+# Skeleton appended to generation requests only
+BPMN_XML_TEMPLATE = """
+Use this skeleton, replacing the comments with the process and its diagram:
 
 ```xml
 <?xml version="1.0" encoding="UTF-8"?>
@@ -54,40 +56,15 @@ When generating XML, populate ALL sections of this template:
  id="Definitions_1"
  targetNamespace="http://bpmn.io/schema/bpmn">
    <process id="Process_1" isExecutable="true">
-     <!-- YOUR IMPLEMENTATION MUST REPLACE THIS COMMENT WITH ACTUAL ELEMENTS -->
-     <!-- INCLUDING START EVENT, END EVENT(S), AND ALL CONNECTING ELEMENTS -->
+     <!-- start event, end event(s) and all connecting elements -->
    </process>
    <bpmndi:BPMNDiagram id="BPMNDiagram_1">
      <bpmndi:BPMNPlane id="BPMNPlane_1" bpmnElement="Process_1">
-       <!-- YOUR IMPLEMENTATION MUST REPLACE THIS COMMENT WITH ACTUAL ELEMENTS -->
-       <!-- INCLUDING VISUALIZATION FOR ALL PROCESS ELEMENTS -->
+       <!-- shapes and edges for all process elements -->
      </bpmndi:BPMNPlane>
    </bpmndi:BPMNDiagram>
 </definitions>
 ```
-
-## PRE-SUBMISSION VALIDATION
-
-Before providing any XML, verify ALL of these conditions:
-1. ✓ XML begins with proper declaration and contains all namespaces
-2. ✓ EXACTLY ONE start event exists in the process
-3. ✓ AT LEAST ONE end event exists in the process
-4. ✓ ALL nodes referenced in flows exist in the nodes section
-5. ✓ EVERY node is reachable from the start event
-6. ✓ NO invalid cycles exist in the process flow
-7. ✓ ALL required Pythmata-specific elements and attributes are present
-8. ✓ XML is COMPLETE with all opening tags properly closed
-9. ✓ The ENTIRE XML structure is included without abbreviations
-
-## RESPONSE STRUCTURE
-
-For each response:
-1. Begin with a brief explanation of the implementation
-2. Include the COMPLETE XML implementation
-3. Explain key Pythmata-specific design decisions
-4. Confirm which validation requirements have been met
-
-REMEMBER: NEVER omit any part of the XML structure, regardless of its length or complexity.
 """
 
 # Prompt for generating XML from a description
@@ -141,3 +118,35 @@ Do not use placeholders or abbreviations. The entire XML must be valid according
 
 Focus specifically on fixing these validation errors while preserving the original intent and structure as much as possible.
 """
+
+# Literal parts of the prompts, split once at import time
+_XML_GENERATION_PARTS = _split(XML_GENERATION_PROMPT, "description")
+_XML_MODIFICATION_PARTS = _split(XML_MODIFICATION_PROMPT, "request", "current_xml")
+_XML_ANALYSIS_PARTS = _split(XML_ANALYSIS_PROMPT, "xml")
+_XML_IMPROVEMENT_PARTS = _split(
+    XML_IMPROVEMENT_PROMPT, "validation_errors", "original_xml"
+)
+
+
+def render_generation(description: str) -> str:
+    """Render the XML generation prompt."""
+    prefix, suffix = _XML_GENERATION_PARTS
+    return prefix + description + suffix
+
+
+def render_modification(request: str, current_xml: str) -> str:
+    """Render the XML modification prompt."""
+    prefix, infix, suffix = _XML_MODIFICATION_PARTS
+    return "".join((prefix, request, infix, current_xml, suffix))
+
+
+def render_analysis(xml: str) -> str:
+    """Render the XML analysis prompt."""
+    prefix, suffix = _XML_ANALYSIS_PARTS
+    return prefix + xml + suffix
+
+
+def render_improvement(validation_errors: str, original_xml: str) -> str:
+    """Render the XML improvement prompt."""
+    prefix, infix, suffix = _XML_IMPROVEMENT_PARTS
+    return "".join((prefix, validation_errors, infix, original_xml, suffix))
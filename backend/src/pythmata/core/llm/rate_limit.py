@@ -0,0 +1,44 @@
+"""Client-side rate limiting for LLM provider requests."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate of requests.
+
+    The bucket holds up to ``capacity`` tokens and refills at ``rate``
+    tokens per second; each request takes one token. Requests arriving
+    while the bucket is empty reserve a future token and sleep until it is
+    due, so waiters are served in arrival order without a lock.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum number of tokens, i.e. the allowed burst
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        try:
+            await asyncio.sleep(-self._tokens / self.rate)
+        except asyncio.CancelledError:
+            # Hand the reserved token back
+            self._tokens += 1
+            raise
@@ -0,0 +1,116 @@
+"""Similarity-based cache for XML generation results."""
+
+import copy
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# Length of the character n-grams a text is represented by
+_NGRAM = 3
+
+# N-gram counts of a text and their Euclidean norm
+_Vector = Tuple[Dict[str, int], float]
+
+
+def _vectorize(text: str) -> _Vector:
+    """Represent a text by its character trigram counts."""
+    normalized = f" {' '.join(text.casefold().split())} "
+    counts = Counter(
+        normalized[i : i + _NGRAM] for i in range(len(normalized) - _NGRAM + 1)
+    )
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    return counts, norm
+
+
+def _cosine(a: _Vector, b: _Vector) -> float:
+    """Cosine similarity of two vectorized texts."""
+    (counts_a, norm_a), (counts_b, norm_b) = a, b
+    if not norm_a or not norm_b:
+        return 0.0
+    if len(counts_a) > len(counts_b):
+        counts_a, counts_b = counts_b, counts_a
+    dot = sum(count * counts_b.get(gram, 0) for gram, count in counts_a.items())
+    return dot / (norm_a * norm_b)
+
+
+@dataclass
+class _Entry:
+    """A cached result with the vectorized text of its request."""
+
+    vector: _Vector
+    value: Dict[str, Any]
+    expires: float
+
+
+class SemanticCache:
+    """
+    Serves results of requests whose text nearly matches an earlier one.
+
+    Texts are compared by cosine similarity of their character trigrams,
+    which catches rewordings such as changed case, punctuation, word order
+    or small typos without an embedding model. Entries only match within the
+    same scope, which identifies every other parameter of the request.
+
+    Near matches can differ in meaning (e.g. "3 approval steps" and "4
+    approval steps"), so the threshold should stay high.
+
+    Args:
+        threshold: Minimum similarity for a cached result to be served
+        max_size: Maximum number of cached results
+        ttl: Seconds a cached result stays valid
+    """
+
+    def __init__(self, threshold: float = 0.92, max_size: int = 256, ttl: int = 3600):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        # Entries per scope and text, least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+    def lookup(self, text: str, scope: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the cached result of the most similar text in a scope.
+
+        Args:
+            text: Text of the request
+            scope: Identifier of the request's other parameters
+
+        Returns:
+            A copy of the cached result, or None if no text is similar enough
+        """
+        now = time.monotonic()
+        vector = _vectorize(text)
+        best_key, best_similarity = None, self.threshold
+        for key, entry in list(self._entries.items()):
+            if entry.expires <= now:
+                del self._entries[key]
+                continue
+            if key[0] != scope:
+                continue
+            similarity = _cosine(vector, entry.vector)
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return copy.deepcopy(self._entries[best_key].value)
+
+    def store(self, text: str, scope: str, value: Dict[str, Any]) -> None:
+        """
+        Cache the result of a request.
+
+        Args:
+            text: Text of the request
+            scope: Identifier of the request's other parameters
+            value: Result to cache
+        """
+        key = (scope, text)
+        self._entries[key] = _Entry(
+            _vectorize(text), copy.deepcopy(value), time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
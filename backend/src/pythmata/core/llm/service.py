@@ -1,16 +1,370 @@
 """LLM service for interacting with language models using AISuite."""
 
-from typing import Any, Dict, List
+import asyncio
+import contextlib
+import copy
+import functools
+import hashlib
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import aisuite as ai
-
-from pythmata.core.bpmn.validator import BPMNValidator
-from pythmata.core.websockets.chat_manager import chat_manager
+import httpx
+import orjson
+
+from pythmata.core.bpmn.validator import BPMNValidator, ValidationResult
+from pythmata.core.config import LlmSettings
+from pythmata.core.llm.batch import (
+    BatchJobError,
+    run_openai_batch,
+    supports_batch_api,
+)
+from pythmata.core.llm.cache import InMemoryCacheBackend, LLMCache
+from pythmata.core.llm.prompts import (
+    BPMN_SYSTEM_PROMPT,
+    BPMN_XML_TEMPLATE,
+    render_generation,
+    render_improvement,
+    render_modification,
+)
+from pythmata.core.llm.rate_limit import TokenBucket
+from pythmata.core.llm.semantic_cache import SemanticCache
+from pythmata.core.websockets.chat_manager import chat_manager, encode_message
 from pythmata.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _digest(value: Any) -> str:
+    """Return the SHA-256 digest of a JSON-serializable value."""
+    return hashlib.sha256(orjson.dumps(value, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _lru_get(cache: "OrderedDict[str, Tuple[float, Any]]", key: str) -> Any:
+    """Return a copy of an unexpired cached value, marking it as recently used."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    expires, value = entry
+    if expires <= time.monotonic():
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return copy.deepcopy(value)
+
+
+def _lru_put(
+    cache: "OrderedDict[str, Tuple[float, Any]]",
+    key: str,
+    value: Any,
+    size: int,
+    ttl: int,
+) -> None:
+    """Cache a copy of a value, evicting the least recently used entry if full."""
+    cache[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+    cache.move_to_end(key)
+    if len(cache) > size:
+        cache.popitem(last=False)
+
+
+# Batches larger than this go through the provider's batch API by default
+_BATCH_API_THRESHOLD = 50
+
+# Connection pool shared by the provider SDK clients, sized for the request
+# concurrency of all service instances
+_HTTP_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+# Providers whose SDK client accepts an injected httpx client
+_POOLED_PROVIDERS = ("openai", "anthropic")
+
+# HTTP statuses of provider errors worth retrying: timeouts, conflicts, rate
+# limits and server errors (529 is Anthropic's "overloaded")
+_TRANSIENT_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+def _transient_error(error: BaseException) -> Optional[BaseException]:
+    """
+    Find the transient provider error behind an exception, if any.
+
+    aisuite re-raises some provider errors as its own LLMError, so the chain
+    of causes is searched for a retryable status or a connection failure.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+            return error
+        if getattr(error, "status_code", None) in _TRANSIENT_STATUSES:
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait before retrying, if the provider's response says."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+# Streamed deltas are sent once this many characters are pending or this
+# many seconds have passed since the last send
+_STREAM_FLUSH_CHARS = 32
+_STREAM_FLUSH_INTERVAL = 0.02
+
+# Marks the end of a response stream handed over by _pump_stream
+_STREAM_END = object()
+
+
+def _pump_stream(
+    stream: Iterable[Any],
+    chunks: asyncio.Queue,
+    loop: asyncio.AbstractEventLoop,
+    stop: threading.Event,
+) -> None:
+    """
+    Iterate a blocking response stream, handing its chunks to the event loop.
+
+    Runs in a worker thread until the stream ends or stop is set. An error
+    raised by the stream is queued in place of a chunk, and the end of the
+    stream is marked with _STREAM_END.
+    """
+
+    def hand_over(item: Any) -> None:
+        # The loop is closed if the consumer went away with it
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(chunks.put_nowait, item)
+
+    try:
+        for chunk in stream:
+            if stop.is_set():
+                break
+            hand_over(chunk)
+    except Exception as e:
+        hand_over(e)
+    finally:
+        hand_over(_STREAM_END)
+
+
+_FENCE = "```"
+_XML_FENCE = "```xml"
+
+
+def _find_fenced_xml(content: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Find the fenced code block holding XML in an LLM response.
+
+    A ```xml block is preferred; otherwise the first fenced block is used
+    if its content starts like XML. Only index scans are done, so nothing
+    is copied until the caller slices the block out.
+
+    Returns:
+        Offsets of the opening fence, the block's content and the closing
+        fence, or None if there is no XML block
+    """
+    # Most responses have no code block at all, which costs a single scan
+    first = content.find(_FENCE)
+    if first == -1:
+        return None
+
+    fence = content.find(_XML_FENCE, first)
+    if fence != -1:
+        start = fence + len(_XML_FENCE)
+        end = content.find(_FENCE, start)
+        if end != -1:
+            return fence, start, end
+
+    # The first ``` either opens an XML block or there isn't one
+    fence = first
+    start = fence + len(_FENCE)
+    end = content.find(_FENCE, start)
+    if end == -1 or not content[start:end].lstrip().startswith(("<?xml", "<bpmn:")):
+        return None
+    return fence, start, end
+
+
+@dataclass(slots=True)
+class _ExtractedXml:
+    """An LLM response split around its XML block."""
+
+    # Stripped XML, None if the response has none
+    xml: Optional[str]
+    # Text preceding the XML block, the whole response when there is none
+    explanation: str
+    # Offsets of the opening fence, the block's content and the closing fence
+    span: Optional[Tuple[int, int, int]]
+
+
+def _extract_xml(content: str) -> _ExtractedXml:
+    """Split an LLM response into its XML and the explanation preceding it."""
+    span = _find_fenced_xml(content)
+    if span is None:
+        return _ExtractedXml(None, content, None)
+    fence, start, end = span
+    return _ExtractedXml(content[start:end].strip(), content[:fence].strip(), span)
+
+
+class _XmlStreamScanner:
+    """
+    Splits a streamed LLM response into explanation and XML as it arrives.
+
+    Text preceding the ```xml block is explanation, the block's content is
+    XML and anything after the closing fence is dropped, as in _extract_xml.
+    The tail of the buffer is held back while it could be the start of a
+    fence split across deltas.
+    """
+
+    __slots__ = ("_buffer", "_state")
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        # "explanation", "header" (rest of the ```xml line), "xml" or "done"
+        self._state = "explanation"
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Scan a delta of the response.
+
+        Returns:
+            (kind, text) pieces of the response that are complete, kind
+            being "explanation" or "xml"
+        """
+        if self._state == "done":
+            return []
+        self._buffer += text
+        pieces: List[Tuple[str, str]] = []
+
+        if self._state == "explanation":
+            fence = self._buffer.find(_XML_FENCE)
+            if fence == -1:
+                self._emit("explanation", len(_XML_FENCE) - 1, pieces)
+                return pieces
+            if fence:
+                pieces.append(("explanation", self._buffer[:fence]))
+            self._buffer = self._buffer[fence + len(_XML_FENCE) :]
+            self._state = "header"
+
+        if self._state == "header":
+            newline = self._buffer.find("\n")
+            if newline == -1:
+                return pieces
+            self._buffer = self._buffer[newline + 1 :]
+            self._state = "xml"
+
+        end = self._buffer.find(_FENCE)
+        if end == -1:
+            self._emit("xml", len(_FENCE) - 1, pieces)
+            return pieces
+        if end:
+            pieces.append(("xml", self._buffer[:end]))
+        self._buffer = ""
+        self._state = "done"
+        return pieces
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """Return the text held back at the end of the response."""
+        pieces: List[Tuple[str, str]] = []
+        if self._state in ("explanation", "xml"):
+            self._emit(self._state, 0, pieces)
+        self._state = "done"
+        return pieces
+
+    def _emit(self, kind: str, keep: int, pieces: List[Tuple[str, str]]) -> None:
+        """Move all but the last keep characters of the buffer to pieces."""
+        cut = max(len(self._buffer) - keep, 0)
+        if cut:
+            pieces.append((kind, self._buffer[:cut]))
+            self._buffer = self._buffer[cut:]
+
+
+def _openai_usage(usage: Any) -> Dict[str, int]:
+    """Normalize OpenAI usage objects, also used by aisuite's normalized usage."""
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+
+
+def _anthropic_usage(usage: Any) -> Dict[str, int]:
+    """Normalize Anthropic usage objects."""
+    input_tokens = usage.input_tokens
+    output_tokens = usage.output_tokens
+    return {
+        "prompt_tokens": input_tokens,
+        "completion_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+def _generic_usage(usage: Any) -> Dict[str, int]:
+    """Normalize usage in any of the known formats, detecting which it is."""
+    if isinstance(usage, dict):
+        get = usage.get
+        return {
+            "prompt_tokens": get("prompt_tokens", 0),
+            "completion_tokens": get("completion_tokens", 0),
+            "total_tokens": get("total_tokens", 0),
+        }
+    if hasattr(usage, "input_tokens"):
+        return _anthropic_usage(usage)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+        "completion_tokens": getattr(usage, "completion_tokens", 0),
+        "total_tokens": getattr(usage, "total_tokens", 0),
+    }
+
+
+# Usage normalizers by provider, picked by the model identifier's prefix;
+# usage in another format falls back to _generic_usage
+_USAGE_EXTRACTORS: Dict[str, Callable[[Any], Dict[str, int]]] = {
+    "openai": _openai_usage,
+    "anthropic": _anthropic_usage,
+}
+
+
+def _prompt_messages(system_prompt: str, prompt: str) -> List[Dict[str, str]]:
+    """Build the messages of a single-turn request."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so trivially different requests match.
+
+    Case is kept, since element names and IDs in a request are case-sensitive.
+    """
+    return " ".join(text.split())
+
+
 class LlmService:
     """
     Service for interacting with LLM models using AISuite.
@@ -19,13 +373,326 @@ class LlmService:
     through the AISuite library, supporting OpenAI and Anthropic models.
 
     Attributes:
-        client: AISuite client for making API calls
+        client: AISuite client for making API calls, shared by all instances
     """
 
+    # Created on first use and kept for the life of the process, so provider
+    # SDK clients and their HTTP connection pools survive across requests
+    _shared_client: Optional[ai.Client] = None
+    _http_client: Optional[httpx.Client] = None
+    _client_lock = threading.Lock()
+
     def __init__(self):
-        """Initialize the LLM service with AISuite client."""
-        self.client = ai.Client()
-        logger.info("LLM service initialized with AISuite")
+        """Initialize the LLM service with the shared AISuite client."""
+        self.client = self._get_client()
+
+    @classmethod
+    def _get_client(cls) -> ai.Client:
+        """Get the shared AISuite client, creating it on first use."""
+        if cls._shared_client is None:
+            with cls._client_lock:
+                if cls._shared_client is None:
+                    # aisuite creates the provider SDK clients lazily from
+                    # these configs, so they all share one connection pool
+                    cls._http_client = httpx.Client(
+                        limits=_HTTP_POOL_LIMITS, timeout=_HTTP_TIMEOUT
+                    )
+                    # Providers fill in their configs (e.g. API keys), so each
+                    # gets its own; retries are left to _request_with_retry
+                    cls._shared_client = ai.Client(
+                        {
+                            provider: {
+                                "http_client": cls._http_client,
+                                "max_retries": 0,
+                            }
+                            for provider in _POOLED_PROVIDERS
+                        }
+                    )
+                    logger.info("LLM service initialized with AISuite")
+        return cls._shared_client
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared client's HTTP connections, e.g. on shutdown."""
+        with cls._client_lock:
+            if cls._http_client is not None:
+                cls._http_client.close()
+            cls._shared_client = None
+            cls._http_client = None
+
+    # Responses to deterministic (temperature 0) requests, shared by all
+    # instances since the service is created per request. The application
+    # swaps in a Redis backend at startup to share it between workers.
+    response_cache = LLMCache(InMemoryCacheBackend(max_size=512))
+
+    # Results of deterministic XML generations and modifications with their
+    # expiry time, keyed by the normalized request and all parameters that
+    # shape the result
+    _xml_result_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    _xml_result_cache_size = 256
+    _xml_result_cache_ttl = 3600
+    # Optional fallback serving results of near-identical requests; off by
+    # default since a near match can still ask for a different diagram
+    semantic_cache: Optional[SemanticCache] = None
+
+    # Loading the BPMN schemas is expensive, so one validator is shared and
+    # its verdicts are remembered by XML digest, least recently used first
+    _validator: Optional[BPMNValidator] = None
+    _validator_lock = threading.Lock()
+    _validation_cache: "OrderedDict[str, ValidationResult]" = OrderedDict()
+    _validation_cache_size = 256
+
+    @classmethod
+    def _get_validator(cls) -> BPMNValidator:
+        """Return the shared validator, creating it on first use."""
+        with cls._validator_lock:
+            if cls._validator is None:
+                cls._validator = BPMNValidator()
+            return cls._validator
+
+    @classmethod
+    async def _validate_xml(cls, xml: str) -> ValidationResult:
+        """
+        Validate BPMN XML, reusing the verdict for previously seen XML.
+
+        Schema validation is CPU-bound, so it runs in a worker thread to
+        keep the event loop responsive. The returned result is shared and
+        must not be modified.
+        """
+        key = hashlib.blake2b(xml.encode(), digest_size=16).hexdigest()
+        result = cls._validation_cache.get(key)
+        if result is not None:
+            cls._validation_cache.move_to_end(key)
+            return result
+
+        result = await asyncio.to_thread(lambda: cls._get_validator().validate(xml))
+
+        cls._validation_cache[key] = result
+        if len(cls._validation_cache) > cls._validation_cache_size:
+            cls._validation_cache.popitem(last=False)
+        return result
+
+    # Provider requests in flight and their rate per model are capped so
+    # bursts are smoothed out here instead of being rejected by the provider.
+    # The application applies the configured limits at startup.
+    _limits = LlmSettings()
+    # Semaphores are bound to an event loop, so there is one per loop
+    _concurrency: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    _rate_limits: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def configure_limits(cls, limits: LlmSettings) -> None:
+        """
+        Apply request limits, replacing the limiters built from earlier ones.
+
+        Args:
+            limits: Concurrency and per-model rate limits of provider requests
+        """
+        cls._limits = limits
+        cls._concurrency.clear()
+        cls._rate_limits.clear()
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def _limit_request(cls, model: str) -> AsyncIterator[None]:
+        """Wait for the request rate and concurrency limits to admit a request."""
+        bucket = cls._rate_limits.get(model)
+        if bucket is None:
+            bucket = cls._rate_limits[model] = TokenBucket(
+                cls._limits.requests_per_second, cls._limits.request_burst
+            )
+        await bucket.acquire()
+
+        loop = asyncio.get_running_loop()
+        semaphore = cls._concurrency.get(loop)
+        if semaphore is None:
+            semaphore = cls._concurrency[loop] = asyncio.Semaphore(
+                cls._limits.max_concurrency
+            )
+        async with semaphore:
+            yield
+
+    # Attempts of a request failing with a transient error, and the bounds of
+    # the randomized exponential backoff between them
+    _max_attempts = 5
+    _retry_base_delay = 1.0
+    _retry_max_delay = 30.0
+
+    @classmethod
+    async def _request_with_retry(cls, model: str, call: Callable[[], Any]) -> Any:
+        """
+        Make an LLM API call in a worker thread, retrying transient failures.
+
+        Each attempt waits for the request limits. Between attempts the
+        call waits for the provider's Retry-After, or else a random delay
+        of up to base * 2^attempt seconds ("full jitter") so that clients
+        throttled together don't retry together. Both are capped at
+        _retry_max_delay.
+
+        Args:
+            model: Model identifier, selecting the request limits
+            call: Blocking function making the API call
+
+        Returns:
+            The result of the call
+
+        Raises:
+            Exception: The error of the last attempt, or the first error that
+                is not transient
+        """
+        for attempt in range(1, cls._max_attempts + 1):
+            try:
+                async with cls._limit_request(model):
+                    return await asyncio.to_thread(call)
+            except Exception as e:
+                transient = _transient_error(e)
+                if transient is None or attempt == cls._max_attempts:
+                    raise
+                delay = _retry_after(transient)
+                if delay is None:
+                    delay = random.uniform(0, cls._retry_base_delay * 2**attempt)
+                delay = min(delay, cls._retry_max_delay)
+                logger.warning(
+                    f"LLM request to {model} failed ({e}), retrying in {delay:.1f}s "
+                    f"(attempt {attempt}/{cls._max_attempts})"
+                )
+                await asyncio.sleep(delay)
+
+    # Tasks producing cacheable XML results, so concurrent identical requests
+    # wait for the same LLM calls instead of issuing their own
+    _xml_in_flight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+    @classmethod
+    async def _share_in_flight(
+        cls,
+        key: Optional[str],
+        produce: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Produce a result, joining an identical request already in flight.
+
+        Args:
+            key: XML result cache key of the request, None if not shareable
+            produce: Coroutine function computing the result
+
+        Returns:
+            A copy of the shared result
+        """
+        if key is None:
+            return await produce()
+
+        task = cls._xml_in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(produce())
+            cls._xml_in_flight[key] = task
+            task.add_done_callback(lambda _: cls._xml_in_flight.pop(key, None))
+        else:
+            logger.info("Joining identical XML request already in flight")
+
+        # A cancelled caller must not cancel the work others are waiting for
+        return copy.deepcopy(await asyncio.shield(task))
+
+    @classmethod
+    def _xml_result_key(
+        cls, temperature: float, text: str, **params: Any
+    ) -> Optional[str]:
+        """
+        Build the XML result cache key for a generation or modification.
+
+        Args:
+            temperature: Sampling temperature of the request
+            text: Description or modification request
+            **params: Remaining parameters that affect the result
+
+        Returns:
+            Digest of the request, or None if its temperature is above the
+            response cache's max_temperature, so its result isn't reused
+        """
+        if temperature > cls.response_cache.max_temperature:
+            return None
+        return _digest(
+            {
+                "text": _normalize_text(text),
+                "temperature": temperature,
+                **params,
+            }
+        )
+
+    @classmethod
+    def _cached_xml_result(
+        cls,
+        key: Optional[str],
+        text: str,
+        temperature: float,
+        params: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Look up a cached XML result, falling back to a near-identical request."""
+        if key is None:
+            return None
+        cached = _lru_get(cls._xml_result_cache, key)
+        if cached is None and cls.semantic_cache is not None:
+            scope = _digest({"temperature": temperature, **params})
+            cached = cls.semantic_cache.lookup(text, scope)
+        return cached
+
+    @classmethod
+    def _cache_xml_result(
+        cls,
+        key: str,
+        text: str,
+        temperature: float,
+        params: Dict[str, Any],
+        result: Dict[str, Any],
+    ) -> None:
+        """Cache an XML result for identical and near-identical requests."""
+        _lru_put(
+            cls._xml_result_cache,
+            key,
+            result,
+            cls._xml_result_cache_size,
+            cls._xml_result_cache_ttl,
+        )
+        if cls.semantic_cache is not None:
+            scope = _digest({"temperature": temperature, **params})
+            cls.semantic_cache.store(text, scope, result)
+
+    def _complete(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Dict[str, Any]:
+        """Call the LLM API and normalize its response."""
+        # Let aisuite handle the provider-specific differences
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+        # Extract usage information if available
+        usage = {}
+        try:
+            if hasattr(response, "usage"):
+                # Providers report usage in different structures
+                extract = _USAGE_EXTRACTORS.get(model.split(":", 1)[0], _generic_usage)
+                try:
+                    usage = extract(response.usage)
+                except AttributeError:
+                    usage = _generic_usage(response.usage)
+        except Exception as e:
+            logger.warning(f"Failed to extract usage information: {str(e)}")
+            # Set default usage to avoid errors
+            usage = {"total_tokens": 0}
+
+        return {
+            "content": response.choices[0].message.content,
+            "model": model,
+            "finish_reason": response.choices[0].finish_reason,
+            "usage": usage,
+        }
 
     async def chat_completion(
         self,
@@ -57,73 +724,38 @@ class LlmService:
             # Fix model format if needed (replace / with :)
             if "/" in model:
                 model = model.replace("/", ":")
-                logger.debug(f"Converted model format to: {model}")
+                logger.debug("Converted model format to: %s", model)
 
             logger.debug(
-                f"Sending request to LLM model {model} with {len(messages)} messages"
+                "Sending request to LLM model %s with %d messages", model, len(messages)
             )
 
-            # Let aisuite handle the provider-specific differences
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-
-            # Extract usage information if available
-            usage = {}
-            try:
-                if hasattr(response, "usage"):
-                    # Handle different response structures from different providers
-                    if isinstance(response.usage, dict):
-                        # OpenAI format
-                        usage = {
-                            "prompt_tokens": response.usage.get("prompt_tokens", 0),
-                            "completion_tokens": response.usage.get(
-                                "completion_tokens", 0
-                            ),
-                            "total_tokens": response.usage.get("total_tokens", 0),
-                        }
-                    else:
-                        # Anthropic format
-                        input_tokens = getattr(response.usage, "input_tokens", 0)
-                        output_tokens = getattr(response.usage, "output_tokens", 0)
-                        usage = {
-                            "prompt_tokens": input_tokens,
-                            "completion_tokens": output_tokens,
-                            "total_tokens": input_tokens + output_tokens,
-                        }
-            except Exception as e:
-                logger.warning(f"Failed to extract usage information: {str(e)}")
-                # Set default usage to avoid errors
-                usage = {"total_tokens": 0}
-
-            content = response.choices[0].message.content
-            result = {
-                "content": content,
-                "model": model,
-                "finish_reason": response.choices[0].finish_reason,
-                "usage": usage,
-            }
+            # Reuse responses to identical deterministic requests
+            key = self.response_cache.key(model, messages, temperature, max_tokens)
+            result = await self.response_cache.get(key) if key else None
+            if result is not None:
+                logger.debug("Using cached response from LLM model %s", model)
+            else:
+                # The AISuite client is synchronous; keep the event loop free
+                result = await self._request_with_retry(
+                    model,
+                    functools.partial(
+                        self._complete, model, messages, temperature, max_tokens
+                    ),
+                )
+                if key:
+                    await self.response_cache.set(key, result)
 
-            # Validate XML in the response if requested
-            if validate_xml:
-                # Extract XML from response
-                xml = None
+            content = result["content"]
 
+            # Validate XML in the response if requested; most chat responses
+            # have no code block, so skip extraction for them outright
+            if validate_xml and _FENCE not in content:
+                logger.debug("No code block in chat response, skipping XML validation")
+            elif validate_xml:
                 # Extract XML from markdown code blocks
-                if "```xml" in content and "```" in content.split("```xml", 1)[1]:
-                    xml = content.split("```xml", 1)[1].split("```", 1)[0].strip()
-                elif "```" in content and "```" in content.split("```", 1)[1]:
-                    # Try without language specifier
-                    potential_xml = (
-                        content.split("```", 1)[1].split("```", 1)[0].strip()
-                    )
-                    if potential_xml.startswith("<?xml") or potential_xml.startswith(
-                        "<bpmn:"
-                    ):
-                        xml = potential_xml
+                extracted = _extract_xml(content)
+                xml = extracted.xml
 
                 # If XML found, validate and improve it
                 if xml:
@@ -141,27 +773,16 @@ class LlmService:
                     if validation_result["improvement_attempts"] > 0:
                         improved_xml = validation_result["xml"]
 
-                        # Replace the original XML with the improved version
-                        if (
-                            "```xml" in content
-                            and "```" in content.split("```xml", 1)[1]
-                        ):
-                            new_content = (
-                                content.split("```xml", 1)[0]
-                                + "```xml\n"
-                                + improved_xml
-                                + "\n```"
-                                + content.split("```xml", 1)[1].split("```", 1)[1]
-                            )
-                        else:
-                            # For code blocks without language specifier
-                            new_content = (
-                                content.split("```", 1)[0]
-                                + "```\n"
-                                + improved_xml
-                                + "\n```"
-                                + content.split("```", 1)[1].split("```", 1)[1]
-                            )
+                        # Replace the original XML with the improved version,
+                        # keeping the block's language specifier if it had one
+                        _, xml_start, xml_end = extracted.span
+                        new_content = (
+                            content[:xml_start]
+                            + "\n"
+                            + improved_xml
+                            + "\n"
+                            + content[xml_end:]
+                        )
 
                         # Update the result with the improved content
                         result["content"] = new_content
@@ -182,13 +803,96 @@ class LlmService:
                             f"XML in chat response is {validation_status} after {validation_result['improvement_attempts']} improvement attempts"
                         )
 
-            logger.debug(f"Received response from LLM model {model}")
+            logger.debug("Received response from LLM model %s", model)
             return result
 
         except Exception as e:
             logger.error(f"LLM service error: {str(e)}")
             raise
 
+    async def _xml_result(
+        self,
+        content: str,
+        model: str,
+        temperature: float,
+        system_prompt: Optional[str],
+        validate: bool,
+        max_validation_attempts: int,
+        validation_candidates: int = 1,
+        fallback_xml: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Build the result of an XML generation or modification from a response.
+
+        Args:
+            content: Content of the LLM response
+            model: Model that produced the response
+            temperature: Temperature for improvement requests
+            system_prompt: Optional system prompt for improvement requests
+            validate: Whether to validate and improve the XML
+            max_validation_attempts: Maximum number of validation improvement attempts
+            validation_candidates: Improvements requested concurrently per validation
+                round
+            fallback_xml: XML to use if the response contains none
+
+        Returns:
+            Dictionary containing the XML, explanation and validation info
+        """
+        # Extract XML from markdown code blocks
+        extracted = _extract_xml(content)
+        xml, explanation = extracted.xml, extracted.explanation
+
+        if not xml:
+            logger.warning("Failed to extract valid XML from the LLM response")
+            xml = fallback_xml
+
+        # Validate and improve XML if requested
+        validation_result = None
+        if validate and xml:
+            logger.info("Validating and improving XML from the LLM response...")
+            validation_result = await self.validate_and_improve_xml(
+                xml=xml,
+                model=model,
+                max_attempts=max_validation_attempts,
+                temperature=temperature,
+                system_prompt=system_prompt,
+                candidates=validation_candidates,
+            )
+
+            # Use the validated/improved XML
+            xml = validation_result["xml"]
+
+            # Add validation info to the explanation
+            if validation_result["improvement_attempts"] > 0:
+                validation_status = (
+                    "valid" if validation_result["is_valid"] else "invalid"
+                )
+                explanation += f"\n\nXML validation: {validation_status} after {validation_result['improvement_attempts']} improvement attempts."
+
+                if (
+                    not validation_result["is_valid"]
+                    and validation_result["validation_errors"]
+                ):
+                    explanation += "\nRemaining validation errors:\n"
+                    for error in validation_result["validation_errors"]:
+                        explanation += f"- {error['code']}: {error['message']}\n"
+
+        result = {
+            "xml": xml,
+            "explanation": explanation,
+            "model": model,
+        }
+
+        # Include validation info if available
+        if validation_result:
+            result["validation"] = {
+                "is_valid": validation_result["is_valid"],
+                "improvement_attempts": validation_result["improvement_attempts"],
+                "validation_errors": validation_result["validation_errors"],
+            }
+
+        return result
+
     async def generate_xml(
         self,
         description: str,
@@ -198,6 +902,7 @@ class LlmService:
         system_prompt: str = None,
         validate: bool = True,
         max_validation_attempts: int = 3,
+        validation_candidates: int = 1,
     ) -> Dict[str, Any]:
         """
         Generate BPMN XML from a natural language description.
@@ -210,6 +915,8 @@ class LlmService:
             system_prompt: Optional system prompt to override default
             validate: Whether to validate and improve the XML
             max_validation_attempts: Maximum number of validation improvement attempts
+            validation_candidates: Improvements requested concurrently per validation
+                round
 
         Returns:
             Dictionary containing the generated XML and explanation
@@ -217,98 +924,347 @@ class LlmService:
         Raises:
             Exception: If XML generation fails
         """
-        from pythmata.core.llm.prompts import BPMN_SYSTEM_PROMPT, XML_GENERATION_PROMPT
-
         try:
-            # Prepare prompt
-            prompt = XML_GENERATION_PROMPT.format(description=description)
-
-            # Use provided system prompt or default
-            sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
-
-            # Call LLM service
-            response = await self.chat_completion(
-                messages=[
-                    {"role": "system", "content": sys_prompt},
-                    {"role": "user", "content": prompt},
-                ],
+            # Reuse the result of an equivalent deterministic generation
+            params = dict(
+                kind="generate",
                 model=model,
-                temperature=temperature,
                 max_tokens=max_tokens,
+                system_prompt=system_prompt,
+                validate=validate,
+                max_validation_attempts=max_validation_attempts,
+                validation_candidates=validation_candidates,
+            )
+            cache_key = self._xml_result_key(temperature, description, **params)
+            cached = self._cached_xml_result(
+                cache_key, description, temperature, params
             )
+            if cached is not None:
+                logger.info("Using cached XML generation result")
+                return cached
 
-            # Extract XML from response
-            content = response["content"]
-            xml = None
-            explanation = content
-
-            # Extract XML from markdown code blocks
-            if "```xml" in content and "```" in content.split("```xml", 1)[1]:
-                xml = content.split("```xml", 1)[1].split("```", 1)[0].strip()
-                explanation = content.split("```xml", 1)[0].strip()
-            elif "```" in content and "```" in content.split("```", 1)[1]:
-                # Try without language specifier
-                potential_xml = content.split("```", 1)[1].split("```", 1)[0].strip()
-                if potential_xml.startswith("<?xml") or potential_xml.startswith(
-                    "<bpmn:"
-                ):
-                    xml = potential_xml
-                    explanation = content.split("```xml", 1)[0].strip()
-
-            if not xml:
-                logger.warning("Failed to extract valid XML from the LLM response")
-                xml = ""
-
-            # Validate and improve XML if requested
-            validation_result = None
-            if validate and xml:
-                logger.info("Validating and improving generated XML...")
-                validation_result = await self.validate_and_improve_xml(
-                    xml=xml,
+            # Identical requests in flight share one generation
+            async def generate() -> Dict[str, Any]:
+                # Prepare prompt
+                prompt = render_generation(description) + BPMN_XML_TEMPLATE
+
+                # Use provided system prompt or default
+                sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
+
+                # Call LLM service
+                response = await self.chat_completion(
+                    messages=_prompt_messages(sys_prompt, prompt),
                     model=model,
-                    max_attempts=max_validation_attempts,
                     temperature=temperature,
-                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
                 )
 
-                # Use the validated/improved XML
-                xml = validation_result["xml"]
+                result = await self._xml_result(
+                    response["content"],
+                    model=model,
+                    temperature=temperature,
+                    system_prompt=system_prompt,
+                    validate=validate,
+                    max_validation_attempts=max_validation_attempts,
+                    validation_candidates=validation_candidates,
+                )
 
-                # Add validation info to the explanation
-                if validation_result["improvement_attempts"] > 0:
-                    validation_status = (
-                        "valid" if validation_result["is_valid"] else "invalid"
+                if cache_key and result["xml"]:
+                    self._cache_xml_result(
+                        cache_key, description, temperature, params, result
                     )
-                    explanation += f"\n\nXML validation: {validation_status} after {validation_result['improvement_attempts']} improvement attempts."
 
-                    if (
-                        not validation_result["is_valid"]
-                        and validation_result["validation_errors"]
-                    ):
-                        explanation += "\nRemaining validation errors:\n"
-                        for error in validation_result["validation_errors"]:
-                            explanation += f"- {error['code']}: {error['message']}\n"
+                return result
 
-            result = {
-                "xml": xml,
-                "explanation": explanation,
-                "model": model,
-            }
+            return await self._share_in_flight(cache_key, generate)
 
-            # Include validation info if available
-            if validation_result:
-                result["validation"] = {
-                    "is_valid": validation_result["is_valid"],
-                    "improvement_attempts": validation_result["improvement_attempts"],
-                    "validation_errors": validation_result["validation_errors"],
-                }
+        except Exception as e:
+            logger.error(f"XML generation failed: {str(e)}")
+            raise
 
-            return result
+    async def generate_xml_stream(
+        self,
+        description: str,
+        model: str = "anthropic:claude-3-7-sonnet-latest",
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        system_prompt: str = None,
+        validate: bool = True,
+        max_validation_attempts: int = 3,
+        validation_candidates: int = 1,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate BPMN XML from a natural language description, streaming it.
+
+        The explanation and the XML are yielded as the model writes them, so
+        callers can show progress long before the generation completes. The
+        streamed XML is unvalidated; the final event carries the same result
+        as generate_xml.
 
+        Args:
+            description: Natural language description of the process
+            model: Model identifier in format <provider>:<model-name>
+            temperature: Controls randomness (0-1)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Optional system prompt to override default
+            validate: Whether to validate and improve the XML
+            max_validation_attempts: Maximum number of validation improvement attempts
+            validation_candidates: Improvements requested concurrently per validation
+                round
+
+        Yields:
+            ("explanation", {"content": ...}) and ("xml", {"content": ...})
+            events with the deltas of the response, then ("result", ...)
+            with the dictionary generate_xml returns
+
+        Raises:
+            Exception: If XML generation fails
+        """
+        params = dict(
+            kind="generate",
+            model=model,
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+            validate=validate,
+            max_validation_attempts=max_validation_attempts,
+            validation_candidates=validation_candidates,
+        )
+        cache_key = self._xml_result_key(temperature, description, **params)
+        cached = self._cached_xml_result(cache_key, description, temperature, params)
+        if cached is not None:
+            logger.info("Using cached XML generation result")
+            yield "result", cached
+            return
+
+        prompt = render_generation(description) + BPMN_XML_TEMPLATE
+        sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
+
+        scanner = _XmlStreamScanner()
+        deltas: List[str] = []
+        try:
+            async for delta in self.chat_completion_stream(
+                _prompt_messages(sys_prompt, prompt),
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ):
+                deltas.append(delta)
+                for kind, text in scanner.feed(delta):
+                    yield kind, {"content": text}
+            for kind, text in scanner.finish():
+                yield kind, {"content": text}
+
+            result = await self._xml_result(
+                "".join(deltas),
+                model=model,
+                temperature=temperature,
+                system_prompt=system_prompt,
+                validate=validate,
+                max_validation_attempts=max_validation_attempts,
+                validation_candidates=validation_candidates,
+            )
         except Exception as e:
             logger.error(f"XML generation failed: {str(e)}")
             raise
 
+        if cache_key and result["xml"]:
+            self._cache_xml_result(cache_key, description, temperature, params, result)
+
+        yield "result", result
+
+    async def generate_xml_batch(
+        self,
+        descriptions: List[str],
+        model: str = "anthropic:claude-3-7-sonnet-latest",
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        system_prompt: str = None,
+        validate: bool = True,
+        max_validation_attempts: int = 3,
+        validation_candidates: int = 1,
+        max_concurrency: int = 10,
+        rate_limit: Optional[float] = None,
+        use_batch_api: Optional[bool] = None,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Generate BPMN XML for several descriptions concurrently.
+
+        Args:
+            descriptions: Natural language descriptions of the processes
+            model: Model identifier in format <provider>:<model-name>
+            temperature: Controls randomness (0-1)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Optional system prompt to override default
+            validate: Whether to validate and improve the XML
+            max_validation_attempts: Maximum number of validation improvement attempts
+            validation_candidates: Improvements requested concurrently per validation
+                round
+            max_concurrency: Maximum number of generations running at once
+            rate_limit: Optional maximum number of generations started per
+                minute
+            use_batch_api: Whether to generate through the provider's batch
+                API, which is cheaper but may take up to 24 hours. Defaults
+                to doing so for more than 50 descriptions if the provider
+                has one.
+
+        Returns:
+            Results in the order of the descriptions; a failed generation is
+            returned as its exception instead of failing the whole batch
+        """
+        options = dict(
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+            validate=validate,
+            max_validation_attempts=max_validation_attempts,
+            validation_candidates=validation_candidates,
+        )
+        if use_batch_api is None:
+            use_batch_api = len(descriptions) > _BATCH_API_THRESHOLD
+        if use_batch_api and supports_batch_api(model):
+            return await self._generate_xml_batch_api(descriptions, model, **options)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        bucket = (
+            TokenBucket(rate_limit / 60, max(1, int(rate_limit // 60)))
+            if rate_limit
+            else None
+        )
+
+        async def generate_one(description: str) -> Dict[str, Any]:
+            async with semaphore:
+                if bucket is not None:
+                    await bucket.acquire()
+                return await self.generate_xml(description, model=model, **options)
+
+        return await asyncio.gather(
+            *(generate_one(description) for description in descriptions),
+            return_exceptions=True,
+        )
+
+    async def _generate_xml_batch_api(
+        self,
+        descriptions: List[str],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str],
+        validate: bool,
+        max_validation_attempts: int,
+        validation_candidates: int = 1,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """Generate BPMN XML for several descriptions in one provider batch job."""
+        sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
+        requests = [
+            {
+                "messages": _prompt_messages(
+                    sys_prompt, render_generation(description) + BPMN_XML_TEMPLATE
+                ),
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+            for description in descriptions
+        ]
+        responses = await run_openai_batch(model.split(":", 1)[1], requests)
+
+        async def finish(
+            response: Union[Dict[str, Any], BatchJobError]
+        ) -> Dict[str, Any]:
+            if isinstance(response, BatchJobError):
+                raise response
+            return await self._xml_result(
+                response["content"],
+                model=model,
+                temperature=temperature,
+                system_prompt=system_prompt,
+                validate=validate,
+                max_validation_attempts=max_validation_attempts,
+                validation_candidates=validation_candidates,
+            )
+
+        # Invalid XML is improved through regular requests
+        return await asyncio.gather(
+            *(finish(response) for response in responses), return_exceptions=True
+        )
+
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "anthropic:claude-3-7-sonnet-latest",
+        temperature: float = 0.5,
+        max_tokens: int = 8192,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the content of a chat completion response as it is generated.
+
+        Args:
+            messages: List of message objects with role and content
+            model: Model identifier in format <provider>:<model-name>
+            temperature: Controls randomness (0-1)
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Content deltas of the response
+
+        Raises:
+            Exception: If the LLM API call fails
+        """
+        # Fix model format if needed (replace / with :)
+        if "/" in model:
+            model = model.replace("/", ":")
+            logger.debug("Converted model format to: %s", model)
+
+        logger.debug("Starting streaming request to LLM model %s", model)
+
+        # Create streaming response
+        response_stream = await self._request_with_retry(
+            model,
+            functools.partial(
+                self.client.chat.completions.create,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            ),
+        )
+
+        # The stream blocks between chunks, so iterate it in a worker thread
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        pump = asyncio.create_task(
+            asyncio.to_thread(_pump_stream, response_stream, chunks, loop, stop)
+        )
+
+        try:
+            while (chunk := await chunks.get()) is not _STREAM_END:
+                if isinstance(chunk, Exception):
+                    raise chunk
+
+                # Chunks without a content delta (e.g. empty choices on
+                # usage-only chunks) are skipped
+                try:
+                    delta_content = chunk.choices[0].delta.content
+                except (AttributeError, IndexError):
+                    continue
+
+                if delta_content:
+                    yield delta_content
+
+            await pump
+        finally:
+            if not pump.done():
+                # The consumer stopped early (e.g. the client disconnected),
+                # so stop reading, and paying for, the rest of the response
+                stop.set()
+                close = getattr(response_stream, "close", None)
+                if close is not None:
+                    with contextlib.suppress(Exception):
+                        close()
+                pump.cancel()
+        logger.debug("Completed streaming response from LLM model %s", model)
+
     async def stream_chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -334,58 +1290,50 @@ class LlmService:
             Exception: If the LLM API call fails
         """
         try:
-            # Fix model format if needed (replace / with :)
-            if "/" in model:
-                model = model.replace("/", ":")
-                logger.debug(f"Converted model format to: {model}")
-
-            logger.debug(f"Starting streaming request to LLM model {model}")
-
-            # Create streaming response
-            response_stream = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stream=True,
-            )
-
-            # Stream tokens to client
+            # Stream tokens to client, coalescing deltas into fewer messages
             content_buffer = ""
+            pending: List[str] = []
+            pending_chars = 0
+            loop = asyncio.get_running_loop()
+            last_flush = loop.time()
+
+            async def flush() -> None:
+                nonlocal pending_chars, last_flush
+                await chat_manager.send_raw(
+                    client_id, encode_message("token", {"content": "".join(pending)})
+                )
+                pending.clear()
+                pending_chars = 0
+                last_flush = loop.time()
+
             try:
-                for chunk in response_stream:
-                    # Safely access chunk attributes with proper error handling
-                    try:
-                        if (
-                            hasattr(chunk, "choices")
-                            and len(chunk.choices) > 0
-                            and hasattr(chunk.choices[0], "delta")
-                            and hasattr(chunk.choices[0].delta, "content")
-                        ):
-
-                            delta_content = chunk.choices[0].delta.content
-                            if delta_content:
-                                content_buffer += delta_content
-                                # Send token to client
-                                await chat_manager.send_personal_message(
-                                    client_id, "token", {"content": delta_content}
-                                )
-                    except AttributeError as attr_err:
-                        # Log the specific attribute error but continue processing
-                        logger.warning(
-                            f"Attribute error while processing chunk: {attr_err}"
-                        )
-                        # Continue with the next chunk instead of failing the entire stream
-                        continue
+                async for delta_content in self.chat_completion_stream(
+                    messages,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ):
+                    content_buffer += delta_content
+                    pending.append(delta_content)
+                    pending_chars += len(delta_content)
+                    if (
+                        pending_chars >= _STREAM_FLUSH_CHARS
+                        or loop.time() - last_flush >= _STREAM_FLUSH_INTERVAL
+                    ):
+                        await flush()
             except Exception as stream_err:
                 # Handle any errors during stream processing
                 logger.error(f"Error processing stream: {stream_err}")
                 # If we have content so far, return it instead of failing completely
                 if content_buffer:
+                    if pending:
+                        await flush()
                     return content_buffer
                 raise
 
-            logger.debug(f"Completed streaming response from LLM model {model}")
+            if pending:
+                await flush()
+
             return content_buffer
 
         except Exception as e:
@@ -400,6 +1348,7 @@ class LlmService:
         temperature: float = 0.3,
         max_tokens: int = 4000,
         system_prompt: str = None,
+        candidates: int = 1,
     ) -> Dict[str, Any]:
         """
         Validate XML and attempt to improve it if validation fails.
@@ -411,17 +1360,21 @@ class LlmService:
             temperature: Temperature for LLM requests
             max_tokens: Maximum tokens for LLM requests
             system_prompt: Optional system prompt to override default
+            candidates: Number of improvements requested concurrently per
+                round, each at a slightly higher temperature; all count
+                towards max_attempts
 
         Returns:
             Dictionary with validated XML, validation status, and improvement history
-        """
-        from pythmata.core.llm.prompts import BPMN_SYSTEM_PROMPT, XML_IMPROVEMENT_PROMPT
 
-        # Initialize validator
-        validator = BPMNValidator()
+        Raises:
+            ValueError: If candidates is less than 1
+        """
+        if candidates < 1:
+            raise ValueError("At least one improvement candidate is required")
 
         # First validation
-        validation_result = validator.validate(xml)
+        validation_result = await self._validate_xml(xml)
 
         # If already valid, return immediately
         if validation_result.is_valid:
@@ -446,109 +1399,128 @@ class LlmService:
             f"XML validation failed with {best_error_count} errors. Attempting to improve..."
         )
 
-        # Improvement loop
+        # Improvement loop; each round requests `candidates` improvements of
+        # the current best XML concurrently and keeps the best of them
         attempts = 0
         improvement_history = []
+        sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
 
         while not validation_result.is_valid and attempts < max_attempts:
-            attempts += 1
-
-            try:
-                # Prepare improvement prompt
-                prompt = XML_IMPROVEMENT_PROMPT.format(
-                    validation_errors=validation_errors_text, original_xml=best_xml
-                )
-
-                # Use provided system prompt or default
-                sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
-
-                # Call LLM for improvement
-                response = await self.chat_completion(
-                    messages=[
-                        {"role": "system", "content": sys_prompt},
-                        {"role": "user", "content": prompt},
-                    ],
-                    model=model,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
+            # Prepare improvement prompt
+            prompt = render_improvement(validation_errors_text, best_xml)
+            messages = _prompt_messages(sys_prompt, prompt)
+
+            # Call LLM for improvement, varying the temperature per candidate
+            round_size = min(candidates, max_attempts - attempts)
+            tasks: Dict[asyncio.Task, int] = {}
+            for i in range(round_size):
+                attempts += 1
+                task = asyncio.create_task(
+                    self.chat_completion(
+                        messages=messages,
+                        model=model,
+                        temperature=min(temperature + 0.1 * i, 1.0),
+                        max_tokens=max_tokens,
+                    )
                 )
+                tasks[task] = attempts
 
-                # Extract improved XML
-                content = response["content"]
-                improved_xml = None
-
-                # Extract XML from markdown code blocks
-                if "```xml" in content and "```" in content.split("```xml", 1)[1]:
-                    improved_xml = (
-                        content.split("```xml", 1)[1].split("```", 1)[0].strip()
-                    )
-                elif "```" in content and "```" in content.split("```", 1)[1]:
-                    # Try without language specifier
-                    potential_xml = (
-                        content.split("```", 1)[1].split("```", 1)[0].strip()
+            pending = set(tasks)
+            unchanged = 0
+            try:
+                while pending and not validation_result.is_valid:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
                     )
-                    if potential_xml.startswith("<?xml") or potential_xml.startswith(
-                        "<bpmn:"
-                    ):
-                        improved_xml = potential_xml
+                    for task in sorted(done, key=tasks.get):
+                        attempt = tasks[task]
+                        try:
+                            response = task.result()
 
-                if not improved_xml:
-                    logger.warning(
-                        f"Attempt {attempts}: Failed to extract XML from improvement response"
-                    )
-                    improvement_history.append(
-                        {
-                            "attempt": attempts,
-                            "success": False,
-                            "error": "Failed to extract XML from response",
-                        }
-                    )
-                    continue
+                            # Extract improved XML
+                            improved_xml = _extract_xml(response["content"]).xml
 
-                # Validate improved XML
-                new_validation_result = validator.validate(improved_xml)
-                new_error_count = len(new_validation_result.errors)
-
-                # Record improvement attempt
-                improvement_history.append(
-                    {
-                        "attempt": attempts,
-                        "success": new_validation_result.is_valid,
-                        "error_count": new_error_count,
-                        "errors": (
-                            [str(error) for error in new_validation_result.errors]
-                            if not new_validation_result.is_valid
-                            else []
-                        ),
-                    }
-                )
+                            if not improved_xml:
+                                logger.warning(
+                                    f"Attempt {attempt}: Failed to extract XML from improvement response"
+                                )
+                                improvement_history.append(
+                                    {
+                                        "attempt": attempt,
+                                        "success": False,
+                                        "error": "Failed to extract XML from response",
+                                    }
+                                )
+                                continue
+
+                            # Validate improved XML; the model often returns its
+                            # input unchanged, whose verdict is already known
+                            if improved_xml == best_xml:
+                                logger.info(f"Attempt {attempt}: no-op improvement")
+                                unchanged += 1
+                                new_validation_result = validation_result
+                            else:
+                                new_validation_result = await self._validate_xml(
+                                    improved_xml
+                                )
+                            new_error_count = len(new_validation_result.errors)
+
+                            # Record improvement attempt
+                            improvement_history.append(
+                                {
+                                    "attempt": attempt,
+                                    "success": new_validation_result.is_valid,
+                                    "error_count": new_error_count,
+                                    "errors": (
+                                        [
+                                            str(error)
+                                            for error in new_validation_result.errors
+                                        ]
+                                        if not new_validation_result.is_valid
+                                        else []
+                                    ),
+                                }
+                            )
 
-                logger.info(
-                    f"Attempt {attempts}: XML has {new_error_count} validation errors (was {best_error_count})"
-                )
+                            logger.info(
+                                f"Attempt {attempt}: XML has {new_error_count} validation errors (was {best_error_count})"
+                            )
 
-                # If valid or better than previous best, update best XML
-                if new_validation_result.is_valid or new_error_count < best_error_count:
-                    best_xml = improved_xml
-                    best_error_count = new_error_count
-                    validation_result = new_validation_result
-                    validation_errors_text = "\n".join(
-                        [f"- {error}" for error in validation_result.errors]
-                    )
+                            # If valid or better than previous best, update best XML
+                            if (
+                                new_validation_result.is_valid
+                                or new_error_count < best_error_count
+                            ):
+                                best_xml = improved_xml
+                                best_error_count = new_error_count
+                                validation_result = new_validation_result
+                                validation_errors_text = "\n".join(
+                                    [f"- {error}" for error in validation_result.errors]
+                                )
 
-                    if new_validation_result.is_valid:
-                        logger.info(
-                            f"XML successfully validated after {attempts} attempts"
-                        )
-                        break
+                                if new_validation_result.is_valid:
+                                    logger.info(
+                                        f"XML successfully validated after {attempt} attempts"
+                                    )
+                                    break
 
-            except Exception as e:
-                logger.error(
-                    f"Error during XML improvement attempt {attempts}: {str(e)}"
-                )
-                improvement_history.append(
-                    {"attempt": attempts, "success": False, "error": str(e)}
-                )
+                        except Exception as e:
+                            logger.error(
+                                f"Error during XML improvement attempt {attempt}: {str(e)}"
+                            )
+                            improvement_history.append(
+                                {"attempt": attempt, "success": False, "error": str(e)}
+                            )
+            finally:
+                # Stop waiting for candidates once one is valid
+                for task in pending:
+                    task.cancel()
+
+            # Asking again with the same prompt won't help if the model
+            # couldn't change anything
+            if unchanged == round_size:
+                logger.info("XML improvement stopped: model returned the XML unchanged")
+                break
 
         # Return best XML version with validation status
         return {
@@ -571,6 +1543,7 @@ class LlmService:
         system_prompt: str = None,
         validate: bool = True,
         max_validation_attempts: int = 3,
+        validation_candidates: int = 1,
     ) -> Dict[str, Any]:
         """
         Modify existing BPMN XML based on a natural language request.
@@ -584,6 +1557,8 @@ class LlmService:
             system_prompt: Optional system prompt to override default
             validate: Whether to validate and improve the XML
             max_validation_attempts: Maximum number of validation improvement attempts
+            validation_candidates: Improvements requested concurrently per validation
+                round
 
         Returns:
             Dictionary containing the modified XML and explanation
@@ -591,99 +1566,59 @@ class LlmService:
         Raises:
             Exception: If XML modification fails
         """
-        from pythmata.core.llm.prompts import (
-            BPMN_SYSTEM_PROMPT,
-            XML_MODIFICATION_PROMPT,
-        )
-
         try:
-            # Prepare prompt
-            prompt = XML_MODIFICATION_PROMPT.format(
-                request=request, current_xml=current_xml
-            )
-
-            # Use provided system prompt or default
-            sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
-
-            # Call LLM service
-            response = await self.chat_completion(
-                messages=[
-                    {"role": "system", "content": sys_prompt},
-                    {"role": "user", "content": prompt},
-                ],
+            # Reuse the result of an equivalent deterministic modification
+            params = dict(
+                kind="modify",
+                current_xml=current_xml,
                 model=model,
-                temperature=temperature,
                 max_tokens=max_tokens,
+                system_prompt=system_prompt,
+                validate=validate,
+                max_validation_attempts=max_validation_attempts,
+                validation_candidates=validation_candidates,
             )
+            cache_key = self._xml_result_key(temperature, request, **params)
+            cached = self._cached_xml_result(cache_key, request, temperature, params)
+            if cached is not None:
+                logger.info("Using cached XML modification result")
+                return cached
 
-            # Extract XML from response (similar to generate_xml)
-            content = response["content"]
-            xml = None
-            explanation = content
-
-            # Extract XML from markdown code blocks
-            if "```xml" in content and "```" in content.split("```xml", 1)[1]:
-                xml = content.split("```xml", 1)[1].split("```", 1)[0].strip()
-                explanation = content.split("```xml", 1)[0].strip()
-            elif "```" in content and "```" in content.split("```", 1)[1]:
-                # Try without language specifier
-                potential_xml = content.split("```", 1)[1].split("```", 1)[0].strip()
-                if potential_xml.startswith("<?xml") or potential_xml.startswith(
-                    "<bpmn:"
-                ):
-                    xml = potential_xml
-                    explanation = content.split("```xml", 1)[0].strip()
-
-            if not xml:
-                logger.warning("Failed to extract valid XML from the LLM response")
-                # Fall back to the original XML
-                xml = current_xml
-
-            # Validate and improve XML if requested
-            validation_result = None
-            if validate and xml:
-                logger.info("Validating and improving modified XML...")
-                validation_result = await self.validate_and_improve_xml(
-                    xml=xml,
+            # Identical requests in flight share one modification
+            async def modify() -> Dict[str, Any]:
+                # Prepare prompt
+                prompt = render_modification(request, current_xml)
+
+                # Use provided system prompt or default
+                sys_prompt = system_prompt or BPMN_SYSTEM_PROMPT
+
+                # Call LLM service
+                response = await self.chat_completion(
+                    messages=_prompt_messages(sys_prompt, prompt),
                     model=model,
-                    max_attempts=max_validation_attempts,
                     temperature=temperature,
-                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
                 )
 
-                # Use the validated/improved XML
-                xml = validation_result["xml"]
+                result = await self._xml_result(
+                    response["content"],
+                    model=model,
+                    temperature=temperature,
+                    system_prompt=system_prompt,
+                    validate=validate,
+                    max_validation_attempts=max_validation_attempts,
+                    validation_candidates=validation_candidates,
+                    fallback_xml=current_xml,
+                )
 
-                # Add validation info to the explanation
-                if validation_result["improvement_attempts"] > 0:
-                    validation_status = (
-                        "valid" if validation_result["is_valid"] else "invalid"
+                if cache_key and result["xml"]:
+                    self._cache_xml_result(
+                        cache_key, request, temperature, params, result
                     )
-                    explanation += f"\n\nXML validation: {validation_status} after {validation_result['improvement_attempts']} improvement attempts."
 
-                    if (
-                        not validation_result["is_valid"]
-                        and validation_result["validation_errors"]
-                    ):
-                        explanation += "\nRemaining validation errors:\n"
-                        for error in validation_result["validation_errors"]:
-                            explanation += f"- {error['code']}: {error['message']}\n"
+                return result
 
-            result = {
-                "xml": xml,
-                "explanation": explanation,
-                "model": model,
-            }
-
-            # Include validation info if available
-            if validation_result:
-                result["validation"] = {
-                    "is_valid": validation_result["is_valid"],
-                    "improvement_attempts": validation_result["improvement_attempts"],
-                    "validation_errors": validation_result["validation_errors"],
-                }
-
-            return result
+            return await self._share_in_flight(cache_key, modify)
 
         except Exception as e:
             logger.error(f"XML modification failed: {str(e)}")
@@ -8,6 +8,7 @@ import importlib
 import importlib.util
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from pythmata.utils.logger import get_logger
 
@@ -22,6 +23,10 @@ def discover_plugins(plugin_dir: str) -> None:
     containing __init__.py files) and imports them. Each plugin package is
     expected to register its service tasks in its __init__.py file.
 
+    Plugins are imported concurrently so that slow imports (e.g. ones doing
+    network I/O) overlap. Plugins must therefore not depend on each other
+    being imported first.
+
     Args:
         plugin_dir: Directory containing plugin packages
     """
@@ -35,16 +40,29 @@ def discover_plugins(plugin_dir: str) -> None:
     if plugin_dir not in sys.path:
         sys.path.insert(0, plugin_dir)
 
-    # Find plugin packages (directories with __init__.py)
-    for item in os.listdir(plugin_dir):
-        item_path = os.path.join(plugin_dir, item)
-        init_file = os.path.join(item_path, "__init__.py")
+    # Find plugin packages (directories with __init__.py); scandir entries
+    # answer is_dir() from the directory listing without another stat
+    with os.scandir(plugin_dir) as entries:
+        plugins = [
+            entry.name
+            for entry in entries
+            if entry.is_dir()
+            and os.path.isfile(os.path.join(entry.path, "__init__.py"))
+        ]
+    if not plugins:
+        return
+
+    # Import the plugin packages; the import system locks each module
+    with ThreadPoolExecutor(max_workers=min(8, len(plugins))) as executor:
+        futures = {}
+        for item in plugins:
+            logger.info(f"Importing plugin: {item}")
+            futures[executor.submit(importlib.import_module, item)] = item
 
-        if os.path.isdir(item_path) and os.path.isfile(init_file):
+        for future in as_completed(futures):
+            item = futures[future]
             try:
-                # Import the plugin package
-                logger.info(f"Importing plugin: {item}")
-                importlib.import_module(item)
+                future.result()
                 logger.info(f"Successfully loaded plugin: {item}")
             except Exception as e:
                 logger.error(f"Error loading plugin {item}: {e}", exc_info=True)
@@ -1,13 +1,7 @@
 """Service task module."""
 
-# Import standard service tasks to register them
-# Import standard service tasks module to register them
+# Importing the standard service tasks registers them
 from pythmata.core.services.registry import get_service_task_registry
-from pythmata.core.services.standard.http import HttpServiceTask
-from pythmata.core.services.standard.logger import LoggerServiceTask
-
-registry = get_service_task_registry()
-registry.register(HttpServiceTask)
-registry.register(LoggerServiceTask)
+from pythmata.core.services.standard import HttpServiceTask, LoggerServiceTask
 
 __all__ = ["get_service_task_registry", "HttpServiceTask", "LoggerServiceTask"]
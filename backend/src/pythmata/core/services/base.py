@@ -1,7 +1,7 @@
 """Base class and utilities for service tasks."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Sequence
 
 
 class ServiceTask(ABC):
@@ -13,6 +13,10 @@ class ServiceTask(ABC):
     sending emails, or logging information.
     """
 
+    # Service tasks are stateless, so neither they nor subclasses that also
+    # declare empty __slots__ need an instance __dict__
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -35,7 +39,7 @@ class ServiceTask(ABC):
 
     @property
     @abstractmethod
-    def properties(self) -> List[Dict[str, Any]]:
+    def properties(self) -> Sequence[Dict[str, Any]]:
         """
         Get the list of configurable properties for this service task.
 
@@ -48,7 +52,7 @@ class ServiceTask(ABC):
         - description: Property description (optional)
 
         Returns:
-            List[Dict[str, Any]]: List of property definitions
+            Sequence[Dict[str, Any]]: Property definitions
         """
 
     @abstractmethod
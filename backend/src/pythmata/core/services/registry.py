@@ -1,6 +1,6 @@
 """Registry for service tasks."""
 
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 
 from pythmata.core.services.base import ServiceTask
 from pythmata.utils.logger import get_logger
@@ -16,13 +16,18 @@ class ServiceTaskRegistry:
     Provides methods for registering, retrieving, and listing service tasks.
     """
 
+    __slots__ = ("_tasks", "_listing")
+
     _instance = None
+    _tasks: Dict[str, ServiceTask]
+    _listing: Optional[List[Dict[str, Any]]]
 
     def __new__(cls):
         """Implement singleton pattern."""
         if cls._instance is None:
             cls._instance = super(ServiceTaskRegistry, cls).__new__(cls)
             cls._instance._tasks = {}
+            cls._instance._listing = None
         return cls._instance
 
     def register(self, task_class: Type[ServiceTask]) -> None:
@@ -33,7 +38,11 @@ class ServiceTaskRegistry:
             task_class: Service task class to register
         """
         task = task_class()
+        # Registering the same class again is a no-op
+        if type(self._tasks.get(task.name)) is task_class:
+            return
         self._tasks[task.name] = task
+        self._listing = None
         logger.info(f"Registered service task: {task.name}")
 
     def get_task(self, name: str) -> Optional[ServiceTask]:
@@ -48,21 +57,26 @@ class ServiceTaskRegistry:
         """
         return self._tasks.get(name)
 
-    def list_tasks(self) -> List[Dict[str, any]]:
+    def list_tasks(self) -> List[Dict[str, Any]]:
         """
         List all registered service tasks.
 
+        The listing is built once and reused until another task is
+        registered, so callers must not modify it.
+
         Returns:
-            List[Dict[str, any]]: List of service task information
+            List[Dict[str, Any]]: List of service task information
         """
-        return [
-            {
-                "name": task.name,
-                "description": task.description,
-                "properties": task.properties,
-            }
-            for task in self._tasks.values()
-        ]
+        if self._listing is None:
+            self._listing = [
+                {
+                    "name": task.name,
+                    "description": task.description,
+                    "properties": task.properties,
+                }
+                for task in self._tasks.values()
+            ]
+        return self._listing
 
 
 # Global registry instance
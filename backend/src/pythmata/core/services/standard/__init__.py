@@ -1,6 +1,5 @@
 """Standard service tasks."""
 
-# Import service tasks to register them
 # Register standard service tasks
 from pythmata.core.services.registry import get_service_task_registry
 from pythmata.core.services.standard.http import HttpServiceTask
@@ -9,3 +8,5 @@ from pythmata.core.services.standard.logger import LoggerServiceTask
 registry = get_service_task_registry()
 registry.register(HttpServiceTask)
 registry.register(LoggerServiceTask)
+
+__all__ = ["HttpServiceTask", "LoggerServiceTask"]
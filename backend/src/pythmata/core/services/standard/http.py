@@ -1,12 +1,76 @@
 """HTTP service task implementation."""
 
-import json
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, ClassVar, Dict, Optional, Tuple
 
 import aiohttp
+import orjson
 
 from pythmata.core.services.base import ServiceTask
 
+# Canonical HTTP methods, also by their usual spellings
+_METHODS = {
+    name: method
+    for method in ("GET", "POST", "PUT", "DELETE")
+    for name in (method, method.lower(), method.capitalize())
+}
+
+# Session shared by all executions, with the event loop it belongs to, so
+# connections to a host are kept alive between requests
+_session: Optional[Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]] = None
+
+
+def _release_stale_session(
+    session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Release a session left behind by another event loop.
+
+    It is closed on its own loop if that loop still runs. Otherwise it is
+    detached from its connector, whose connections can't outlive the loop.
+    """
+    if session.closed:
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+    else:
+        session.detach()
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the shared client session, creating it on first use."""
+    global _session
+    loop = asyncio.get_running_loop()
+    if _session is not None and _session[1] is not loop:
+        _release_stale_session(*_session)
+        _session = None
+    if _session is None or _session[0].closed:
+        connector = aiohttp.TCPConnector(
+            limit=200, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=60
+        )
+        _session = (aiohttp.ClientSession(connector=connector), loop)
+    return _session[0]
+
+
+def _parse_body(response: aiohttp.ClientResponse, body: bytes) -> Any:
+    """Parse a JSON response body, decoding any other body as text."""
+    content_type = response.content_type
+    if content_type == "application/json" or content_type.endswith("+json"):
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+    return body.decode(response.charset or "utf-8", errors="replace")
+
+
+async def close_session() -> None:
+    """Close the shared client session, e.g. on application shutdown."""
+    global _session
+    if _session is not None:
+        session, _ = _session
+        _session = None
+        await session.close()
+
 
 class HttpServiceTask(ServiceTask):
     """
@@ -16,6 +80,61 @@ class HttpServiceTask(ServiceTask):
     Supports GET, POST, PUT, DELETE methods with configurable headers and body.
     """
 
+    __slots__ = ()
+
+    # Definitions are shared by all instances and listings, never rebuilt
+    _NAME: ClassVar[str] = "http"
+    _DESCRIPTION: ClassVar[str] = "Make HTTP requests to external services and APIs"
+    _PROPERTIES: ClassVar[Tuple[Dict[str, Any], ...]] = (
+        {
+            "name": "url",
+            "label": "URL",
+            "type": "string",
+            "required": True,
+            "description": "URL to send the request to",
+        },
+        {
+            "name": "method",
+            "label": "Method",
+            "type": "string",
+            "required": True,
+            "default": "GET",
+            "options": ("GET", "POST", "PUT", "DELETE"),
+            "description": "HTTP method to use",
+        },
+        {
+            "name": "headers",
+            "label": "Headers",
+            "type": "json",
+            "required": False,
+            "default": "{}",
+            "description": "HTTP headers as JSON object",
+        },
+        {
+            "name": "body",
+            "label": "Body",
+            "type": "json",
+            "required": False,
+            "description": "Request body as JSON",
+        },
+        {
+            "name": "timeout",
+            "label": "Timeout (seconds)",
+            "type": "number",
+            "required": False,
+            "default": 30,
+            "description": "Request timeout in seconds",
+        },
+        {
+            "name": "output_mapping",
+            "label": "Output Mapping",
+            "type": "json",
+            "required": False,
+            "default": "{}",
+            "description": "Mapping of response fields to process variables",
+        },
+    )
+
     @property
     def name(self) -> str:
         """
@@ -24,7 +143,7 @@ class HttpServiceTask(ServiceTask):
         Returns:
             str: Unique identifier for this service task type
         """
-        return "http"
+        return self._NAME
 
     @property
     def description(self) -> str:
@@ -34,65 +153,41 @@ class HttpServiceTask(ServiceTask):
         Returns:
             str: Description of the service task's purpose and behavior
         """
-        return "Make HTTP requests to external services and APIs"
+        return self._DESCRIPTION
 
     @property
-    def properties(self) -> List[Dict[str, Any]]:
+    def properties(self) -> Tuple[Dict[str, Any], ...]:
         """
         Get the list of configurable properties for this service task.
 
         Returns:
-            List[Dict[str, Any]]: List of property definitions
+            Tuple[Dict[str, Any], ...]: Property definitions
         """
-        return [
-            {
-                "name": "url",
-                "label": "URL",
-                "type": "string",
-                "required": True,
-                "description": "URL to send the request to",
-            },
-            {
-                "name": "method",
-                "label": "Method",
-                "type": "string",
-                "required": True,
-                "default": "GET",
-                "options": ["GET", "POST", "PUT", "DELETE"],
-                "description": "HTTP method to use",
-            },
-            {
-                "name": "headers",
-                "label": "Headers",
-                "type": "json",
-                "required": False,
-                "default": "{}",
-                "description": "HTTP headers as JSON object",
-            },
-            {
-                "name": "body",
-                "label": "Body",
-                "type": "json",
-                "required": False,
-                "description": "Request body as JSON",
-            },
-            {
-                "name": "timeout",
-                "label": "Timeout (seconds)",
-                "type": "number",
-                "required": False,
-                "default": 30,
-                "description": "Request timeout in seconds",
-            },
-            {
-                "name": "output_mapping",
-                "label": "Output Mapping",
-                "type": "json",
-                "required": False,
-                "default": "{}",
-                "description": "Mapping of response fields to process variables",
-            },
-        ]
+        return self._PROPERTIES
+
+    # Largest response body read into memory, in bytes
+    max_response_size = 10 * 1024 * 1024
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """
+        Read a response body, refusing bodies above max_response_size.
+
+        Raises:
+            ValueError: If the body is too large
+        """
+        if (response.content_length or 0) > self.max_response_size:
+            raise ValueError(
+                f"Response of {response.content_length} bytes exceeds the "
+                f"limit of {self.max_response_size} bytes"
+            )
+        body = bytearray()
+        async for chunk in response.content.iter_any():
+            body += chunk
+            if len(body) > self.max_response_size:
+                raise ValueError(
+                    f"Response exceeds the limit of {self.max_response_size} bytes"
+                )
+        return bytes(body)
 
     async def execute(
         self, context: Dict[str, Any], properties: Dict[str, Any]
@@ -108,56 +203,53 @@ class HttpServiceTask(ServiceTask):
             Dict[str, Any]: Result of the execution with response data
 
         Raises:
+            ValueError: If the URL is missing or the method is not supported
             Exception: If the HTTP request fails
         """
         url = properties.get("url")
-        method = properties.get("method", "GET").upper()
+        if not url:
+            raise ValueError("HTTP request requires a URL")
+        requested = properties.get("method") or "GET"
+        method = _METHODS.get(requested) or _METHODS.get(str(requested).upper())
+        if method is None:
+            raise ValueError(f"Unsupported HTTP method: {requested}")
         headers = properties.get("headers", {})
         body = properties.get("body")
         timeout = float(properties.get("timeout", 30))
 
         # Parse JSON properties if they're strings
         if isinstance(headers, str):
-            headers = json.loads(headers)
+            headers = orjson.loads(headers)
         if isinstance(body, str) and body:
-            body = json.loads(body)
-
-        # Prepare result
-        result = {
-            "url": url,
-            "method": method,
-            "status_code": None,
-            "response": None,
-            "headers": None,
-            "error": None,
-        }
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=body if body else None,
-                    timeout=timeout,
-                ) as response:
-                    result["status_code"] = response.status
-                    result["headers"] = dict(response.headers)
-
-                    # Try to parse response as JSON, fall back to text
-                    try:
-                        result["response"] = await response.json()
-                    except:
-                        result["response"] = await response.text()
-
-                    # Raise exception for error status codes
-                    if response.status >= 400:
-                        error_msg = f"HTTP request failed with status {response.status}"
-                        result["error"] = error_msg
-                        raise Exception(error_msg)
-
-            return result
-        except Exception as e:
-            if "error" not in result or not result["error"]:
-                result["error"] = str(e)
-            raise
+            body = orjson.loads(body)
+
+        session = _get_session()
+        async with session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            # Content-Type defaults to JSON unless set in the headers
+            data=(
+                aiohttp.BytesPayload(
+                    orjson.dumps(body), content_type="application/json"
+                )
+                if body
+                else None
+            ),
+            timeout=timeout,
+        ) as response:
+            # Read the body once and parse it by its content type
+            parsed = _parse_body(response, await self._read_body(response))
+
+            # Raise exception for error status codes
+            if response.status >= 400:
+                raise Exception(f"HTTP request failed with status {response.status}")
+
+            return {
+                "url": url,
+                "method": method,
+                "status_code": response.status,
+                "response": parsed,
+                "headers": dict(response.headers),
+                "error": None,
+            }
@@ -1,6 +1,9 @@
 """Logger service task implementation."""
 
-from typing import Any, Dict, List
+import logging
+from typing import Any, ClassVar, Dict, Tuple
+
+import orjson
 
 from pythmata.core.services.base import ServiceTask
 from pythmata.utils.logger import get_logger
@@ -8,6 +11,13 @@ from pythmata.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _encode_variable(value: Any) -> Any:
+    """Encode process variable values that orjson can't serialize natively."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
 class LoggerServiceTask(ServiceTask):
     """
     Service task for logging information during process execution.
@@ -16,6 +26,53 @@ class LoggerServiceTask(ServiceTask):
     with configurable content derived from process variables.
     """
 
+    __slots__ = ()
+
+    # Definitions are shared by all instances and listings, never rebuilt
+    _NAME: ClassVar[str] = "logger"
+    _DESCRIPTION: ClassVar[str] = "Log messages during process execution"
+    # Logging levels by the names accepted in the level property; other
+    # names log at INFO
+    _LEVELS: ClassVar[Dict[str, int]] = {
+        "info": logging.INFO,
+        "warning": logging.WARNING,
+        "error": logging.ERROR,
+        "debug": logging.DEBUG,
+    }
+    _PROPERTIES: ClassVar[Tuple[Dict[str, Any], ...]] = (
+        {
+            "name": "level",
+            "label": "Log Level",
+            "type": "string",
+            "required": True,
+            "default": "info",
+            "options": ("info", "warning", "error", "debug"),
+            "description": "Logging level",
+        },
+        {
+            "name": "message",
+            "label": "Message",
+            "type": "string",
+            "required": True,
+            "description": "Message to log",
+        },
+        {
+            "name": "include_variables",
+            "label": "Include Variables",
+            "type": "boolean",
+            "required": False,
+            "default": False,
+            "description": "Whether to include process variables in the log",
+        },
+        {
+            "name": "variable_filter",
+            "label": "Variable Filter",
+            "type": "string",
+            "required": False,
+            "description": "Comma-separated list of variable names to include (if include_variables is true)",
+        },
+    )
+
     @property
     def name(self) -> str:
         """
@@ -24,7 +81,7 @@ class LoggerServiceTask(ServiceTask):
         Returns:
             str: Unique identifier for this service task type
         """
-        return "logger"
+        return self._NAME
 
     @property
     def description(self) -> str:
@@ -34,49 +91,17 @@ class LoggerServiceTask(ServiceTask):
         Returns:
             str: Description of the service task's purpose and behavior
         """
-        return "Log messages during process execution"
+        return self._DESCRIPTION
 
     @property
-    def properties(self) -> List[Dict[str, Any]]:
+    def properties(self) -> Tuple[Dict[str, Any], ...]:
         """
         Get the list of configurable properties for this service task.
 
         Returns:
-            List[Dict[str, Any]]: List of property definitions
+            Tuple[Dict[str, Any], ...]: Property definitions
         """
-        return [
-            {
-                "name": "level",
-                "label": "Log Level",
-                "type": "string",
-                "required": True,
-                "default": "info",
-                "options": ["info", "warning", "error", "debug"],
-                "description": "Logging level",
-            },
-            {
-                "name": "message",
-                "label": "Message",
-                "type": "string",
-                "required": True,
-                "description": "Message to log",
-            },
-            {
-                "name": "include_variables",
-                "label": "Include Variables",
-                "type": "boolean",
-                "required": False,
-                "default": False,
-                "description": "Whether to include process variables in the log",
-            },
-            {
-                "name": "variable_filter",
-                "label": "Variable Filter",
-                "type": "string",
-                "required": False,
-                "description": "Comma-separated list of variable names to include (if include_variables is true)",
-            },
-        ]
+        return self._PROPERTIES
 
     async def execute(
         self, context: Dict[str, Any], properties: Dict[str, Any]
@@ -122,21 +147,21 @@ class LoggerServiceTask(ServiceTask):
         }
 
         if variables:
-            log_data["variables"] = {k: v.model_dump_json() for k, v in variables.items()}
-
-        log_message = f"{message} [Process: {context['token'].instance_id}, Task: {context['task_id']}, Data: {log_data}]"
-
-        # Log at appropriate level
-        if level == "info":
-            logger.info(log_message)
-        elif level == "warning":
-            logger.warning(log_message)
-        elif level == "error":
-            logger.error(log_message)
-        elif level == "debug":
-            logger.debug(log_message)
-        else:
-            logger.info(log_message)
+            # One serializer pass over all variables
+            log_data["variables"] = orjson.dumps(
+                variables, default=_encode_variable
+            ).decode()
+
+        # Log at appropriate level; the message is only formatted, including
+        # the repr of log_data, if the level is enabled
+        log_args = (
+            "%s [Process: %s, Task: %s, Data: %s]",
+            message,
+            context["token"].instance_id,
+            context["task_id"],
+            log_data,
+        )
+        logger.log(self._LEVELS.get(level, logging.INFO), *log_args)
 
         return {
             "level": level,
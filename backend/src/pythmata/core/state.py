@@ -1,9 +1,10 @@
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-import redis.asyncio as redis
-from redis.asyncio import Redis
+import orjson
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
 
 from pythmata.api.schemas import ProcessVariableValue
 from pythmata.core.config import Settings
@@ -12,6 +13,32 @@ from pythmata.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value for storage in Redis."""
+    return orjson.dumps(value, option=_ORJSON_OPTIONS)
+
+
+# Returns the stored token at a node and scope, adding the given one if absent.
+# KEYS[1]: token list, ARGV[1]: node ID, ARGV[2]: scope ID ("" for none),
+# ARGV[3]: serialized token to add
+ADD_TOKEN_IF_ABSENT_SCRIPT = """
+for _, raw in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    local token = cjson.decode(raw)
+    local scope_id = token['scope_id']
+    if scope_id == nil or scope_id == cjson.null then
+        scope_id = ''
+    end
+    if token['node_id'] == ARGV[1] and scope_id == ARGV[2] then
+        return raw
+    end
+end
+redis.call('RPUSH', KEYS[1], ARGV[3])
+return ARGV[3]
+"""
+
 
 class StateManager:
     """Manages process state and variables using Redis."""
@@ -19,6 +46,8 @@ class StateManager:
     def __init__(self, settings: Settings):
         self.settings = settings
         self._redis: Optional[Redis] = None
+        self._pool: Optional[ConnectionPool] = None
+        self._add_token_if_absent: Optional[AsyncScript] = None
         self.lock_timeout = 30  # seconds
 
     @property
@@ -44,14 +73,23 @@ class StateManager:
 
         for attempt in range(max_retries):
             try:
-                self._redis = redis.from_url(
+                # One shared pool sized by settings.redis.pool_size; commands
+                # and pipelines wait for a free connection instead of failing
+                self._pool = BlockingConnectionPool.from_url(
                     str(self.settings.redis.url),
                     encoding="utf-8",
                     decode_responses=True,
                     max_connections=self.settings.redis.pool_size,
                 )
+                self._redis = Redis(connection_pool=self._pool)
                 # Test connection
                 await self._redis.ping()
+                self._add_token_if_absent = self._redis.register_script(
+                    ADD_TOKEN_IF_ABSENT_SCRIPT
+                )
+                # Load scripts up front so the first call is already an EVALSHA;
+                # NOSCRIPT after a server flush is handled by the script object
+                await self._redis.script_load(ADD_TOKEN_IF_ABSENT_SCRIPT)
                 logger.info("Successfully connected to Redis")
                 return
             except Exception as e:
@@ -76,6 +114,10 @@ class StateManager:
         if self._redis:
             await self._redis.aclose()
             self._redis = None
+            self._add_token_if_absent = None
+        if self._pool:
+            await self._pool.aclose()
+            self._pool = None
 
     async def get_process_state(self, instance_id: str) -> Dict[str, Any]:
         """Get the current state of a process instance.
@@ -88,7 +130,7 @@ class StateManager:
         """
         key = f"process:{instance_id}:state"
         state = await self.redis.get(key)
-        return json.loads(state) if state else {}
+        return orjson.loads(state) if state else {}
 
     async def set_process_state(
         self, instance_id: str, state: Dict[str, Any], ttl: Optional[int] = None
@@ -101,7 +143,7 @@ class StateManager:
             ttl: Optional TTL in seconds
         """
         key = f"process:{instance_id}:state"
-        await self.redis.set(key, json.dumps(state), ex=ttl)
+        await self.redis.set(key, _dumps(state), ex=ttl)
 
     async def get_variables(
         self,
@@ -129,7 +171,7 @@ class StateManager:
             for var_key, value in all_vars.items():
                 if var_key.startswith(f"{scope_id}:"):
                     name = var_key[len(f"{scope_id}:") :]  # Remove scope prefix
-                    data = json.loads(value)
+                    data = orjson.loads(value)
                     result[name] = ProcessVariableValue.from_storage_format(data)
 
             # If check_parent is True, traverse up the scope hierarchy
@@ -148,7 +190,7 @@ class StateManager:
                         ):
                             name = var_key[len(prefix) :]
                             if name not in result:
-                                data = json.loads(value)
+                                data = orjson.loads(value)
                                 result[name] = ProcessVariableValue.from_storage_format(
                                     data
                                 )
@@ -156,7 +198,7 @@ class StateManager:
             # Get root scope variables
             for var_key, value in all_vars.items():
                 if ":" not in var_key:  # Only root scope variables
-                    data = json.loads(value)
+                    data = orjson.loads(value)
                     result[var_key] = ProcessVariableValue.from_storage_format(data)
 
         return result
@@ -186,7 +228,7 @@ class StateManager:
             scope_key = f"{scope_id}:{name}"
             value = await self.redis.hget(key, scope_key)
             if value:
-                data = json.loads(value)
+                data = orjson.loads(value)
                 return ProcessVariableValue.from_storage_format(data)
 
             # If not found and check_parent is True, traverse up the scope hierarchy
@@ -202,20 +244,20 @@ class StateManager:
                     parent_key = f"{parent_scope}:{name}" if parent_scope else name
                     value = await self.redis.hget(key, parent_key)
                     if value:
-                        data = json.loads(value)
+                        data = orjson.loads(value)
                         return ProcessVariableValue.from_storage_format(data)
 
                 # If still not found, try root scope
                 value = await self.redis.hget(key, name)
                 if value:
-                    data = json.loads(value)
+                    data = orjson.loads(value)
                     return ProcessVariableValue.from_storage_format(data)
             return None
         else:
             # Direct access to root scope
             value = await self.redis.hget(key, name)
             if value:
-                data = json.loads(value)
+                data = orjson.loads(value)
                 return ProcessVariableValue.from_storage_format(data)
             return None
 
@@ -237,7 +279,7 @@ class StateManager:
         key = f"process:{instance_id}:vars"
         scope_key = f"{scope_id}:{name}" if scope_id else name
         storage_format = variable.to_storage_format()
-        await self.redis.hset(key, scope_key, json.dumps(storage_format))
+        await self.redis.hset(key, scope_key, _dumps(storage_format))
 
     async def get_token(
         self, instance_id: str, node_id: str, scope_id: Optional[str] = None
@@ -269,12 +311,15 @@ class StateManager:
         """
         key = f"process:{instance_id}:tokens"
         tokens = await self.redis.lrange(key, 0, -1)
+        return self._parse_tokens(tokens)
 
-        # Parse tokens and remove duplicates by node_id and scope_id
+    @staticmethod
+    def _parse_tokens(tokens: List[str]) -> List[Dict[str, Any]]:
+        """Parse stored tokens and remove duplicates by node_id and scope_id."""
         seen = set()
         unique_tokens = []
         for token in tokens:
-            data = json.loads(token)
+            data = orjson.loads(token)
             key = (data["node_id"], data.get("scope_id"))
             if key not in seen:
                 seen.add(key)
@@ -282,6 +327,78 @@ class StateManager:
 
         return unique_tokens
 
+    async def watch_tokens(
+        self, pipe: Pipeline, instance_id: str
+    ) -> List[Dict[str, Any]]:
+        """Watch the token list of a process instance and return its contents.
+
+        Must be called before ``pipe.multi()``. If the token list is modified
+        by another client before the pipeline executes, the transaction is
+        aborted with ``WatchError``.
+
+        Args:
+            pipe: Pipeline to watch the token list on
+            instance_id: The process instance ID
+
+        Returns:
+            List of token positions with duplicates removed
+        """
+        key = f"process:{instance_id}:tokens"
+        await pipe.watch(key)
+        tokens = await pipe.lrange(key, 0, -1)
+        return self._parse_tokens(tokens)
+
+    async def queue_token_positions(
+        self, pipe: Pipeline, instance_id: str, tokens: List[Dict[str, Any]]
+    ) -> None:
+        """Queue replacement of the token list on a transactional pipeline.
+
+        Args:
+            pipe: Pipeline in MULTI mode to queue the commands on
+            instance_id: The process instance ID
+            tokens: The complete new token list
+        """
+        key = f"process:{instance_id}:tokens"
+        await pipe.delete(key)
+        if tokens:
+            await pipe.rpush(key, *[_dumps(token) for token in tokens])
+
+    async def _write_tokens(
+        self, instance_id: str, tokens: List[Dict[str, Any]]
+    ) -> None:
+        """Replace the token list of an instance in a single round-trip.
+
+        Args:
+            instance_id: The process instance ID
+            tokens: The complete new token list
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await self.queue_token_positions(pipe, instance_id, tokens)
+            await pipe.execute()
+
+    @staticmethod
+    def token_entry(
+        instance_id: str, node_id: str, data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the stored representation of an active token.
+
+        Args:
+            instance_id: The process instance ID
+            node_id: The node ID where the token is placed
+            data: Optional token data
+
+        Returns:
+            Token entry as stored in the token list
+        """
+        return {
+            "instance_id": instance_id,
+            "node_id": node_id,
+            "state": "ACTIVE",
+            "data": data or {},
+            "id": str(uuid4()),
+            "scope_id": data.get("scope_id") if data else None,
+        }
+
     async def add_token(
         self, instance_id: str, node_id: str, data: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -292,37 +409,46 @@ class StateManager:
             node_id: The node ID where the token is placed
             data: Optional token data
         """
-        key = f"process:{instance_id}:tokens"
         scope_id = data.get("scope_id") if data else None
+        tokens = await self.get_token_positions(instance_id)
 
-        # Use Redis transaction to ensure atomic operation
-        async with self.redis.pipeline(transaction=True) as pipe:
-            # Get existing tokens
-            tokens = await self.get_token_positions(instance_id)
-
-            # Remove any existing token at the same node and scope
-            new_tokens = [
-                token
-                for token in tokens
-                if token["node_id"] != node_id or token.get("scope_id") != scope_id
-            ]
-
-            # Create new token
-            new_token = {
-                "instance_id": instance_id,
-                "node_id": node_id,
-                "state": "ACTIVE",
-                "data": data or {},
-                "id": str(uuid4()),
-                "scope_id": scope_id,
-            }
-            new_tokens.append(new_token)
-
-            # Replace token list atomically
-            await pipe.delete(key)
-            if new_tokens:
-                await pipe.rpush(key, *[json.dumps(token) for token in new_tokens])
-            await pipe.execute()
+        # Remove any existing token at the same node and scope
+        new_tokens = [
+            token
+            for token in tokens
+            if token["node_id"] != node_id or token.get("scope_id") != scope_id
+        ]
+
+        # Create new token
+        new_tokens.append(self.token_entry(instance_id, node_id, data))
+        await self._write_tokens(instance_id, new_tokens)
+
+    async def add_token_if_absent(
+        self, instance_id: str, node_id: str, data: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Atomically add a token to a node unless one already exists there.
+
+        The existence check and the write run server-side in a single script,
+        so concurrent callers cannot create duplicate tokens.
+
+        Args:
+            instance_id: The process instance ID
+            node_id: The node ID where the token is placed
+            data: Optional token data
+
+        Returns:
+            Tuple of the stored token data and whether it was created
+        """
+        if self._add_token_if_absent is None:
+            raise RuntimeError("Not connected to Redis")
+
+        token = self.token_entry(instance_id, node_id, data)
+        stored = await self._add_token_if_absent(
+            keys=[f"process:{instance_id}:tokens"],
+            args=[node_id, token["scope_id"] or "", _dumps(token)],
+        )
+        stored_token = orjson.loads(stored)
+        return stored_token, stored_token["id"] == token["id"]
 
     async def get_scope_tokens(
         self, instance_id: str, scope_id: str
@@ -339,9 +465,9 @@ class StateManager:
         key = f"process:{instance_id}:tokens"
         tokens = await self.redis.lrange(key, 0, -1)
         return [
-            json.loads(token)
+            orjson.loads(token)
             for token in tokens
-            if json.loads(token).get("scope_id") == scope_id
+            if orjson.loads(token).get("scope_id") == scope_id
         ]
 
     async def clear_scope_tokens(self, instance_id: str, scope_id: str) -> None:
@@ -352,16 +478,11 @@ class StateManager:
             scope_id: The scope ID to clear (e.g., subprocess ID)
         """
         # Clear tokens
-        key = f"process:{instance_id}:tokens"
         tokens = await self.get_token_positions(instance_id)
 
         # Filter out tokens in the specified scope
         new_tokens = [token for token in tokens if token.get("scope_id") != scope_id]
-
-        # Replace the token list
-        await self.redis.delete(key)
-        if new_tokens:
-            await self.redis.rpush(key, *[json.dumps(token) for token in new_tokens])
+        await self._write_tokens(instance_id, new_tokens)
 
         # Clear variables in scope
         vars_key = f"process:{instance_id}:vars"
@@ -382,7 +503,6 @@ class StateManager:
             node_id: The node ID to remove the token from
             scope_id: Optional scope ID to match specific token
         """
-        key = f"process:{instance_id}:tokens"
         tokens = await self.get_token_positions(instance_id)
 
         # Filter out the token to remove, matching both node_id and scope_id if provided
@@ -392,11 +512,7 @@ class StateManager:
             if token["node_id"] != node_id
             or (scope_id is not None and token.get("scope_id") != scope_id)
         ]
-
-        # Replace the token list
-        await self.redis.delete(key)
-        if new_tokens:
-            await self.redis.rpush(key, *[json.dumps(token) for token in new_tokens])
+        await self._write_tokens(instance_id, new_tokens)
 
     async def acquire_lock(
         self, instance_id: str, timeout: Optional[int] = None
@@ -435,7 +551,7 @@ class StateManager:
             state: Timer state to save
         """
         key = f"process:{instance_id}:timer:{timer_id}"
-        await self.redis.set(key, json.dumps(state))
+        await self.redis.set(key, _dumps(state))
 
     async def get_timer_state(
         self, instance_id: str, timer_id: str
@@ -451,7 +567,7 @@ class StateManager:
         """
         key = f"process:{instance_id}:timer:{timer_id}"
         state = await self.redis.get(key)
-        return json.loads(state) if state else None
+        return orjson.loads(state) if state else None
 
     async def delete_timer_state(self, instance_id: str, timer_id: str) -> None:
         """Delete timer state.
@@ -478,7 +594,6 @@ class StateManager:
             state: The new token state
             scope_id: Optional scope ID to match specific token
         """
-        key = f"process:{instance_id}:tokens"
         tokens = await self.get_token_positions(instance_id)
 
         # Find and update the token state
@@ -493,6 +608,4 @@ class StateManager:
 
         if not updated:
             raise ValueError(f"No token found at node {node_id} with scope {scope_id}")
-        # Replace the token list
-        await self.redis.delete(key)
-        await self.redis.rpush(key, *[json.dumps(token) for token in tokens])
+        await self._write_tokens(instance_id, tokens)
@@ -9,7 +9,10 @@ from pythmata.core.config import Settings
 from pythmata.core.database import get_db, init_db
 from pythmata.core.engine.events.timer_scheduler import TimerScheduler
 from pythmata.core.events import EventBus
+from pythmata.core.llm.cache import LLMCache, RedisCacheBackend
+from pythmata.core.llm.service import LlmService
 from pythmata.core.services import get_service_task_registry
+from pythmata.core.services.standard.http import close_session
 from pythmata.core.state import StateManager
 from pythmata.core.utils.event_handlers import register_event_handlers
 from pythmata.utils.logger import get_logger
@@ -92,6 +95,14 @@ async def lifespan(app: FastAPI):
         await app.state.state_manager.connect()
         logger.info("State manager connected successfully")
 
+        # Apply the configured LLM request limits
+        LlmService.configure_limits(settings.llm)
+
+        # Share cached LLM responses between workers
+        LlmService.response_cache = LLMCache(
+            RedisCacheBackend(app.state.state_manager.redis)
+        )
+
         # Register event handlers
         await register_event_handlers(app.state.event_bus)
 
@@ -132,6 +143,20 @@ async def lifespan(app: FastAPI):
                 logger.error(f"Error disconnecting {service.__class__.__name__}: {e}")
                 shutdown_errors.append(e)
 
+        # Release the LLM providers' pooled HTTP connections
+        try:
+            LlmService.close()
+        except Exception as e:
+            logger.error(f"Error closing LLM client: {e}")
+            shutdown_errors.append(e)
+
+        # Release the HTTP service tasks' pooled connections
+        try:
+            await close_session()
+        except Exception as e:
+            logger.error(f"Error closing HTTP service task session: {e}")
+            shutdown_errors.append(e)
+
         # If any errors occurred during disconnect, log them but don't raise
         # This ensures all services get a chance to disconnect
         if shutdown_errors:
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any, Dict, Optional, Set
 from uuid import UUID
 
+import orjson
 from fastapi import WebSocket
 from pydantic import BaseModel
 
@@ -25,6 +26,24 @@ class ChatWebSocketMessage(BaseModel):
     content: Dict[str, Any]
 
 
+def encode_message(message_type: str, content: Dict[str, Any]) -> str:
+    """
+    Serialize a chat message into a WebSocket text frame.
+
+    Produces the same JSON as sending a ChatWebSocketMessage, without
+    building the model, so hot paths can encode a message once and send
+    it with ChatConnectionManager.send_raw.
+
+    Args:
+        message_type: Type of message (token, message_received, etc.)
+        content: Message payload
+
+    Returns:
+        The encoded message
+    """
+    return orjson.dumps({"type": message_type, "content": content}).decode()
+
+
 class ChatConnectionManager:
     """
     Manages WebSocket connections for chat sessions.
@@ -147,6 +166,26 @@ class ChatConnectionManager:
             # Handle disconnection
             self.disconnect(client_id)
 
+    async def send_raw(self, client_id: str, payload: str) -> None:
+        """
+        Send an already encoded message to a specific client.
+
+        Args:
+            client_id: Unique identifier for the client
+            payload: Message encoded with encode_message
+        """
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            logger.warning(f"Attempted to send message to inactive client {client_id}")
+            return
+
+        try:
+            await websocket.send_text(payload)
+        except Exception as e:
+            logger.error(f"Error sending message to client {client_id}: {e}")
+            # Handle disconnection
+            self.disconnect(client_id)
+
     async def broadcast_to_session(
         self,
         session_id: UUID,
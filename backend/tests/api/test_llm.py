@@ -271,6 +271,58 @@ async def test_generate_xml(
     assert '<bpmn:task id="Task_1" name="Review Application" />' in data["xml"]
 
 
+@patch("pythmata.core.llm.service.LlmService.generate_xml")
+async def test_generate_xml_validation_candidates(
+    mock_generate_xml,
+    async_client: AsyncClient,
+):
+    """Test the validation candidate count is passed from the query string."""
+    mock_generate_xml.return_value = {
+        "xml": SIMPLE_PROCESS_XML,
+        "explanation": "Done",
+        "model": "anthropic:claude-3-7-sonnet-latest",
+    }
+    body = {"description": "Create a process for reviewing applications"}
+
+    response = await async_client.post(
+        "/llm/generate-xml?validation_candidates=3", json=body
+    )
+    assert response.status_code == 200
+    assert mock_generate_xml.call_args.kwargs["validation_candidates"] == 3
+
+    response = await async_client.post(
+        "/llm/generate-xml?validation_candidates=0", json=body
+    )
+    assert response.status_code == 422
+
+
+@patch("pythmata.core.llm.service.LlmService.generate_xml_stream")
+async def test_generate_xml_stream(
+    mock_generate_xml_stream,
+    async_client: AsyncClient,
+):
+    """Test the streaming XML generation endpoint sends server-sent events."""
+
+    async def events(**kwargs):
+        yield "explanation", {"content": "Here is the process:"}
+        yield "xml", {"content": "<bpmn:definitions />"}
+        yield "result", {"xml": "<bpmn:definitions />", "explanation": "Done"}
+
+    mock_generate_xml_stream.side_effect = events
+
+    response = await async_client.post(
+        "/llm/generate-xml/stream",
+        json={"description": "Create a process for reviewing applications"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert blocks[0] == 'event: explanation\ndata: {"content":"Here is the process:"}'
+    assert blocks[-1].startswith("event: result\n")
+    assert json.loads(blocks[-1].split("data: ", 1)[1])["explanation"] == "Done"
+
+
 @patch("pythmata.core.llm.service.LlmService.modify_xml")
 async def test_modify_xml(
     mock_modify_xml,
@@ -396,3 +448,22 @@ async def test_error_handling(
     data = response.json()
     assert "detail" in data
     assert "Failed to generate response" in data["detail"]
+
+
+async def test_get_llm_metrics(async_client: AsyncClient):
+    """Test LLM metrics report response cache statistics."""
+    from pythmata.core.llm.cache import LLMCache
+    from pythmata.core.llm.service import LlmService
+
+    cache = LLMCache()
+    cache.hits, cache.misses = 3, 1
+    with patch.object(LlmService, "response_cache", cache):
+        response = await async_client.get("/llm/metrics")
+
+    assert response.status_code == 200
+    assert response.json()["response_cache"] == {
+        "backend": "InMemoryCacheBackend",
+        "hits": 3,
+        "misses": 1,
+        "hit_rate": 0.75,
+    }
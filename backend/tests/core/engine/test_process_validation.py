@@ -2,7 +2,10 @@
 
 import pytest
 
-from pythmata.core.engine.validator import ProcessGraphValidationError
+from pythmata.core.engine.validator import (
+    ProcessGraphValidationError,
+    ProcessValidator,
+)
 from pythmata.core.types import Event, EventType, Task
 from tests.core.engine.base import BaseEngineTest
 
@@ -96,3 +99,48 @@ class TestProcessGraphValidation(BaseEngineTest):
         graph = self.create_sequence_flow()
         # Should not raise any exceptions
         await self.executor.execute_process("test-instance", graph)
+
+    async def test_deep_process_graph(self):
+        """Test validation handles graphs deeper than the recursion limit."""
+        task_ids = [f"Task_{i}" for i in range(5000)]
+        node_ids = ["Start_1", *task_ids, "End_1"]
+        nodes = [
+            Event(id="Start_1", type="event", event_type=EventType.START),
+            *(Task(id=task_id, type="task") for task_id in task_ids),
+            Event(id="End_1", type="event", event_type=EventType.END),
+        ]
+        flows = [
+            {"id": f"Flow_{i}", "source_ref": source, "target_ref": target}
+            for i, (source, target) in enumerate(zip(node_ids, node_ids[1:]))
+        ]
+
+        validator = ProcessValidator()
+        validator.validate_process_graph({"nodes": nodes, "flows": flows})
+
+        # Closing the chain into a loop is still detected as a cycle
+        flows.append({"id": "Flow_back", "source_ref": "End_1", "target_ref": "Task_0"})
+        with pytest.raises(ProcessGraphValidationError) as exc:
+            validator.validate_process_graph({"nodes": nodes, "flows": flows})
+        assert "Cycle detected" in str(exc.value)
+
+    async def test_revalidation_of_changed_graph(self):
+        """Test validated graphs are remembered without masking later changes."""
+        nodes = [
+            Event(id="Start_1", type="event", event_type=EventType.START),
+            Task(id="Task_1", type="task"),
+            Event(id="End_1", type="event", event_type=EventType.END),
+        ]
+        flows = [
+            {"id": "Flow_1", "source_ref": "Start_1", "target_ref": "Task_1"},
+            {"id": "Flow_2", "source_ref": "Task_1", "target_ref": "End_1"},
+        ]
+
+        validator = ProcessValidator()
+        validator.validate_process_graph({"nodes": nodes, "flows": flows})
+        ProcessValidator().validate_process_graph({"nodes": nodes, "flows": flows})
+
+        # Same nodes and flows, but Task_1 is now a second start event
+        nodes[1] = Event(id="Task_1", type="event", event_type=EventType.START)
+        with pytest.raises(ProcessGraphValidationError) as exc:
+            validator.validate_process_graph({"nodes": nodes, "flows": flows})
+        assert "Multiple start events" in str(exc.value)
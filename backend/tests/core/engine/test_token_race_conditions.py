@@ -1,10 +1,13 @@
 """Tests for token state race condition handling."""
 
 import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
 
 import pytest
 
 from pythmata.core.engine.executor import ProcessExecutor
+from pythmata.core.engine.instance import TransactionError
 from pythmata.core.engine.token import TokenState
 from pythmata.core.engine.token_manager import TokenStateError
 from tests.core.engine.base import BaseEngineTest
@@ -131,3 +134,93 @@ class TestTokenStateRaceConditions(BaseEngineTest):
 
         # Verify token is actually consumed
         await assert_token_state(self.state_manager, instance_id, expected_count=0)
+
+    async def test_token_move_does_not_wait_for_instance_lock(self):
+        """Test that token moves use optimistic locking instead of the instance lock."""
+        instance_id = "test-optimistic-move"
+
+        token = await self.executor.create_initial_token(instance_id, "Start_1")
+
+        # A held instance lock must not block a regular move
+        assert await self.state_manager.acquire_lock(instance_id)
+        moved_token = await self.executor.move_token(token, "Task_1")
+
+        assert moved_token.node_id == "Task_1"
+        await assert_token_state(
+            self.state_manager,
+            instance_id,
+            expected_count=1,
+            expected_node_ids=["Task_1"],
+        )
+
+    async def test_token_split_does_not_wait_for_instance_lock(self):
+        """Test that token splits use optimistic locking instead of locks."""
+        instance_id = "test-optimistic-split"
+        self.create_parallel_flow(tasks=["Task_1", "Task_2"])
+
+        token = await self.executor.create_initial_token(instance_id, "Gateway_1")
+
+        # A held instance lock must not block a split
+        assert await self.state_manager.acquire_lock(instance_id)
+        new_tokens = await self.executor.split_token(token, ["Task_1", "Task_2"])
+
+        assert len(new_tokens) == 2
+        await assert_token_state(
+            self.state_manager,
+            instance_id,
+            expected_count=2,
+            expected_node_ids=["Task_1", "Task_2"],
+        )
+
+    async def test_failed_transaction_completion_keeps_token(self):
+        """Test a token is moved back if its transaction cannot complete."""
+        instance_id = str(uuid4())
+        instance_manager = MagicMock(
+            _create_activity_log=AsyncMock(),
+            complete_transaction=AsyncMock(side_effect=TransactionError("none")),
+        )
+
+        token = await self.executor.create_initial_token(instance_id, "Task_1")
+        with pytest.raises(TransactionError):
+            await self.executor.token_manager.move_token(
+                token, "Transaction_End", instance_manager
+            )
+
+        await assert_token_state(
+            self.state_manager,
+            instance_id,
+            expected_count=1,
+            expected_node_ids=["Task_1"],
+        )
+        instance_manager._create_activity_log.assert_not_awaited()
+        assert not await self.state_manager.redis.exists(f"lock:process:{instance_id}")
+
+    async def test_failed_transaction_start_keeps_token(self):
+        """Test a token is moved back if its transaction cannot start."""
+        instance_id = str(uuid4())
+        instance_manager = MagicMock(
+            _create_activity_log=AsyncMock(),
+            start_transaction=AsyncMock(side_effect=TransactionError("active")),
+        )
+
+        token = await self.executor.create_initial_token(instance_id, "Start_1")
+        with pytest.raises(TransactionError):
+            await self.executor.token_manager.move_token(
+                token, "Transaction_1", instance_manager
+            )
+
+        await assert_token_state(
+            self.state_manager,
+            instance_id,
+            expected_count=1,
+            expected_node_ids=["Start_1"],
+        )
+        instance_manager._create_activity_log.assert_not_awaited()
+
+    async def test_token_state_error_message(self):
+        """Test token errors render their lazily formatted message."""
+        error = TokenStateError("Token %s is not active (state: %s)", "t1", "WAITING")
+        assert str(error) == "Token t1 is not active (state: WAITING)"
+        assert str(TokenStateError("Failed to acquire instance lock")) == (
+            "Failed to acquire instance lock"
+        )
@@ -203,3 +203,14 @@ async def test_nested_transaction_rollback():
     # Verify parent transaction is unaffected
     assert parent_context.state == TransactionStatus.ACTIVE
     assert not parent_context.requires_compensation()
+
+
+@pytest.mark.asyncio
+async def test_empty_transaction_cannot_complete():
+    """Test commit and rollback fail without participants"""
+    context = TransactionContext(Transaction.start("Transaction_1", "test_instance"))
+
+    with pytest.raises(ValueError, match="Cannot commit empty transaction"):
+        await context.commit()
+    with pytest.raises(ValueError, match="Cannot rollback empty transaction"):
+        await context.rollback()
@@ -0,0 +1,111 @@
+"""Tests for provider batch API support."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+
+from pythmata.core.llm.batch import BatchJobError, run_openai_batch, supports_batch_api
+
+
+def _row(custom_id, content=None, error=None):
+    if error:
+        return {"custom_id": custom_id, "response": None, "error": error}
+    return {
+        "custom_id": custom_id,
+        "response": {
+            "status_code": 200,
+            "body": {
+                "choices": [{"message": {"content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": 5,
+                    "completion_tokens": 3,
+                    "total_tokens": 8,
+                },
+            },
+        },
+        "error": None,
+    }
+
+
+@pytest.fixture
+def openai_client():
+    """Create a mock OpenAI client whose batch completes after one poll."""
+    client = MagicMock()
+    client.files.create = AsyncMock(return_value=SimpleNamespace(id="file-in"))
+    client.batches.create = AsyncMock(
+        return_value=SimpleNamespace(id="batch-1", status="validating")
+    )
+    client.batches.retrieve = AsyncMock(
+        return_value=SimpleNamespace(
+            id="batch-1",
+            status="completed",
+            output_file_id="file-out",
+            error_file_id="file-err",
+        )
+    )
+    files = {
+        "file-out": [_row("1", content="second"), _row("0", content="first")],
+        "file-err": [_row("2", error={"message": "bad request"})],
+    }
+    client.files.content = AsyncMock(
+        side_effect=lambda file_id: SimpleNamespace(
+            text="\n".join(orjson.dumps(row).decode() for row in files[file_id])
+        )
+    )
+    return client
+
+
+def test_supports_batch_api():
+    """Test batch API support is detected from the provider prefix."""
+    assert supports_batch_api("openai:gpt-4o")
+    assert not supports_batch_api("anthropic:claude-3-7-sonnet-latest")
+
+
+@pytest.mark.asyncio
+async def test_run_openai_batch(openai_client):
+    """Test requests are submitted as JSONL and results reassembled in order."""
+    requests = [
+        {"messages": [{"role": "user", "content": str(i)}], "max_tokens": 10}
+        for i in range(3)
+    ]
+
+    with patch("pythmata.core.llm.batch.asyncio.sleep", AsyncMock()) as mock_sleep:
+        results = await run_openai_batch("gpt-4o", requests, client=openai_client)
+
+    mock_sleep.assert_awaited_once_with(5.0)
+    _, upload = openai_client.files.create.call_args.kwargs["file"]
+    rows = [orjson.loads(line) for line in upload.splitlines()]
+    assert [row["custom_id"] for row in rows] == ["0", "1", "2"]
+    assert rows[1]["body"] == {"model": "gpt-4o", **requests[1]}
+
+    assert results[0]["content"] == "first"
+    assert results[1]["content"] == "second"
+    assert results[1]["usage"]["total_tokens"] == 8
+    assert isinstance(results[2], BatchJobError)
+
+
+@pytest.mark.asyncio
+async def test_run_openai_batch_failed(openai_client):
+    """Test a batch that did not complete raises."""
+    openai_client.batches.retrieve.return_value = SimpleNamespace(
+        id="batch-1", status="expired"
+    )
+
+    with patch("pythmata.core.llm.batch.asyncio.sleep", AsyncMock()):
+        with pytest.raises(BatchJobError, match="expired"):
+            await run_openai_batch("gpt-4o", [{"messages": []}], client=openai_client)
+
+
+@pytest.mark.asyncio
+async def test_run_openai_batch_missing_rows(openai_client):
+    """Test each request without a row in the output gets its own error."""
+    requests = [{"messages": []} for _ in range(5)]
+
+    with patch("pythmata.core.llm.batch.asyncio.sleep", AsyncMock()):
+        results = await run_openai_batch("gpt-4o", requests, client=openai_client)
+
+    missing = results[3:]
+    assert all(isinstance(result, BatchJobError) for result in missing)
+    assert missing[0] is not missing[1]
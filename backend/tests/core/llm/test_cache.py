@@ -0,0 +1,86 @@
+"""Tests for the LLM response cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import orjson
+import pytest
+
+from pythmata.core.llm.cache import InMemoryCacheBackend, LLMCache, RedisCacheBackend
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def test_key_depends_on_request():
+    """Test keys identify the request and skip sampled requests."""
+    cache = LLMCache(max_temperature=0.1)
+
+    key = cache.key("openai:gpt-4o", MESSAGES, 0, 100)
+
+    assert key == cache.key("openai:gpt-4o", [dict(MESSAGES[0])], 0, 100)
+    assert key != cache.key("openai:gpt-4o", MESSAGES, 0, 200)
+    assert key != cache.key("openai:gpt-4o", MESSAGES, 0.1, 100)
+    assert cache.key("openai:gpt-4o", MESSAGES, 0.5, 100) is None
+
+
+@pytest.mark.asyncio
+async def test_get_and_set_count_hits_and_misses():
+    """Test lookups are counted and cached values are copies."""
+    cache = LLMCache()
+    value = {"content": "Hi", "usage": {"total_tokens": 3}}
+
+    assert await cache.get("key") is None
+    await cache.set("key", value)
+    value["content"] = "changed"
+    cached = await cache.get("key")
+
+    assert cached["content"] == "Hi"
+    assert cache.stats() == {
+        "backend": "InMemoryCacheBackend",
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_evicts_and_expires():
+    """Test the least recently used and expired entries are dropped."""
+    backend = InMemoryCacheBackend(max_size=2)
+    await backend.set("a", {"v": 1}, ttl=60)
+    await backend.set("b", {"v": 2}, ttl=60)
+    await backend.get("a")
+    await backend.set("c", {"v": 3}, ttl=60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == {"v": 1}
+
+    with patch("pythmata.core.llm.cache.time.monotonic", return_value=1e12):
+        assert await backend.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend():
+    """Test responses are stored in Redis with their TTL."""
+    redis = AsyncMock()
+    backend = RedisCacheBackend(redis)
+
+    await backend.set("key", {"content": "Hi"}, ttl=60)
+    redis.set.assert_awaited_once_with(
+        "llm:response:key", orjson.dumps({"content": "Hi"}), ex=60
+    )
+
+    redis.get.return_value = orjson.dumps({"content": "Hi"})
+    assert await backend.get("key") == {"content": "Hi"}
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_misses():
+    """Test backend failures don't fail requests."""
+    redis = AsyncMock()
+    redis.get.side_effect = ConnectionError("down")
+    redis.set.side_effect = ConnectionError("down")
+    cache = LLMCache(RedisCacheBackend(redis))
+
+    await cache.set("key", {"content": "Hi"})
+    assert await cache.get("key") is None
+    assert cache.misses == 1
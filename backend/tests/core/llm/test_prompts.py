@@ -2,9 +2,15 @@
 
 from pythmata.core.llm.prompts import (
     BPMN_SYSTEM_PROMPT,
+    BPMN_XML_TEMPLATE,
     XML_ANALYSIS_PROMPT,
     XML_GENERATION_PROMPT,
+    XML_IMPROVEMENT_PROMPT,
     XML_MODIFICATION_PROMPT,
+    render_analysis,
+    render_generation,
+    render_improvement,
+    render_modification,
 )
 
 
@@ -29,6 +35,15 @@ def test_bpmn_system_prompt():
     assert "http://www.omg.org/spec/BPMN/20100524/MODEL" in BPMN_SYSTEM_PROMPT
 
 
+def test_bpmn_xml_template():
+    """Test that the XML template is kept out of the system prompt."""
+    assert "<definitions" in BPMN_XML_TEMPLATE
+    assert 'xmlns:pythmata="http://pythmata.org/schema/1.0/bpmn"' in BPMN_XML_TEMPLATE
+    assert "<bpmndi:BPMNDiagram" in BPMN_XML_TEMPLATE
+
+    assert "<definitions" not in BPMN_SYSTEM_PROMPT
+
+
 def test_xml_generation_prompt():
     """Test that the XML generation prompt contains expected content and placeholders."""
     assert isinstance(XML_GENERATION_PROMPT, str)
@@ -102,3 +117,25 @@ def test_prompt_formatting():
     xml = "<bpmn:definitions><bpmn:process></bpmn:process></bpmn:definitions>"
     formatted_analysis = XML_ANALYSIS_PROMPT.format(xml=xml)
     assert xml in formatted_analysis
+
+
+def test_prompt_rendering():
+    """Test that compiled prompts render like str.format."""
+    description = "Approve ${amount} for {team}"
+    assert render_generation(description) == XML_GENERATION_PROMPT.format(
+        description=description
+    )
+
+    request = "Add a service task"
+    current_xml = '<definitions id="{x}">$1</definitions>'
+    assert render_modification(request, current_xml) == (
+        XML_MODIFICATION_PROMPT.format(request=request, current_xml=current_xml)
+    )
+
+    xml = "<definitions/>"
+    assert render_analysis(xml) == XML_ANALYSIS_PROMPT.format(xml=xml)
+
+    errors = "- E001: {missing} end event"
+    assert render_improvement(errors, current_xml) == XML_IMPROVEMENT_PROMPT.format(
+        validation_errors=errors, original_xml=current_xml
+    )
@@ -0,0 +1,72 @@
+"""Tests for LLM request rate limiting."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from pythmata.core.llm.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock advanced by the patched sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock():
+    """Patch time and sleep used by the token bucket."""
+    fake = FakeClock()
+    with (
+        patch("pythmata.core.llm.rate_limit.time.monotonic", fake.monotonic),
+        patch("pythmata.core.llm.rate_limit.asyncio.sleep", fake.sleep),
+    ):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_burst_is_admitted_immediately(clock):
+    """Test requests up to the capacity do not wait."""
+    bucket = TokenBucket(rate=2.0, capacity=3)
+
+    for _ in range(3):
+        await bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_burst_wait_for_refill(clock):
+    """Test requests beyond the capacity are spaced at the refill rate."""
+    bucket = TokenBucket(rate=2.0, capacity=1)
+
+    await bucket.acquire()
+    await bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+    # Time passing refills the bucket
+    clock.now += 10
+    await bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_are_spaced():
+    """Test concurrent waiters reserve consecutive tokens."""
+    bucket = TokenBucket(rate=100.0, capacity=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+
+    assert loop.time() - start >= 0.03 - 0.005
@@ -0,0 +1,41 @@
+"""Tests for the semantic XML result cache."""
+
+from unittest.mock import patch
+
+from pythmata.core.llm.semantic_cache import SemanticCache
+
+
+def test_lookup_near_identical_text():
+    """Test reworded requests are served from the cache."""
+    cache = SemanticCache()
+    cache.store("Order approval process.", "scope", {"xml": "<a/>"})
+
+    assert cache.lookup("order  approval process", "scope") == {"xml": "<a/>"}
+    assert cache.lookup("Order approval process.", "other") is None
+    assert cache.lookup("Invoice payment workflow", "scope") is None
+
+
+def test_lookup_returns_best_match_copy():
+    """Test the most similar entry wins and callers get a copy."""
+    cache = SemanticCache(threshold=0.5)
+    cache.store("order approval process", "scope", {"xml": "<a/>"})
+    cache.store("order approval process with escalation", "scope", {"xml": "<b/>"})
+
+    result = cache.lookup("order approval process with escalations", "scope")
+    assert result == {"xml": "<b/>"}
+
+    result["xml"] = "changed"
+    assert cache.lookup("order approval process with escalation", "scope") == {
+        "xml": "<b/>"
+    }
+
+
+def test_eviction_and_expiry():
+    """Test the least recently used and expired entries are dropped."""
+    cache = SemanticCache(max_size=1, ttl=60)
+    cache.store("order approval process", "scope", {"xml": "<a/>"})
+    cache.store("invoice payment workflow", "scope", {"xml": "<b/>"})
+
+    assert cache.lookup("order approval process", "scope") is None
+    with patch("pythmata.core.llm.semantic_cache.time.monotonic", return_value=1e12):
+        assert cache.lookup("invoice payment workflow", "scope") is None
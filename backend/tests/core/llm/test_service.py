@@ -1,24 +1,41 @@
 """Tests for the LLM service."""
 
+import asyncio
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aisuite
 import pytest
+from openai.types import CompletionUsage
 
+from pythmata.core.config import LlmSettings
+from pythmata.core.llm.batch import BatchJobError
+from pythmata.core.llm.cache import LLMCache
 from pythmata.core.llm.prompts import (
     BPMN_SYSTEM_PROMPT,
     XML_GENERATION_PROMPT,
     XML_MODIFICATION_PROMPT,
 )
-from pythmata.core.llm.service import LlmService
+from pythmata.core.llm.semantic_cache import SemanticCache
+from pythmata.core.llm.service import LlmService, _XmlStreamScanner
 
 
 @pytest.fixture
 def llm_service():
     """Create an LLM service instance for testing."""
-    with patch("aisuite.Client") as mock_client:
+    with (
+        patch("aisuite.Client") as mock_client,
+        patch.object(LlmService, "_shared_client", None),
+        patch.object(LlmService, "_http_client", None),
+        patch.object(LlmService, "response_cache", LLMCache()),
+    ):
         # Setup mock client
         service = LlmService()
         yield service
+        LlmService._xml_result_cache.clear()
+        LlmService._validation_cache.clear()
+        LlmService._rate_limits.clear()
 
 
 @pytest.fixture
@@ -113,6 +130,149 @@ async def test_chat_completion_model_format_conversion(llm_service, mock_chat_re
     assert kwargs["model"] == "anthropic:claude-3-7-sonnet-latest"
 
 
+@pytest.mark.asyncio
+async def test_client_shared_across_instances(llm_service):
+    """Test every service instance reuses the same AISuite client."""
+    assert LlmService().client is llm_service.client
+
+
+def test_client_pool_closed(llm_service):
+    """Test providers share one connection pool that close() releases."""
+    http_client = LlmService._http_client
+    provider_configs = aisuite.Client.call_args.args[0]
+
+    assert provider_configs["openai"]["http_client"] is http_client
+    assert provider_configs["anthropic"]["http_client"] is http_client
+
+    LlmService.close()
+
+    assert http_client.is_closed
+    assert LlmService._shared_client is None
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_cache(llm_service, mock_chat_response):
+    """Test deterministic chat completions are served from the cache."""
+    mock_create = MagicMock()
+    mock_create.return_value = mock_chat_response
+    llm_service.client.chat.completions.create = mock_create
+
+    messages = [{"role": "user", "content": "Hello"}]
+    first = await llm_service.chat_completion(messages, temperature=0)
+    first["content"] = "changed by caller"
+    second = await llm_service.chat_completion(messages, temperature=0)
+
+    mock_create.assert_called_once()
+    assert second["content"] == "This is a test response"
+
+    # Sampled requests always reach the API
+    await llm_service.chat_completion(messages, temperature=0.5)
+    await llm_service.chat_completion(messages, temperature=0.5)
+    assert mock_create.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_dict_usage(llm_service, mock_chat_response):
+    """Test usage reported as a dict (OpenAI format) is normalized."""
+    mock_chat_response.usage = {
+        "prompt_tokens": 12,
+        "completion_tokens": 8,
+        "total_tokens": 20,
+    }
+    llm_service.client.chat.completions.create = MagicMock(
+        return_value=mock_chat_response
+    )
+
+    result = await llm_service.chat_completion([{"role": "user", "content": "Hi"}])
+
+    assert result["usage"] == {
+        "prompt_tokens": 12,
+        "completion_tokens": 8,
+        "total_tokens": 20,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "model", ["openai:gpt-4o", "anthropic:claude-3-7-sonnet-latest", "groq:llama3"]
+)
+async def test_chat_completion_provider_usage(llm_service, mock_chat_response, model):
+    """Test usage objects with OpenAI field names are normalized for any provider."""
+    mock_chat_response.usage = CompletionUsage(
+        prompt_tokens=12, completion_tokens=8, total_tokens=20
+    )
+    llm_service.client.chat.completions.create = MagicMock(
+        return_value=mock_chat_response
+    )
+
+    result = await llm_service.chat_completion(
+        [{"role": "user", "content": "Hi"}], model=model
+    )
+
+    assert result["usage"] == {
+        "prompt_tokens": 12,
+        "completion_tokens": 8,
+        "total_tokens": 20,
+    }
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_validate_xml_without_code_block(
+    llm_service, mock_chat_response
+):
+    """Test plain chat responses skip XML extraction and validation."""
+    llm_service.client.chat.completions.create = MagicMock(
+        return_value=mock_chat_response
+    )
+
+    with (
+        patch("pythmata.core.llm.service._extract_xml") as mock_extract,
+        patch.object(
+            llm_service, "validate_and_improve_xml", AsyncMock()
+        ) as mock_validate,
+    ):
+        result = await llm_service.chat_completion(
+            [{"role": "user", "content": "Hello"}], validate_xml=True
+        )
+
+    assert result["content"] == "This is a test response"
+    mock_extract.assert_not_called()
+    mock_validate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_concurrency_limit(llm_service, mock_chat_response):
+    """Test concurrent provider requests are capped."""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def create(**kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return mock_chat_response
+
+    llm_service.client.chat.completions.create = MagicMock(side_effect=create)
+
+    with patch.object(LlmService, "_limits", LlmSettings(max_concurrency=2)):
+        await asyncio.gather(
+            *(
+                llm_service.chat_completion(
+                    [{"role": "user", "content": f"Hello {i}"}], temperature=0.5
+                )
+                for i in range(6)
+            )
+        )
+
+    assert llm_service.client.chat.completions.create.call_count == 6
+    assert peak <= 2
+
+
 @pytest.mark.asyncio
 async def test_chat_completion_error_handling(llm_service):
     """Test error handling in chat completion."""
@@ -178,6 +338,154 @@ This XML defines a simple process with a start event, a task for reviewing appli
     assert "Create a process for reviewing applications" in messages[1]["content"]
 
 
+@pytest.mark.asyncio
+async def test_generate_xml_cache(llm_service):
+    """Test equivalent low-temperature generations reuse the cached result."""
+    mock_response = {
+        "content": "```xml\n<bpmn:definitions />\n```",
+        "model": "anthropic:claude-3-7-sonnet-latest",
+        "finish_reason": "stop",
+        "usage": {"total_tokens": 10},
+    }
+    llm_service.chat_completion = AsyncMock(return_value=mock_response)
+
+    description = "Order approval process"
+    first = await llm_service.generate_xml(description, temperature=0, validate=False)
+    second = await llm_service.generate_xml(
+        "  Order   approval process ", temperature=0, validate=False
+    )
+    assert second == first
+    llm_service.chat_completion.assert_called_once()
+
+    # Case, other parameters and sampled temperatures are not served from the
+    # cache, so regenerating at the default temperature gives a new diagram
+    await llm_service.generate_xml(
+        "order APPROVAL process", temperature=0, validate=False
+    )
+    await llm_service.generate_xml(
+        description, temperature=0, max_tokens=100, validate=False
+    )
+    await llm_service.generate_xml(description, validate=False)
+    await llm_service.generate_xml(description, validate=False)
+    assert llm_service.chat_completion.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_cache_expires(llm_service):
+    """Test cached XML results expire after the cache TTL."""
+    llm_service.chat_completion = AsyncMock(
+        return_value={"content": "```xml\n<bpmn:definitions />\n```"}
+    )
+
+    await llm_service.generate_xml("Order process", temperature=0, validate=False)
+    with patch(
+        "pythmata.core.llm.service.time.monotonic",
+        return_value=time.monotonic() + LlmService._xml_result_cache_ttl,
+    ):
+        await llm_service.generate_xml("Order process", temperature=0, validate=False)
+
+    assert llm_service.chat_completion.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_semantic_cache(llm_service):
+    """Test near-identical generations are served by the semantic cache."""
+    llm_service.chat_completion = AsyncMock(
+        return_value={"content": "```xml\n<bpmn:definitions />\n```"}
+    )
+
+    with patch.object(LlmService, "semantic_cache", SemanticCache()):
+        first = await llm_service.generate_xml(
+            "Order approval process.", temperature=0, validate=False
+        )
+        second = await llm_service.generate_xml(
+            "Order approval process", temperature=0, validate=False
+        )
+        await llm_service.generate_xml(
+            "Order approval process", temperature=0, max_tokens=100, validate=False
+        )
+
+    assert second == first
+    assert llm_service.chat_completion.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_shares_in_flight_request(llm_service):
+    """Test concurrent identical generations share one LLM call."""
+    release = asyncio.Event()
+
+    async def completion(**kwargs):
+        await release.wait()
+        return {"content": "```xml\n<bpmn:definitions />\n```"}
+
+    llm_service.chat_completion = AsyncMock(side_effect=completion)
+
+    calls = [
+        asyncio.create_task(
+            llm_service.generate_xml("Order process", temperature=0, validate=False)
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    llm_service.chat_completion.assert_called_once()
+    assert all(result["xml"] == "<bpmn:definitions />" for result in results)
+    assert results[0] is not results[1]
+    assert not LlmService._xml_in_flight
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_batch(llm_service):
+    """Test batch generation keeps order, bounds concurrency and isolates failures."""
+    in_flight = 0
+    peak = 0
+
+    async def generate(description, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if description == "broken":
+            raise ValueError("generation failed")
+        return {"xml": f"<{description}/>", "model": kwargs["model"]}
+
+    llm_service.generate_xml = AsyncMock(side_effect=generate)
+
+    results = await llm_service.generate_xml_batch(
+        ["a", "broken", "b", "c"], model="openai:gpt-4o", max_concurrency=2
+    )
+
+    assert results[0] == {"xml": "<a/>", "model": "openai:gpt-4o"}
+    assert isinstance(results[1], ValueError)
+    assert [result["xml"] for result in results[2:]] == ["<b/>", "<c/>"]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_batch_api(llm_service):
+    """Test batch generation can go through the provider batch API."""
+    responses = [
+        {"content": "```xml\n<bpmn:definitions />\n```"},
+        BatchJobError("bad request"),
+    ]
+    with patch(
+        "pythmata.core.llm.service.run_openai_batch",
+        AsyncMock(return_value=responses),
+    ) as mock_batch:
+        results = await llm_service.generate_xml_batch(
+            ["a", "b"], model="openai:gpt-4o", validate=False, use_batch_api=True
+        )
+
+    model, requests = mock_batch.call_args.args
+    assert model == "gpt-4o"
+    assert len(requests) == 2
+    assert results[0]["xml"] == "<bpmn:definitions />"
+    assert isinstance(results[1], BatchJobError)
+
+
 @pytest.mark.asyncio
 async def test_generate_xml_without_language_specifier(llm_service):
     """Test XML generation with code block without language specifier."""
@@ -373,3 +681,203 @@ async def test_usage_extraction_error_handling(llm_service, mock_chat_response):
 
     # Verify default usage is returned
     assert result["usage"]["total_tokens"] == 0
+
+
+@pytest.mark.asyncio
+async def test_validate_and_improve_xml_reuses_validation(llm_service):
+    """Test the validator is shared and its verdicts are remembered."""
+    xml = "<bpmn:definitions />"
+    with (
+        patch.object(LlmService, "_validator", None),
+        patch("pythmata.core.llm.service.BPMNValidator") as mock_validator_cls,
+    ):
+        mock_validator_cls.return_value.validate.return_value = MagicMock(
+            is_valid=True, errors=[]
+        )
+
+        first = await llm_service.validate_and_improve_xml(xml)
+        second = await LlmService().validate_and_improve_xml(xml)
+
+    assert first["is_valid"] and second["is_valid"]
+    mock_validator_cls.assert_called_once()
+    mock_validator_cls.return_value.validate.assert_called_once_with(xml)
+
+
+@pytest.mark.asyncio
+async def test_validate_and_improve_xml_candidates(llm_service):
+    """Test improvement candidates are requested concurrently per round."""
+    invalid = MagicMock(is_valid=False, errors=["Missing end event"])
+    valid = MagicMock(is_valid=True, errors=[])
+    responses = {
+        0.3: "```xml\n<bpmn:definitions>bad</bpmn:definitions>\n```",
+        0.4: "```xml\n<bpmn:definitions>good</bpmn:definitions>\n```",
+    }
+
+    async def fake_completion(messages, model, temperature, max_tokens):
+        return {"content": responses[round(temperature, 1)]}
+
+    with (
+        patch.object(LlmService, "_validator", None),
+        patch("pythmata.core.llm.service.BPMNValidator") as mock_validator_cls,
+        patch.object(
+            llm_service, "chat_completion", side_effect=fake_completion
+        ) as mock_completion,
+    ):
+        mock_validator_cls.return_value.validate.side_effect = lambda xml: (
+            valid if "good" in xml else invalid
+        )
+
+        result = await llm_service.validate_and_improve_xml(
+            "<bpmn:definitions />", max_attempts=4, candidates=2
+        )
+
+    assert result["is_valid"]
+    assert result["xml"] == "<bpmn:definitions>good</bpmn:definitions>"
+    assert result["improvement_attempts"] == 2
+    assert mock_completion.call_count == 2
+    assert [entry["attempt"] for entry in result["improvement_history"]] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_validate_and_improve_xml_requires_candidate(llm_service):
+    """Test validation rejects rounds without improvement candidates."""
+    with pytest.raises(ValueError):
+        await llm_service.validate_and_improve_xml("<bpmn:definitions />", candidates=0)
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_passes_validation_candidates(llm_service):
+    """Test generation forwards the candidate count to validation."""
+    llm_service.chat_completion = AsyncMock(
+        return_value={"content": "```xml\n<bpmn:definitions />\n```"}
+    )
+    validated = {
+        "xml": "<bpmn:definitions />",
+        "is_valid": True,
+        "improvement_attempts": 0,
+        "validation_errors": [],
+    }
+    with patch.object(
+        llm_service, "validate_and_improve_xml", AsyncMock(return_value=validated)
+    ) as mock_validate:
+        await llm_service.generate_xml("Create a process", validation_candidates=3)
+
+    assert mock_validate.call_args.kwargs["candidates"] == 3
+
+
+@pytest.mark.asyncio
+async def test_validate_and_improve_xml_stops_on_unchanged_xml(llm_service):
+    """Test improvement stops when the model returns the XML unchanged."""
+    xml = "<bpmn:definitions />"
+    with (
+        patch.object(LlmService, "_validator", None),
+        patch("pythmata.core.llm.service.BPMNValidator") as mock_validator_cls,
+        patch.object(
+            llm_service,
+            "chat_completion",
+            new=AsyncMock(return_value={"content": f"```xml\n{xml}\n```"}),
+        ) as mock_completion,
+    ):
+        mock_validator_cls.return_value.validate.return_value = MagicMock(
+            is_valid=False, errors=[]
+        )
+
+        result = await llm_service.validate_and_improve_xml(xml, max_attempts=3)
+
+    assert not result["is_valid"]
+    assert result["improvement_attempts"] == 1
+    mock_completion.assert_awaited_once()
+    mock_validator_cls.return_value.validate.assert_called_once_with(xml)
+
+
+def test_xml_stream_scanner_handles_split_fences():
+    """Test the scanner separates explanation and XML split across deltas."""
+    content = "Here it is:\n```xml\n<bpmn:definitions />\n```\nTrailing notes"
+    for size in (1, 2, 5, len(content)):
+        scanner = _XmlStreamScanner()
+        pieces = []
+        for i in range(0, len(content), size):
+            pieces.extend(scanner.feed(content[i : i + size]))
+        pieces.extend(scanner.finish())
+
+        explanation = "".join(text for kind, text in pieces if kind == "explanation")
+        xml = "".join(text for kind, text in pieces if kind == "xml")
+        assert explanation == "Here it is:\n"
+        assert xml == "<bpmn:definitions />\n"
+
+
+@pytest.mark.asyncio
+async def test_generate_xml_stream(llm_service, mock_chat_response_with_xml):
+    """Test streamed generation yields deltas, then the validated result."""
+    content = mock_chat_response_with_xml.choices[0].message.content
+    llm_service.client.chat.completions.create.return_value = [
+        MagicMock(choices=[MagicMock(delta=MagicMock(content=content[i : i + 7]))])
+        for i in range(0, len(content), 7)
+    ]
+
+    events = [
+        event
+        async for event in llm_service.generate_xml_stream(
+            description="Review process", validate=False
+        )
+    ]
+
+    kind, result = events[-1]
+    assert kind == "result"
+    assert result["xml"].startswith("<bpmn:definitions")
+    streamed_xml = "".join(data["content"] for kind, data in events if kind == "xml")
+    assert streamed_xml.strip() == result["xml"]
+    assert llm_service.client.chat.completions.create.call_args.kwargs["stream"]
+
+
+class FakeStatusError(Exception):
+    """Provider error carrying an HTTP status and response headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = MagicMock(headers=headers or {})
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_retries_transient_errors(
+    llm_service, mock_chat_response
+):
+    """Test rate limits are retried, waiting as long as Retry-After says."""
+    responses = iter([FakeStatusError(429, {"retry-after": "2"}), FakeStatusError(503)])
+
+    def create(**kwargs):
+        error = next(responses, None)
+        if error is None:
+            return mock_chat_response
+        # aisuite re-raises some provider errors as its own, chained implicitly
+        try:
+            raise error
+        except FakeStatusError:
+            raise RuntimeError("An error occurred")
+
+    llm_service.client.chat.completions.create = MagicMock(side_effect=create)
+
+    with patch("asyncio.sleep", new=AsyncMock()) as sleep:
+        result = await llm_service.chat_completion(
+            [{"role": "user", "content": "Hi"}], temperature=0.5
+        )
+
+    assert result["content"] == "This is a test response"
+    assert llm_service.client.chat.completions.create.call_count == 3
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays[0] == 2.0
+    assert 0 <= delays[1] <= LlmService._retry_base_delay * 4
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_does_not_retry_other_errors(llm_service):
+    """Test errors that aren't transient fail the request right away."""
+    llm_service.client.chat.completions.create = MagicMock(
+        side_effect=FakeStatusError(400)
+    )
+
+    with patch.object(LlmService, "_max_attempts", 3), pytest.raises(FakeStatusError):
+        await llm_service.chat_completion([{"role": "user", "content": "Hi"}])
+
+    assert llm_service.client.chat.completions.create.call_count == 1
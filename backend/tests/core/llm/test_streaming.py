@@ -1,25 +1,32 @@
 """Tests for LLM service streaming functionality."""
 
+import asyncio
+import json
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from pythmata.core.llm.service import LlmService
-from pythmata.core.websockets.chat_manager import chat_manager
+from pythmata.core.websockets.chat_manager import chat_manager, encode_message
 
 
 @pytest.fixture
 def mock_aisuite_client():
     """Create a mock AISuite client."""
     mock_client = MagicMock()
-    mock_client.chat.completions.create = AsyncMock()
+    mock_client.chat.completions.create = MagicMock()
     return mock_client
 
 
 @pytest.fixture
 def llm_service(mock_aisuite_client):
     """Create an LLM service with a mock client."""
-    with patch("aisuite.Client", return_value=mock_aisuite_client):
+    with (
+        patch("aisuite.Client", return_value=mock_aisuite_client),
+        patch.object(LlmService, "_shared_client", None),
+    ):
         service = LlmService()
         service.client = mock_aisuite_client
         return service
@@ -48,8 +55,8 @@ async def test_stream_chat_completion(llm_service, mock_aisuite_client):
         mock_chunk3,
     ]
 
-    # Mock chat_manager.send_personal_message
-    with patch.object(chat_manager, "send_personal_message", AsyncMock()) as mock_send:
+    # Mock chat_manager.send_raw
+    with patch.object(chat_manager, "send_raw", AsyncMock()) as mock_send:
         # Call the method
         client_id = "test-client"
         messages = [{"role": "user", "content": "Test message"}]
@@ -58,17 +65,39 @@ async def test_stream_chat_completion(llm_service, mock_aisuite_client):
         # Verify the result
         assert result == "Hello world!"
 
-        # Verify chat_manager.send_personal_message was called for each chunk
-        assert mock_send.call_count == 3
+        # Verify the short chunks were coalesced into a single message
+        mock_send.assert_called_once_with(
+            client_id, encode_message("token", {"content": "Hello world!"})
+        )
 
-        # Verify the first call
-        mock_send.assert_any_call(client_id, "token", {"content": "Hello"})
 
-        # Verify the second call
-        mock_send.assert_any_call(client_id, "token", {"content": " world"})
+@pytest.mark.asyncio
+async def test_stream_chat_completion_flushes_long_content(
+    llm_service, mock_aisuite_client
+):
+    """Test pending content is sent once enough characters have accumulated."""
+    deltas = ["a" * 20, "b" * 20, "c" * 5]
+    chunks = []
+    for delta in deltas:
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = delta
+        chunks.append(chunk)
+    mock_aisuite_client.chat.completions.create.return_value = chunks
+
+    with patch.object(chat_manager, "send_raw", AsyncMock()) as mock_send:
+        client_id = "test-client"
+        messages = [{"role": "user", "content": "Test message"}]
+        result = await llm_service.stream_chat_completion(messages, client_id)
 
-        # Verify the third call
-        mock_send.assert_any_call(client_id, "token", {"content": "!"})
+    assert result == "".join(deltas)
+    sent = [
+        json.loads(call.args[1])["content"]["content"]
+        for call in mock_send.call_args_list
+    ]
+    assert "".join(sent) == result
+    assert sent[-1] == "c" * 5
+    assert len(sent) <= 2
 
 
 @pytest.mark.asyncio
@@ -96,8 +125,8 @@ async def test_stream_chat_completion_empty_response(llm_service, mock_aisuite_c
     # Configure mock to return chunks
     mock_aisuite_client.chat.completions.create.return_value = [mock_chunk]
 
-    # Mock chat_manager.send_personal_message
-    with patch.object(chat_manager, "send_personal_message", AsyncMock()) as mock_send:
+    # Mock chat_manager.send_raw
+    with patch.object(chat_manager, "send_raw", AsyncMock()) as mock_send:
         # Call the method
         client_id = "test-client"
         messages = [{"role": "user", "content": "Test message"}]
@@ -106,10 +135,38 @@ async def test_stream_chat_completion_empty_response(llm_service, mock_aisuite_c
         # Verify the result
         assert result == ""
 
-        # Verify chat_manager.send_personal_message was not called
+        # Verify chat_manager.send_raw was not called
         mock_send.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_stream_chat_completion_skips_chunks_without_delta(
+    llm_service, mock_aisuite_client
+):
+    """Test chunks without choices or a delta are skipped."""
+    no_choices = MagicMock()
+    no_choices.choices = []
+    no_delta = MagicMock()
+    no_delta.choices = [object()]
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = "Hello"
+
+    mock_aisuite_client.chat.completions.create.return_value = [
+        no_choices,
+        object(),
+        no_delta,
+        chunk,
+    ]
+
+    with patch.object(chat_manager, "send_raw", AsyncMock()):
+        result = await llm_service.stream_chat_completion(
+            [{"role": "user", "content": "Test message"}], "test-client"
+        )
+
+    assert result == "Hello"
+
+
 @pytest.mark.asyncio
 async def test_stream_chat_completion_model_format(llm_service, mock_aisuite_client):
     """Test model format conversion in streaming chat completion."""
@@ -121,8 +178,8 @@ async def test_stream_chat_completion_model_format(llm_service, mock_aisuite_cli
     # Configure mock to return chunks
     mock_aisuite_client.chat.completions.create.return_value = [mock_chunk]
 
-    # Mock chat_manager.send_personal_message
-    with patch.object(chat_manager, "send_personal_message", AsyncMock()):
+    # Mock chat_manager.send_raw
+    with patch.object(chat_manager, "send_raw", AsyncMock()):
         # Call the method with a model name containing '/'
         client_id = "test-client"
         messages = [{"role": "user", "content": "Test message"}]
@@ -134,3 +191,66 @@ async def test_stream_chat_completion_model_format(llm_service, mock_aisuite_cli
         mock_aisuite_client.chat.completions.create.assert_called_once()
         call_args = mock_aisuite_client.chat.completions.create.call_args[1]
         assert call_args["model"] == "anthropic:claude-3-7-sonnet-latest"
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_completion_partial_on_stream_error(
+    llm_service, mock_aisuite_client
+):
+    """Test content received before a stream error is still returned."""
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = "Partial"
+
+    def failing_stream():
+        yield chunk
+        raise ConnectionError("stream interrupted")
+
+    mock_aisuite_client.chat.completions.create.return_value = failing_stream()
+
+    with patch.object(chat_manager, "send_raw", AsyncMock()) as mock_send:
+        result = await llm_service.stream_chat_completion(
+            [{"role": "user", "content": "Test message"}], "test-client"
+        )
+
+    assert result == "Partial"
+    mock_send.assert_called_once_with(
+        "test-client", encode_message("token", {"content": "Partial"})
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_stream_stops_reading_when_closed_early(
+    llm_service, mock_aisuite_client
+):
+    """Test the upstream stream is closed once the consumer goes away."""
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = "token"
+
+    class BlockingStream:
+        def __init__(self):
+            self.read = 0
+            self.closed = threading.Event()
+
+        def __iter__(self):
+            while not self.closed.is_set() and self.read < 100:
+                self.read += 1
+                yield chunk
+                time.sleep(0.01)
+
+        def close(self):
+            self.closed.set()
+
+    response_stream = BlockingStream()
+    mock_aisuite_client.chat.completions.create.return_value = response_stream
+
+    stream = llm_service.chat_completion_stream(
+        [{"role": "user", "content": "Test message"}]
+    )
+    assert await anext(stream) == "token"
+    await stream.aclose()
+    await asyncio.sleep(0.05)
+
+    assert response_stream.closed.is_set()
+    assert response_stream.read < 10
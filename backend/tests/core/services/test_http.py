@@ -0,0 +1,152 @@
+"""Tests for the HTTP service task."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pythmata.core.services.standard import http
+from pythmata.core.services.standard.http import HttpServiceTask, close_session
+
+
+async def echo(request: web.Request) -> web.Response:
+    """Echo the request body and its content type."""
+    return web.json_response(
+        {
+            "content_type": request.headers.get("Content-Type"),
+            "body": await request.json() if request.can_read_body else None,
+        }
+    )
+
+
+async def missing(request: web.Request) -> web.Response:
+    """Respond with a 404 status."""
+    return web.Response(status=404, text="Not found")
+
+
+async def text(request: web.Request) -> web.Response:
+    """Respond with a plain text body."""
+    return web.Response(text="x" * int(request.query.get("size", 5)))
+
+
+@pytest.fixture
+async def server():
+    """Run a local HTTP server echoing requests."""
+    app = web.Application()
+    app.router.add_route("*", "/echo", echo)
+    app.router.add_get("/text", text)
+    app.router.add_get("/missing", missing)
+    async with TestServer(app) as server:
+        yield server
+    await close_session()
+
+
+async def test_execute_sends_json_body(server):
+    """Test JSON string properties are parsed and the body is sent as JSON."""
+    result = await HttpServiceTask().execute(
+        {},
+        {
+            "url": str(server.make_url("/echo")),
+            "method": "post",
+            "headers": '{"X-Test": "1"}',
+            "body": '{"amount": 10}',
+        },
+    )
+
+    assert result["status_code"] == 200
+    assert result["method"] == "POST"
+    assert result["error"] is None
+    assert result["response"] == {
+        "content_type": "application/json",
+        "body": {"amount": 10},
+    }
+
+
+async def test_execute_keeps_content_type_header(server):
+    """Test a Content-Type set in the headers is not overridden."""
+    result = await HttpServiceTask().execute(
+        {},
+        {
+            "url": str(server.make_url("/echo")),
+            "method": "PUT",
+            "headers": {"Content-Type": "application/merge-patch+json"},
+            "body": {"amount": 10},
+        },
+    )
+
+    assert result["response"]["content_type"] == "application/merge-patch+json"
+
+
+async def test_execute_reuses_session(server):
+    """Test executions share one client session until it is closed."""
+    properties = {"url": str(server.make_url("/echo"))}
+
+    await HttpServiceTask().execute({}, properties)
+    session = http._get_session()
+    await HttpServiceTask().execute({}, properties)
+
+    assert http._get_session() is session
+    await close_session()
+    assert session.closed
+    assert http._get_session() is not session
+
+
+async def test_execute_returns_text_response(server):
+    """Test non-JSON responses are returned as text."""
+    result = await HttpServiceTask().execute({}, {"url": str(server.make_url("/text"))})
+
+    assert result["response"] == "xxxxx"
+
+
+async def test_execute_rejects_large_response(server):
+    """Test responses above the size limit fail the task."""
+    with (
+        patch.object(HttpServiceTask, "max_response_size", 4),
+        pytest.raises(ValueError, match="exceeds the limit"),
+    ):
+        await HttpServiceTask().execute({}, {"url": str(server.make_url("/text"))})
+
+
+async def test_execute_fails_on_error_status(server):
+    """Test error status codes fail the task."""
+    with pytest.raises(Exception, match="failed with status 404"):
+        await HttpServiceTask().execute(
+            {}, {"url": str(server.make_url("/missing")), "method": "get"}
+        )
+
+
+@pytest.mark.parametrize(
+    "properties, message",
+    [
+        ({"method": "GET"}, "requires a URL"),
+        (
+            {"url": "http://localhost/echo", "method": "PATCH"},
+            "Unsupported HTTP method",
+        ),
+    ],
+)
+async def test_execute_rejects_invalid_request(properties, message):
+    """Test a missing URL or unsupported method fails before sending."""
+    with (
+        patch.object(http, "_get_session") as mock_get_session,
+        pytest.raises(ValueError, match=message),
+    ):
+        await HttpServiceTask().execute({}, properties)
+
+    mock_get_session.assert_not_called()
+
+
+def test_session_of_another_loop_is_released():
+    """Test a session left behind by a finished event loop is released."""
+
+    async def get_session():
+        return http._get_session()
+
+    stale = asyncio.run(get_session())
+    session = asyncio.run(get_session())
+
+    assert session is not stale
+    assert stale.closed
+    asyncio.run(close_session())
@@ -0,0 +1,66 @@
+"""Tests for the logger service task."""
+
+import logging
+from unittest.mock import MagicMock
+
+import orjson
+
+from pythmata.api.schemas import ProcessVariableValue
+from pythmata.core.services.standard.logger import LoggerServiceTask
+
+LOGGER = "pythmata.core.services.standard.logger"
+
+
+def make_context(**variables):
+    """Build an execution context with the given process variables."""
+    return {
+        "token": MagicMock(instance_id="instance-1"),
+        "task_id": "Task_1",
+        "variables": variables,
+    }
+
+
+async def test_execute_logs_at_level(caplog):
+    """Test the message is logged at the configured level with its context."""
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+
+    result = await LoggerServiceTask().execute(
+        make_context(), {"level": "warning", "message": "Order received"}
+    )
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert record.getMessage().startswith(
+        "Order received [Process: instance-1, Task: Task_1, Data: "
+    )
+    assert result["log_data"]["task_id"] == "Task_1"
+
+
+async def test_execute_unknown_level_logs_info(caplog):
+    """Test levels other than the supported ones log at INFO."""
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+
+    await LoggerServiceTask().execute(
+        make_context(), {"level": "critical", "message": "Order received"}
+    )
+
+    assert caplog.records[-1].levelno == logging.INFO
+
+
+async def test_execute_includes_filtered_variables(caplog):
+    """Test only the variables named in the filter are included."""
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    context = make_context(
+        amount=ProcessVariableValue(type="integer", value=10),
+        secret=ProcessVariableValue(type="string", value="hidden"),
+    )
+
+    result = await LoggerServiceTask().execute(
+        context,
+        {"message": "Check", "include_variables": True, "variable_filter": "amount"},
+    )
+
+    assert orjson.loads(result["log_data"]["variables"]) == {
+        "amount": {"type": "integer", "value": 10}
+    }
+    assert "hidden" not in caplog.records[-1].getMessage()
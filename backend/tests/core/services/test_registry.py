@@ -57,6 +57,20 @@ def test_register_task():
     assert isinstance(registry._tasks["mock_task"], MockServiceTask)
 
 
+def test_register_task_once():
+    """Test registering the same task class again keeps the first instance."""
+    registry = ServiceTaskRegistry()
+    registry._tasks = {}
+
+    registry.register(MockServiceTask)
+    task = registry.get_task("mock_task")
+    tasks = registry.list_tasks()
+    registry.register(MockServiceTask)
+
+    assert registry.get_task("mock_task") is task
+    assert registry.list_tasks() is tasks
+
+
 def test_get_task():
     """Test getting a service task."""
     registry = ServiceTaskRegistry()
@@ -87,3 +101,42 @@ def test_list_tasks():
     assert tasks[0]["description"] == "Mock service task for testing"
     assert len(tasks[0]["properties"]) == 1
     assert tasks[0]["properties"][0]["name"] == "test_prop"
+
+
+def test_list_tasks_cached_until_register():
+    """Test the listing is reused until another task is registered."""
+
+    class OtherServiceTask(MockServiceTask):
+        @property
+        def name(self) -> str:
+            return "other_task"
+
+    registry = ServiceTaskRegistry()
+    registry._tasks = {}
+    registry.register(MockServiceTask)
+
+    tasks = registry.list_tasks()
+    assert registry.list_tasks() is tasks
+
+    registry.register(OtherServiceTask)
+    assert [task["name"] for task in registry.list_tasks()] == [
+        "mock_task",
+        "other_task",
+    ]
+
+
+def test_builtin_tasks_are_slotted():
+    """Test built-in service tasks and the registry carry no instance dict."""
+    from pythmata.core.services import HttpServiceTask, LoggerServiceTask
+
+    for instance in (HttpServiceTask(), LoggerServiceTask(), ServiceTaskRegistry()):
+        assert not hasattr(instance, "__dict__")
+
+
+def test_builtin_task_properties_are_shared():
+    """Test built-in tasks return the same property definitions every time."""
+    from pythmata.core.services import HttpServiceTask, LoggerServiceTask
+
+    for task_class in (HttpServiceTask, LoggerServiceTask):
+        assert task_class().properties is task_class().properties
+        assert isinstance(task_class().properties, tuple)
@@ -0,0 +1,143 @@
+"""Tests for the event bus with a mocked RabbitMQ connection."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+from pythmata.core.events import EventBus
+
+
+def make_message(data, redelivered=False):
+    """Create an incoming message carrying the given data."""
+    message = MagicMock(body=orjson.dumps(data), redelivered=redelivered)
+
+    @asynccontextmanager
+    async def process(ignore_processed=False):
+        yield
+
+    message.process = process
+    message.nack = AsyncMock()
+    return message
+
+
+def make_queue(messages):
+    """Create a queue whose iterator yields the given messages."""
+
+    class Iterator:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            for message in messages:
+                yield message
+
+    queue = MagicMock()
+    queue.bind = AsyncMock()
+    queue.iterator = Iterator
+    return queue
+
+
+@pytest.fixture
+async def bus(test_settings):
+    """Create an event bus connected to a mocked exchange and connection."""
+    bus = EventBus(test_settings)
+    bus.connection = MagicMock()
+    bus.exchange = MagicMock()
+    bus.exchange.publish = AsyncMock()
+    yield bus
+    await bus.disconnect()
+
+
+def connect_queue(bus, queue):
+    """Make every subscription channel of the bus declare the given queue."""
+    channel = MagicMock()
+    channel.set_qos = AsyncMock()
+    channel.declare_queue = AsyncMock(return_value=queue)
+    bus.connection.channel = AsyncMock(return_value=channel)
+    return channel
+
+
+async def test_publish_batches_through_drain_task(bus):
+    """Test concurrent publishes are sent by the drain task."""
+    bus._create_task(bus._drain_pending())
+
+    await asyncio.gather(
+        bus.publish("process.started", {"id": 1}),
+        bus.publish("process.completed", {"id": 2}),
+    )
+
+    routing_keys = [
+        call.kwargs["routing_key"] for call in bus.exchange.publish.call_args_list
+    ]
+    assert routing_keys == ["process.started", "process.completed"]
+    message = bus.exchange.publish.call_args_list[0].args[0]
+    assert orjson.loads(message.body) == {"id": 1}
+
+
+async def test_publish_raises_publish_error(bus):
+    """Test a failed publish is raised to its publisher."""
+    bus.exchange.publish.side_effect = ConnectionError("closed")
+    bus._create_task(bus._drain_pending())
+
+    with pytest.raises(ConnectionError):
+        await bus.publish("process.started", {"id": 1})
+
+
+async def test_subscribe_consumes_queue_iterator(bus):
+    """Test messages from the queue iterator are passed to the handler."""
+    received = asyncio.Queue()
+    connect_queue(bus, make_queue([make_message({"id": 1}), make_message({"id": 2})]))
+
+    await bus.subscribe("process.#", received.put)
+
+    assert await asyncio.wait_for(received.get(), 1) == {"id": 1}
+    assert await asyncio.wait_for(received.get(), 1) == {"id": 2}
+
+
+async def test_subscribe_shares_consumer_per_queue_name(bus):
+    """Test only subscriptions with the same queue name share a consumer."""
+    channel = connect_queue(bus, make_queue([]))
+
+    await bus.subscribe("process.#", AsyncMock(), queue_name="audit")
+    await bus.subscribe("process.#", AsyncMock(), queue_name="audit")
+    await bus.subscribe("process.#", AsyncMock(), queue_name="metrics")
+
+    assert channel.declare_queue.await_count == 2
+    assert len(bus._event_handlers[("process.#", "audit")]) == 2
+    assert len(bus._event_handlers[("process.#", "metrics")]) == 1
+
+
+async def test_handle_message_requeues_only_if_all_handlers_fail(bus):
+    """Test a partially handled message is not redelivered to every handler."""
+    succeeding, failing = AsyncMock(), AsyncMock(side_effect=ValueError("boom"))
+    key = ("process.#", None)
+
+    bus._event_handlers[key] = (succeeding, failing)
+    message = make_message({"id": 1})
+    await bus._handle_message(key, message)
+    message.nack.assert_not_awaited()
+
+    bus._event_handlers[key] = (failing, failing)
+    message = make_message({"id": 1})
+    await bus._handle_message(key, message)
+    message.nack.assert_awaited_once_with(requeue=True)
+
+
+async def test_handle_message_requeues_failed_redelivery(bus):
+    """Test a message failing again after its redelivery is still requeued."""
+    key = ("process.#", None)
+    bus._event_handlers[key] = (AsyncMock(side_effect=ValueError("boom")),)
+
+    message = make_message({"id": 1}, redelivered=True)
+    await bus._handle_message(key, message)
+
+    message.nack.assert_awaited_once_with(requeue=True)
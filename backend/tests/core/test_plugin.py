@@ -0,0 +1,65 @@
+"""Tests for plugin discovery."""
+
+import sys
+
+import pytest
+
+from pythmata.core.plugin import discover_plugins
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    """Create a plugin directory and remove its plugins from sys.modules."""
+    yield tmp_path
+    if str(tmp_path) in sys.path:
+        sys.path.remove(str(tmp_path))
+    for name in [name for name in sys.modules if name.startswith("plugin_")]:
+        del sys.modules[name]
+
+
+def make_plugin(plugin_dir, name, source="LOADED = True\n"):
+    """Create a plugin package."""
+    package = plugin_dir / name
+    package.mkdir()
+    (package / "__init__.py").write_text(source)
+
+
+def test_discover_plugins_imports_packages(plugin_dir):
+    """Test only directories with an __init__.py are imported as plugins."""
+    make_plugin(plugin_dir, "plugin_one")
+    (plugin_dir / "plugin_no_init").mkdir()
+    (plugin_dir / "plugin_file.py").write_text("LOADED = True\n")
+
+    discover_plugins(str(plugin_dir))
+
+    assert sys.modules["plugin_one"].LOADED
+    assert "plugin_no_init" not in sys.modules
+    assert "plugin_file" not in sys.modules
+
+
+def test_discover_plugins_skips_failing_plugin(plugin_dir):
+    """Test a plugin failing to import doesn't stop the others."""
+    make_plugin(plugin_dir, "plugin_broken", "raise RuntimeError('broken')\n")
+    make_plugin(plugin_dir, "plugin_working")
+
+    discover_plugins(str(plugin_dir))
+
+    assert "plugin_broken" not in sys.modules
+    assert sys.modules["plugin_working"].LOADED
+
+
+def test_discover_plugins_imports_concurrently(plugin_dir):
+    """Test plugins are imported in parallel rather than one after another."""
+    source = (
+        "import threading\n"
+        "import time\n"
+        "THREAD = threading.get_ident()\n"
+        "time.sleep(0.2)\n"
+    )
+    for index in range(3):
+        make_plugin(plugin_dir, f"plugin_slow_{index}", source)
+
+    discover_plugins(str(plugin_dir))
+
+    threads = {sys.modules[f"plugin_slow_{index}"].THREAD for index in range(3)}
+    assert len(threads) == 3
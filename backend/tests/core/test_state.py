@@ -139,3 +139,43 @@ class TestStateManager:
         assert result["list_var"].value == [1, 2, 3]
         assert result["dict_var"].value == {"key": "value"}
         assert result["nested"].value == {"list": [1, 2], "dict": {"nested": "value"}}
+
+    async def test_add_token_if_absent(self, state_manager: StateManager):
+        """Test atomic token creation returns the existing token on repeat calls."""
+        instance_id = "test_instance"
+
+        first, created = await state_manager.add_token_if_absent(
+            instance_id, "Start_1", {"scope_id": None}
+        )
+        assert created
+        assert first["node_id"] == "Start_1"
+        assert first["state"] == "ACTIVE"
+
+        second, created = await state_manager.add_token_if_absent(
+            instance_id, "Start_1"
+        )
+        assert not created
+        assert second["id"] == first["id"]
+
+        # Tokens in a different scope are independent
+        _, created = await state_manager.add_token_if_absent(
+            instance_id, "Start_1", {"scope_id": "subprocess_1"}
+        )
+        assert created
+
+        tokens = await state_manager.get_token_positions(instance_id)
+        assert len(tokens) == 2
+
+    async def test_scripts_loaded_on_connect(self, state_manager: StateManager):
+        """Test Lua scripts are cached on the server when connecting."""
+        await state_manager.redis.script_flush()
+        await state_manager.disconnect()
+        await state_manager.connect()
+
+        sha = state_manager._add_token_if_absent.sha
+        assert await state_manager.redis.script_exists(sha) == [True]
+
+        # Calls recover if the script cache is flushed afterwards
+        await state_manager.redis.script_flush()
+        _, created = await state_manager.add_token_if_absent("test_instance", "Start_1")
+        assert created
@@ -4,6 +4,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from pythmata.core.config import LlmSettings
+from pythmata.core.llm.service import LlmService
 from pythmata.core.utils.lifecycle import lifespan
 
 
@@ -15,6 +17,7 @@ async def test_lifespan():
     mock_state_manager = AsyncMock()
     mock_state_manager.get_token_positions = AsyncMock(return_value=None)
     mock_settings = MagicMock()
+    mock_settings.llm = LlmSettings()
     mock_db = AsyncMock()
     mock_timer_scheduler = AsyncMock()
     mock_app = AsyncMock()
@@ -57,6 +60,7 @@ async def test_lifespan():
             assert mock_state_manager.connect.called
             assert mock_db.connect.called
             assert mock_register_handlers.called
+            assert LlmService._limits is mock_settings.llm
 
         # Verify shutdown after lifespan context exits
         assert mock_event_bus.disconnect.called
@@ -72,6 +76,7 @@ async def test_lifespan_error_handling():
     mock_event_bus = AsyncMock()
     mock_state_manager = AsyncMock()
     mock_settings = MagicMock()
+    mock_settings.llm = LlmSettings()
     mock_db = AsyncMock()
     mock_timer_scheduler = AsyncMock()
     mock_app = AsyncMock()
@@ -13,6 +13,7 @@ from pydantic import BaseModel
 from pythmata.core.websockets.chat_manager import (
     ChatConnectionManager,
     ChatWebSocketMessage,
+    encode_message,
 )
 
 
@@ -177,6 +178,42 @@ async def test_send_personal_message_exception(chat_manager, mock_websocket):
         mock_disconnect.assert_called_once_with(client_id)
 
 
+def test_encode_message():
+    """Test encoded messages match the ChatWebSocketMessage format."""
+    content = {"content": 'Hello "world" \u00e9'}
+
+    payload = encode_message("token", content)
+
+    assert json.loads(payload) == (
+        ChatWebSocketMessage(type="token", content=content).model_dump()
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_raw(chat_manager, mock_websocket):
+    """Test sending an encoded message."""
+    client_id = "test-client"
+    chat_manager.active_connections[client_id] = mock_websocket
+    payload = encode_message("token", {"content": "Hello"})
+
+    await chat_manager.send_raw(client_id, payload)
+
+    mock_websocket.send_text.assert_called_once_with(payload)
+
+
+@pytest.mark.asyncio
+async def test_send_raw_exception(chat_manager, mock_websocket):
+    """Test handling an exception when sending an encoded message."""
+    client_id = "test-client"
+    chat_manager.active_connections[client_id] = mock_websocket
+    mock_websocket.send_text.side_effect = Exception("Test exception")
+
+    with patch.object(chat_manager, "disconnect") as mock_disconnect:
+        await chat_manager.send_raw(client_id, encode_message("token", {}))
+
+    mock_disconnect.assert_called_once_with(client_id)
+
+
 @pytest.mark.asyncio
 async def test_broadcast_to_session(chat_manager, mock_websocket):
     """Test broadcasting to a session."""